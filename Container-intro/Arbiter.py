@@ -0,0 +1,156 @@
+import bisect
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class Arbiter:
+    """
+    Decides which buzzer was pressed first in a round.
+    Every press carries a monotonic timestamp in nanoseconds (time.perf_counter_ns),
+    taken as close to the input as possible. The first press of a round wins;
+    with lockout enabled all later buzzers stay dark until the next round.
+    Held keys are tracked, so key auto-repeat never counts as a new press.
+
+    Presses are ranked by timestamp, not by arrival, so a press that arrives
+    late (e.g. over the network) can still win. Feedback is not delayed for
+    that: the buzzer that arrived first lights up at once, and when an
+    earlier press takes the lead, the arbiter calls `lock_out()` on the
+    overtaken buzzer, which goes dark again and stops its sound.
+    With a BuzzJournal, every press, release and round change is logged
+    together with the decision; round numbering continues after the last
+    round already in the journal.
+    """
+    def __init__(self, lockout: bool = True, journal=None):
+        self._lockout = lockout
+        self._journal = journal
+        self._round = 0 if journal is None else journal.last_round  # Nach Absturz weiterzählen
+        self._round_active = False
+        self._round_start = 0
+        self._presses: List[Tuple[int, int, object]] = []  # sortiert: (timestamp, Reihenfolge, Buzzer)
+        self._pressed: Set[object] = set()   # Buzzer mit einer Wertung in dieser Runde
+        self._held: Set[object] = set()      # Aktuell gedrückte Buzzer
+        self._sequence = 0
+
+    @property
+    def lockout(self) -> bool:
+        """Getter for the lockout mode."""
+        return self._lockout
+
+    @lockout.setter
+    def lockout(self, enabled: bool):
+        """Setter for the lockout mode."""
+        if not isinstance(enabled, bool):
+            raise TypeError("Lockout must be a boolean value.")
+        self._lockout = enabled
+
+    @property
+    def round(self) -> int:
+        """Getter for the number of the current round (0 before the first round, or the last journaled one)."""
+        return self._round
+
+    @property
+    def round_active(self) -> bool:
+        """Getter for whether presses are accepted at the moment."""
+        return self._round_active
+
+    def start_round(self, timestamp: Optional[int] = None) -> int:
+        """
+        Starts a new round and forgets all presses of the previous one.
+        Held keys are forgotten as well, so a buzzer whose release got lost
+        competes again; its next press counts.
+
+        Returns:
+            int: The number of the new round.
+        """
+        self._round += 1
+        self._round_active = True
+        self._round_start = time.perf_counter_ns() if timestamp is None else timestamp
+        self._presses.clear()
+        self._pressed.clear()
+        self._held.clear()
+        if self._journal is not None:
+            self._journal.append(self._journal.ROUND_START, self._round, self._round_start)
+        return self._round
+
+    def end_round(self):
+        """Ends the current round; further presses are ignored."""
+        self._round_active = False
+        if self._journal is not None:
+            self._journal.append(self._journal.ROUND_END, self._round)
+
+    def press(self, buzzer, timestamp: Optional[int] = None) -> bool:
+        """
+        Registers a press of the buzzer.
+
+        Args:
+            buzzer: The pressed buzzer.
+            timestamp (int): Time of the press from time.perf_counter_ns().
+
+        Returns:
+            bool: True if the buzzer may light up, False if the press is
+            an auto-repeat, outside a round or locked out.
+        """
+        if buzzer in self._held:
+            return False  # Auto-Repeat der gehaltenen Taste
+        self._held.add(buzzer)
+        if timestamp is None:
+            timestamp = time.perf_counter_ns()
+        if not self._round_active:
+            accepted = False
+        elif buzzer in self._pressed:
+            # Erneutes Drücken zählt nicht für die Reihenfolge
+            accepted = not self._lockout or self._presses[0][2] is buzzer
+        else:
+            leader = self._presses[0][2] if self._presses else None
+            self._pressed.add(buzzer)
+            self._sequence += 1
+            # Nach Zeit einsortieren, auch falls Events nicht in zeitlicher Reihenfolge ankommen
+            bisect.insort(self._presses, (timestamp, self._sequence, buzzer))
+            accepted = not self._lockout or self._presses[0][2] is buzzer
+            if accepted and self._lockout and leader is not None:
+                # Ein früherer Druck kam zu spät an: der bisherige Erste wird korrigiert
+                lock_out = getattr(leader, "lock_out", None)
+                if lock_out is not None:
+                    lock_out()
+        if self._journal is not None:
+            if not self._round_active:
+                decision = self._journal.OUTSIDE_ROUND
+            else:
+                decision = self._journal.ACCEPTED if accepted else self._journal.LOCKED_OUT
+            self._journal.append(self._journal.PRESS, self._round, timestamp,
+                                 str(getattr(buzzer, "trigger_key", "")), decision)
+        return accepted
+
+    def release(self, buzzer):
+        """Registers that the buzzer was released."""
+        if self._journal is not None and buzzer in self._held:
+            self._journal.append(self._journal.RELEASE, self._round,
+                                 key=str(getattr(buzzer, "trigger_key", "")))
+        self._held.discard(buzzer)
+
+    def is_locked_out(self, buzzer) -> bool:
+        """Returns True if the buzzer may not light up at the moment."""
+        if not self._round_active:
+            return True
+        return self._lockout and bool(self._presses) and self._presses[0][2] is not buzzer
+
+    @property
+    def winner(self):
+        """Getter for the buzzer pressed first in the current round (None if nobody pressed)."""
+        return self._presses[0][2] if self._presses else None
+
+    def ranking(self) -> List[Tuple[object, int, int]]:
+        """
+        Returns the press order of the current round.
+
+        Returns:
+            list: (buzzer, timestamp, delta to the winner) tuples, times in nanoseconds.
+        """
+        if not self._presses:
+            return []
+        first = self._presses[0][0]
+        return [(buzzer, timestamp, timestamp - first) for timestamp, _, buzzer in self._presses]
+
+    def reaction_times(self) -> Dict[object, int]:
+        """Returns the time from the round start to the press for each buzzer in nanoseconds."""
+        return {buzzer: timestamp - self._round_start for timestamp, _, buzzer in self._presses}
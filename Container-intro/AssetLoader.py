@@ -0,0 +1,174 @@
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Optional
+
+import pygame
+from SoundBank import SoundBank, sound_bank
+from FontCache import FontCache, font_cache
+
+
+class AssetLoader:
+    """
+    Loads every sound and font of a show up front, so that no buzzer press or
+    text draw has to touch the disk mid-round. Sounds are decoded in parallel
+    on a thread pool; fonts are opened on the calling thread meanwhile, since
+    FreeType must not be used from several threads at once.
+
+    Decoded sounds are written as raw PCM next to the source file
+    (`<file>.pcm`). Later runs read the samples from that file instead of
+    decoding the source again, as long as the source and the mixer format are
+    unchanged. This saves the decoding only: the mixer still copies the
+    samples into the Sound.
+    """
+    PCM_SUFFIX = ".pcm"
+    # Kopf der PCM-Datei: Kennung, Frequenz, Sample-Format, Kanäle, mtime und Größe der Quelle
+    PCM_HEADER = struct.Struct("<4siiiqq")
+    PCM_MAGIC = b"PCM1"
+
+    def __init__(self, workers: int = 4, pcm_cache: bool = True,
+                 sounds: SoundBank = sound_bank, fonts: FontCache = font_cache):
+        if not isinstance(workers, int) or workers <= 0:
+            raise ValueError("workers must be a positive integer.")
+        self._workers = workers
+        self._pcm_cache = pcm_cache
+        self._sounds = sounds
+        self._fonts = fonts
+        self._lock = threading.Lock()  # Schützt die Zähler, die Worker parallel erhöhen
+        self.decoded = 0   # Aus der Quelldatei dekodiert
+        self.mapped = 0    # Aus dem PCM-Cache geladen
+        self.failed = 0
+
+    def _count(self, counter: str):
+        """Increases one of the counters from a worker thread."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def preload_scene(self, scene, progress: Optional[Callable[[int, int, str], None]] = None) -> float:
+        """Preloads all sounds and fonts a Scene refers to. See `preload`."""
+        sounds, fonts = scene.assets()
+        return self.preload(sorted(sounds), sorted(fonts), progress)
+
+    def preload(self, sounds: Iterable[str], fontsizes: Iterable[int] = (),
+                progress: Optional[Callable[[int, int, str], None]] = None) -> float:
+        """
+        Loads the given sounds on the thread pool and the font sizes on the calling thread.
+
+        Args:
+            sounds: Sound file paths, as the buzzers will ask the sound bank for them.
+            fontsizes: Sizes of the default font used by texts.
+            progress: Called as progress(done, total, asset name) on the calling
+                thread after each asset, e.g. to draw a loading screen.
+
+        Returns:
+            float: The time the preload took in seconds.
+        """
+        start = time.perf_counter()
+        sounds = [path for path in sounds if path not in self._sounds]
+        fontsizes = list(fontsizes)
+        total = len(sounds) + len(fontsizes)
+        if sounds:
+            self._sounds.init()  # Mixer auf dem Hauptthread starten, nicht in den Workern
+        if fontsizes and not pygame.font.get_init():
+            pygame.font.init()
+
+        done = 0
+        with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="asset-loader") as pool:
+            futures = {pool.submit(self.load_sound, path): path for path in sounds}
+            # Fonts auf diesem Thread, während die Worker dekodieren: FreeType ist nicht threadsicher
+            for size in fontsizes:
+                name = f"font size {size}"
+                try:
+                    self._fonts.get_font(size)
+                except (pygame.error, OSError) as error:
+                    self._count("failed")
+                    logging.warning(f"Could not preload {name}: {error}")
+                done += 1
+                if progress is not None:
+                    progress(done, total, name)
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    future.result()
+                except (pygame.error, OSError) as error:
+                    self._count("failed")
+                    logging.warning(f"Could not preload {name}: {error}")
+                done += 1
+                if progress is not None:
+                    progress(done, total, name)
+        elapsed = time.perf_counter() - start
+        logging.info(f"Preloaded {total} assets in {elapsed * 1000:.1f} ms "
+                     f"({self.decoded} decoded, {self.mapped} from PCM cache)")
+        return elapsed
+
+    def load_sound(self, path: str) -> Optional[pygame.mixer.Sound]:
+        """Loads one sound, preferring the PCM cache, and stores it in the sound bank."""
+        sound = self._load_pcm(path) if self._pcm_cache else None
+        if sound is not None:
+            self._count("mapped")
+        else:
+            try:
+                sound = pygame.mixer.Sound(path)
+            except (pygame.error, FileNotFoundError) as error:
+                logging.warning(f"Could not load sound '{path}': {error}")
+                self._count("failed")
+            else:
+                self._count("decoded")
+                if self._pcm_cache:
+                    self._write_pcm(path, sound)
+        self._sounds.store(path, sound)
+        return sound
+
+    def _pcm_key(self, path: str) -> Optional[tuple]:
+        """Returns the values the PCM cache of a file must match, or None if the file is missing."""
+        mixer = pygame.mixer.get_init()
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not mixer:
+            return None
+        frequency, size, channels = mixer
+        return self.PCM_MAGIC, frequency, size, channels, stat.st_mtime_ns, stat.st_size
+
+    def _load_pcm(self, path: str) -> Optional[pygame.mixer.Sound]:
+        """
+        Returns the sound from its PCM cache, or None if that is missing or stale.
+        The file is memory-mapped only to avoid an extra bytes copy while reading;
+        Sound(buffer=...) copies the samples into the mixer's own memory.
+        """
+        key = self._pcm_key(path)
+        if key is None:
+            return None
+        try:
+            with open(path + self.PCM_SUFFIX, "rb") as file, \
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if len(data) < self.PCM_HEADER.size or self.PCM_HEADER.unpack_from(data) != key:
+                    return None
+                with memoryview(data)[self.PCM_HEADER.size:] as samples:
+                    return pygame.mixer.Sound(buffer=samples)  # Kopiert, spart aber das Dekodieren
+        except (OSError, ValueError, pygame.error):
+            return None
+
+    def _write_pcm(self, path: str, sound: pygame.mixer.Sound):
+        """Stores the decoded samples next to the source file (best effort)."""
+        key = self._pcm_key(path)
+        if key is None:
+            return
+        cache_path = path + self.PCM_SUFFIX
+        temporary = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, "wb") as file:
+                file.write(self.PCM_HEADER.pack(*key))
+                file.write(sound.get_raw())
+            os.replace(temporary, cache_path)
+        except OSError as error:
+            logging.warning(f"Could not write PCM cache {cache_path}: {error}")
+
+    def stats(self) -> Dict[str, int]:
+        """Returns how many sounds were decoded, mapped from the PCM cache or failed."""
+        return {"decoded": self.decoded, "mapped": self.mapped, "failed": self.failed}
@@ -0,0 +1,308 @@
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+from SoundBank import sound_bank
+from Instrumentation import instrumentation
+
+try:
+    import numpy as np
+except ImportError:  # Ohne NumPy werden Bursts einzeln abgespielt statt gemischt
+    np = None
+
+
+class AudioMixer:
+    """
+    Plays the buzzer sounds on a fixed pool of mixer channels.
+
+    The channels are created once when the mixer is initialized, so a press
+    never allocates a channel. A buzzer can reserve a channel of its own that
+    is never taken by others. When the pool is exhausted, the voice stealing
+    policy decides: "oldest" stops the longest playing sound, "none" drops
+    the new one.
+
+    Presses dispatched together (see `batch`) are collected, and a burst of at
+    least `burst_threshold` sounds is mixed with NumPy into one buffer that is
+    scaled down instead of clipping and played on a single channel. Mixing
+    works in the sample format and channel count the mixer was initialized
+    with (signed, unsigned or float samples); the converted samples of the
+    last `sample_cache_size` sounds are kept.
+    """
+    STEAL_OLDEST = "oldest"
+    STEAL_NONE = "none"
+    STEAL_POLICIES = (STEAL_OLDEST, STEAL_NONE)
+
+    def __init__(self, channels: int = 32, steal: str = STEAL_OLDEST, burst_threshold: int = 4,
+                 mix_cache_size: int = 16, sample_cache_size: int = 32):
+        if not isinstance(channels, int) or channels <= 0:
+            raise ValueError("channels must be a positive integer.")
+        if not isinstance(sample_cache_size, int) or sample_cache_size <= 0:
+            raise ValueError("sample_cache_size must be a positive integer.")
+        self._size = channels
+        self.steal = steal
+        self.burst_threshold = burst_threshold
+        self._mix_cache_size = mix_cache_size
+        self._sample_cache_size = sample_cache_size
+        self._channels: List[pygame.mixer.Channel] = []
+        self._pool: List[int] = []                  # Nicht reservierte Kanäle
+        self._started: List[float] = []             # Startzeit je Kanal, für "oldest"
+        self._owners: List[tuple] = []              # Besitzer des Sounds je Kanal
+        self._reserved: Dict[object, int] = {}      # Besitzer -> Kanal
+        self._pending: Optional[List[Tuple[pygame.mixer.Sound, object]]] = None
+        self._format: Optional[tuple] = None        # (Frequenz, Format, Kanäle) aus get_init
+        self._dtype = None                          # Sampletyp des Mixers, vom ersten Sound gelesen
+        self._samples: "OrderedDict[pygame.mixer.Sound, np.ndarray]" = OrderedDict()
+        self._mixes: Dict[tuple, pygame.mixer.Sound] = {}
+        self.played = 0
+        self.stolen = 0
+        self.dropped = 0
+        self.mixed = 0
+
+    @property
+    def steal(self) -> str:
+        """Getter for the voice stealing policy."""
+        return self._steal
+
+    @steal.setter
+    def steal(self, policy: str):
+        """Setter for the voice stealing policy ("oldest" or "none")."""
+        if policy not in self.STEAL_POLICIES:
+            raise ValueError(f"Voice stealing policy must be one of {self.STEAL_POLICIES}.")
+        self._steal = policy
+
+    @property
+    def burst_threshold(self) -> int:
+        """Getter for the number of sounds in one batch from which they are mixed."""
+        return self._burst_threshold
+
+    @burst_threshold.setter
+    def burst_threshold(self, threshold: int):
+        """Setter for the burst threshold, at least 2."""
+        if not isinstance(threshold, int) or threshold < 2:
+            raise ValueError("Burst threshold must be an integer of at least 2.")
+        self._burst_threshold = threshold
+
+    def init(self) -> bool:
+        """
+        Initializes the mixer and creates the channel pool if that has not happened yet.
+
+        Returns:
+            bool: True if sounds can be played.
+        """
+        mixer_format = pygame.mixer.get_init()
+        # Nach einem Neustart des Mixers gibt es wieder nur die Standardzahl an Kanälen
+        if self._channels and mixer_format == self._format and pygame.mixer.get_num_channels() >= self._size:
+            return True
+        if not sound_bank.init():
+            return False
+        pygame.mixer.set_num_channels(max(self._size, pygame.mixer.get_num_channels()))
+        self._channels = [pygame.mixer.Channel(index) for index in range(self._size)]
+        self._started = [0.0] * self._size
+        self._owners = [()] * self._size
+        taken = set(self._reserved.values())
+        self._pool = [index for index in range(self._size) if index not in taken]
+        mixer_format = pygame.mixer.get_init()
+        if mixer_format != self._format:
+            # Anderes Sampleformat oder andere Kanalzahl: umgerechnete Samples passen nicht mehr
+            self._format = mixer_format
+            self._dtype = None
+            self._samples.clear()
+            self._mixes.clear()
+        return True
+
+    def reserve(self, owner) -> bool:
+        """
+        Gives an owner (e.g. a Buzzer) a channel of its own. Its sounds always
+        play there, restarting its previous sound, and never steal or get stolen.
+
+        Returns:
+            bool: False if no unreserved channel is left.
+        """
+        if owner in self._reserved:
+            return True
+        if not self.init() or len(self._pool) <= 1:  # Ein Kanal bleibt für alle anderen
+            return False
+        self._reserved[owner] = self._pool.pop()
+        return True
+
+    def unreserve(self, owner):
+        """Returns the channel of an owner to the shared pool."""
+        index = self._reserved.pop(owner, None)
+        if index is not None:
+            self._pool.append(index)
+
+    def play(self, sound: pygame.mixer.Sound, owner=None) -> bool:
+        """
+        Plays a sound, or queues it while a batch is open.
+
+        Args:
+            sound: The decoded sound.
+            owner: The buzzer the sound belongs to (for reservations and instrumentation).
+
+        Returns:
+            bool: False if the sound was dropped.
+        """
+        if not self.init():
+            return False
+        if owner in self._reserved:
+            self._start(self._reserved[owner], sound, (owner,))
+            return True
+        if self._pending is not None:
+            self._pending.append((sound, owner))
+            return True
+        return self._play_pooled(sound, (owner,))
+
+    @contextmanager
+    def batch(self):
+        """Collects the sounds played inside the block and starts them together when it ends."""
+        if self._pending is not None:
+            yield  # Schon in einem Batch
+            return
+        self._pending = []
+        try:
+            yield
+        finally:
+            pending, self._pending = self._pending, None
+            self._flush(pending)
+
+    def _flush(self, pending: List[Tuple[pygame.mixer.Sound, object]]):
+        """Starts the collected sounds, mixed into one if there are enough of them."""
+        if len(pending) >= self._burst_threshold and np is not None:
+            mixed = self._mix([sound for sound, _ in pending])
+            if mixed is not None:
+                self.mixed += len(pending)
+                self._play_pooled(mixed, [owner for _, owner in pending])
+                return
+        for sound, owner in pending:
+            self._play_pooled(sound, (owner,))
+
+    def _play_pooled(self, sound: pygame.mixer.Sound, owners) -> bool:
+        """Plays a sound on a free pool channel, stealing one if the policy allows."""
+        channels = self._channels
+        free = None
+        for index in self._pool:
+            if not channels[index].get_busy():
+                free = index
+                break
+        if free is None:
+            if self._steal == self.STEAL_NONE or not self._pool:
+                self.dropped += 1
+                return False
+            free = min(self._pool, key=self._started.__getitem__)  # Am längsten laufender Sound
+            self.stolen += 1
+        self._start(free, sound, owners)
+        return True
+
+    def stop(self, owner):
+        """
+        Stops the sounds an owner started. A mixed burst keeps playing,
+        because it also holds the sounds of other owners.
+        """
+        if self._pending is not None:
+            self._pending = [(sound, queued) for sound, queued in self._pending if queued is not owner]
+        if not self._channels:
+            return
+        for index, owners in enumerate(self._owners):
+            if owners == (owner,) and self._channels[index].get_busy():
+                self._channels[index].stop()
+
+    def _start(self, index: int, sound: pygame.mixer.Sound, owners):
+        """Starts the sound on a channel and reports the start to the instrumentation."""
+        self._channels[index].play(sound)
+        self._started[index] = time.perf_counter()
+        self._owners[index] = tuple(owners)
+        self.played += 1
+        if instrumentation.enabled:
+            for owner in owners:
+                if owner is not None:
+                    instrumentation.sound_started(owner)
+
+    def _mix(self, sounds: List[pygame.mixer.Sound]) -> Optional[pygame.mixer.Sound]:
+        """
+        Mixes the sounds into one. Identical sounds are summed with one
+        multiplication, and the sum is scaled down to full scale instead of clipping.
+        """
+        counts: Dict[pygame.mixer.Sound, int] = {}
+        for sound in sounds:
+            counts[sound] = counts.get(sound, 0) + 1
+        key = tuple(sorted((id(sound), count) for sound, count in counts.items()))
+        mixed = self._mixes.get(key)
+        if mixed is not None:
+            return mixed
+        try:
+            samples = [(self._samples_of(sound), count) for sound, count in counts.items()]
+            mixed = pygame.sndarray.make_sound(self._mix_samples(samples, self._dtype))
+        except (pygame.error, ValueError) as error:
+            logging.warning(f"Could not mix burst of {len(sounds)} sounds: {error}")
+            return None
+        if len(self._mixes) >= self._mix_cache_size:
+            self._mixes.clear()
+        self._mixes[key] = mixed
+        return mixed
+
+    @staticmethod
+    def _sample_range(dtype) -> Tuple[float, float]:
+        """
+        Returns the value of silence and the largest amplitude around it for a sample type.
+
+        Raises:
+            ValueError: If samples of this type cannot be mixed.
+        """
+        dtype = np.dtype(dtype)
+        if dtype.kind == "f":
+            return 0.0, 1.0
+        if dtype.kind == "i":
+            return 0.0, float(np.iinfo(dtype).max)
+        if dtype.kind == "u":
+            silence = (np.iinfo(dtype).max + 1) / 2  # Stille liegt in der Mitte
+            return silence, silence - 1
+        raise ValueError(f"Cannot mix samples of type {dtype}.")
+
+    @classmethod
+    def _mix_samples(cls, samples: List[Tuple["np.ndarray", int]], dtype) -> "np.ndarray":
+        """
+        Sums (samples around silence, count) pairs into one array of the mixer's
+        sample type, scaled down to full scale instead of clipping.
+        """
+        silence, limit = cls._sample_range(dtype)
+        buffer = np.zeros((max(len(array) for array, _ in samples),) + samples[0][0].shape[1:],
+                          dtype=np.float32)
+        for array, count in samples:
+            buffer[:len(array)] += array * count
+        peak = float(np.abs(buffer).max()) if buffer.size else 0.0
+        if peak > limit:
+            buffer *= limit / peak  # Leiser statt übersteuert
+        return (buffer + silence).astype(dtype)
+
+    def _samples_of(self, sound: pygame.mixer.Sound) -> "np.ndarray":
+        """
+        Returns the samples of a sound as float32 around silence, converted only
+        once per sound while it is among the last `sample_cache_size` mixed sounds.
+        """
+        samples = self._samples.get(sound)
+        if samples is not None:
+            self._samples.move_to_end(sound)
+            return samples
+        raw = pygame.sndarray.array(sound)  # Im Format und mit der Kanalzahl des Mixers
+        if self._dtype is None:
+            self._dtype = raw.dtype
+        elif raw.dtype != self._dtype:
+            raise ValueError(f"Sound has samples of type {raw.dtype}, the mixer uses {self._dtype}.")
+        silence, _ = self._sample_range(raw.dtype)
+        samples = raw.astype(np.float32) - silence
+        self._samples[sound] = samples
+        if len(self._samples) > self._sample_cache_size:
+            self._samples.popitem(last=False)
+        return samples
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the counters of played, stolen, dropped and mixed sounds."""
+        return {"played": self.played, "stolen": self.stolen, "dropped": self.dropped,
+                "mixed": self.mixed, "reserved": len(self._reserved)}
+
+
+# Gemeinsame Instanz, über die alle Buzzer spielen
+audio_mixer = AudioMixer()
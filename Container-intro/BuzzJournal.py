@@ -0,0 +1,284 @@
+import bisect
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import deque
+from typing import Callable, Iterator, List, Optional
+
+
+class JournalEntry:
+    """One event read back from a BuzzJournal."""
+    __slots__ = ("timestamp_ns", "round", "kind", "decision", "key")
+
+    def __init__(self, timestamp_ns: int, round: int, kind: int, decision: int, key: str):
+        self.timestamp_ns = timestamp_ns  # Wanduhrzeit in Nanosekunden seit 1970
+        self.round = round
+        self.kind = kind
+        self.decision = decision
+        self.key = key
+
+    def __repr__(self) -> str:
+        return (f"JournalEntry({BuzzJournal.KIND_NAMES[self.kind]}, round={self.round}, "
+                f"key={self.key!r}, decision={BuzzJournal.DECISION_NAMES[self.decision]})")
+
+
+class BuzzJournal:
+    """
+    Append-only journal of buzz and round events for post-show analytics.
+
+    The main loop only appends to an in-memory ring buffer, which never blocks
+    (if the buffer is full, the event is dropped and counted). A background
+    thread writes the buffered events as fixed-size binary records and calls
+    fsync at most every `fsync_interval` seconds. Fixed-size records allow
+    reading any range by index, and since rounds only grow, by round.
+    Reopening a file (e.g. after a crash) continues after its last round:
+    `last_round` tells an Arbiter where to go on, and a round lower than one
+    already journaled is rejected, so rounds never get merged.
+    """
+    MAGIC = b"BZJ1"
+    # Ein Eintrag: Wanduhrzeit (ns), Runde, Art, Entscheidung, Taste des Buzzers
+    RECORD = struct.Struct("<qIBB8s")
+
+    # Arten von Einträgen
+    PRESS, RELEASE, ROUND_START, ROUND_END = range(4)
+    KIND_NAMES = ("press", "release", "round_start", "round_end")
+    # Entscheidung des Arbiters über einen Druck
+    NONE, ACCEPTED, LOCKED_OUT, OUTSIDE_ROUND = range(4)
+    DECISION_NAMES = ("none", "accepted", "locked_out", "outside_round")
+
+    def __init__(self, path: str, capacity: int = 65536, flush_interval: float = 0.05,
+                 fsync_interval: float = 1.0):
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError("capacity must be a positive integer.")
+        self._path = path
+        self._capacity = capacity
+        self._flush_interval = flush_interval
+        self._fsync_interval = fsync_interval
+        self._buffer: deque = deque()
+        self.appended = 0
+        self.dropped = 0   # Verworfen, weil der Puffer voll war
+        self.failed = 0    # Verloren, weil das Schreiben fehlschlug
+        self.written = 0
+        # perf_counter_ns der Events in Wanduhrzeit umrechnen, damit Läufe vergleichbar sind
+        self._wall_offset = time.time_ns() - time.perf_counter_ns()
+
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._last_round = 0
+        if not new_file:
+            self._check_magic(path)
+            self._truncate_torn_tail(path)
+            total = self.count(path)
+            if total:
+                self._last_round = self.read(path, total - 1)[0].round
+        # Ungepuffert: ein fehlgeschlagener Block kann wieder abgeschnitten werden
+        self._file = open(path, "ab", buffering=0)
+        if new_file:
+            self._file.write(self.MAGIC)
+        self._size = self._file.seek(0, os.SEEK_END)  # Länge bis zum letzten vollständigen Eintrag
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._write_loop, name="buzz-journal", daemon=True)
+        self._thread.start()
+
+    @property
+    def path(self) -> str:
+        """Getter for the journal file."""
+        return self._path
+
+    @property
+    def last_round(self) -> int:
+        """Getter for the highest round journaled so far, including earlier sessions in the file."""
+        return self._last_round
+
+    @classmethod
+    def _check_magic(cls, path: str):
+        """Raises ValueError if the file is not a journal."""
+        with open(path, "rb") as file:
+            if file.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError(f"{path} is not a buzz journal.")
+
+    @classmethod
+    def _truncate_torn_tail(cls, path: str):
+        """Cuts off a partial record left by a crash, so new records stay aligned."""
+        size = os.path.getsize(path)
+        complete = len(cls.MAGIC) + cls.count(path) * cls.RECORD.size
+        if size != complete:
+            logging.warning(f"Buzz journal {path} ends with a partial record, "
+                            f"cutting off {size - complete} bytes.")
+            os.truncate(path, complete)
+
+    def append(self, kind: int, round: int, timestamp: Optional[int] = None,
+               key: str = "", decision: int = NONE):
+        """
+        Queues an event for writing. Safe to call from the main loop: it never
+        waits for the disk or a lock.
+
+        Args:
+            kind: PRESS, RELEASE, ROUND_START or ROUND_END.
+            round: Number of the round.
+            timestamp: Time from time.perf_counter_ns() (default: now).
+            key: Trigger key of the buzzer.
+            decision: The arbiter's decision for a press.
+
+        Raises:
+            ValueError: If the round is lower than one already journaled.
+        """
+        if round < self._last_round:
+            raise ValueError(f"Round {round} is lower than the last journaled round {self._last_round}.")
+        self._last_round = round
+        if len(self._buffer) >= self._capacity:
+            self.dropped += 1
+            return
+        if timestamp is None:
+            timestamp = time.perf_counter_ns()
+        self._buffer.append((timestamp, round, kind, decision, key))
+        self.appended += 1
+
+    def _write_loop(self):
+        """Writes the buffered events in batches until the journal is closed."""
+        last_sync = time.monotonic()
+        while not self._stop.wait(self._flush_interval):
+            if self._write_batch() and time.monotonic() - last_sync >= self._fsync_interval:
+                self._sync()
+                last_sync = time.monotonic()
+        self._write_batch()
+        self._sync()
+
+    def _write_batch(self) -> int:
+        """Writes everything buffered so far and returns the number of events."""
+        buffer = self._buffer
+        pack = self.RECORD.pack
+        offset = self._wall_offset
+        records = []
+        while buffer:
+            timestamp, round, kind, decision, key = buffer.popleft()
+            records.append(pack(timestamp + offset, round, kind, decision, key.encode("utf-8")[:8]))
+        if records:
+            data = memoryview(b"".join(records))
+            try:
+                while data:
+                    data = data[self._file.write(data):]  # Für Leser sofort sichtbar, fsync folgt gebündelt
+            except OSError as error:
+                self.failed += len(records)
+                logging.error(f"Could not write {len(records)} events to buzz journal {self._path}, "
+                              f"they are lost: {error}")
+                try:
+                    self._file.truncate(self._size)  # Halben Block entfernen, sonst verrutschen alle folgenden
+                except OSError:
+                    pass
+                return 0
+            self._size += len(records) * self.RECORD.size
+            self.written += len(records)
+        return len(records)
+
+    def _sync(self):
+        """Pushes the written events to the disk."""
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError as error:
+            logging.error(f"Could not sync buzz journal {self._path}: {error}")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Waits until all events queued so far are written, e.g. before reading the file.
+
+        Returns:
+            bool: False if the writer did not catch up within the timeout, or if
+            events were lost because writing failed.
+        """
+        target = self.appended
+        failed = self.failed
+        deadline = time.monotonic() + timeout
+        while self.written + self.failed < target:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self._flush_interval / 4)
+        return self.failed == failed
+
+    def close(self):
+        """Writes the remaining events, syncs and stops the writer thread."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join()
+        self._file.close()
+
+    def __enter__(self) -> "BuzzJournal":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Lesen
+
+    @classmethod
+    def count(cls, path: str) -> int:
+        """Returns the number of complete events in a journal file."""
+        return max(0, (os.path.getsize(path) - len(cls.MAGIC)) // cls.RECORD.size)
+
+    @classmethod
+    def read(cls, path: str, start: int = 0, stop: Optional[int] = None) -> List[JournalEntry]:
+        """Returns the events with index start <= i < stop, reading only that part of the file."""
+        cls._check_magic(path)
+        total = cls.count(path)
+        stop = total if stop is None else min(stop, total)
+        if start >= stop:
+            return []
+        with open(path, "rb") as file:
+            file.seek(len(cls.MAGIC) + start * cls.RECORD.size)
+            data = file.read((stop - start) * cls.RECORD.size)
+        return [cls._entry(*record) for record in cls.RECORD.iter_unpack(data)]
+
+    @classmethod
+    def read_rounds(cls, path: str, first: int, last: Optional[int] = None) -> List[JournalEntry]:
+        """Returns the events of rounds first..last, found by binary search."""
+        last = first if last is None else last
+        total = cls.count(path)
+        if not total:
+            return []
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            rounds = _RoundColumn(data, len(cls.MAGIC), cls.RECORD, total)
+            start = bisect.bisect_left(rounds, first)
+            stop = bisect.bisect_right(rounds, last)
+        return cls.read(path, start, stop)
+
+    @classmethod
+    def replay(cls, path: str, handler: Callable[[JournalEntry], None], batch: int = 4096) -> int:
+        """Calls handler for every event in order, reading the file in batches. Returns the count."""
+        count = 0
+        for entry in cls.entries(path, batch):
+            handler(entry)
+            count += 1
+        return count
+
+    @classmethod
+    def entries(cls, path: str, batch: int = 4096) -> Iterator[JournalEntry]:
+        """Yields every event in order."""
+        total = cls.count(path)
+        for start in range(0, total, batch):
+            yield from cls.read(path, start, start + batch)
+
+    @staticmethod
+    def _entry(timestamp: int, round: int, kind: int, decision: int, key: bytes) -> JournalEntry:
+        """Creates an entry from an unpacked record."""
+        return JournalEntry(timestamp, round, kind, decision, key.rstrip(b"\0").decode("utf-8", "replace"))
+
+
+class _RoundColumn:
+    """Sequence view on the round numbers of a journal, for bisect."""
+    __slots__ = ("_data", "_offset", "_record", "_length")
+
+    def __init__(self, data, offset: int, record: struct.Struct, length: int):
+        self._data = data
+        self._offset = offset + 8  # Runde steht hinter dem Zeitstempel
+        self._record = record
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> int:
+        return struct.unpack_from("<I", self._data, self._offset + index * self._record.size)[0]
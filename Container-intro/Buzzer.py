@@ -1,10 +1,26 @@
 import pygame
+from collections import OrderedDict
 from typing import Tuple
 from Object import Object
 from Circle import Circle
 from Rectangle import Rectangle
+from SoundBank import sound_bank
+from AudioMixer import audio_mixer
+from Arbiter import Arbiter
+from Instrumentation import instrumentation
 
 class Buzzer(Object):
+    hit_testable = True  # Kann auch per Maus oder Touchscreen gedrückt werden
+
+    __slots__ = ("_size", "_in_color", "_in_color_inactive", "_in_color_active", "_out_color",
+                 "_trigger_key", "_trigger_code", "_sound", "_loaded_sound",
+                 "_per_pixel_alpha", "_sprite", "_arbiter")
+
+    # Gemeinsamer Cache der vorgerenderten Buzzer-Bilder:
+    # (size, in_color, out_color, per_pixel_alpha) -> Surface
+    _sprite_cache: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+    MAX_CACHED_SPRITES = 128
+
     def __init__(self, position, 
                 visible=True,
                 size: Tuple[int, int] = (50, 50),  # Buzzer should be square-shaped
@@ -13,7 +29,9 @@ class Buzzer(Object):
                 in_color_active: pygame.Color = pygame.Color("red"),
                 out_color: pygame.Color = pygame.Color("gray"),
                 trigger_key: str = '1',   # Which key triggers color change
-                sound: str = "buzzer.wav"   # muss eine .wav datei sein
+                sound: str = "buzzer.wav",   # muss eine .wav datei sein
+                per_pixel_alpha: bool = False,   # Bild mit Alphakanal rendern
+                arbiter=None   # Entscheidet, wer zuerst gedrückt hat
                 ):
         super().__init__(position, visible)
         self._size = size  # Tuple for width and height
@@ -22,7 +40,12 @@ class Buzzer(Object):
         self._in_color_active = in_color_active
         self._out_color = out_color
         self._trigger_key = trigger_key
+        self._trigger_code = self._resolve_key(trigger_key)
         self._sound = sound
+        self._loaded_sound = sound_bank.load(sound)  # Sound wird einmalig vorgeladen
+        self._per_pixel_alpha = per_pixel_alpha
+        self._sprite = None  # Vorgerendertes Bild des aktuellen Zustands
+        self._arbiter = arbiter
         
         # Falls position kein Vector2 ist, wird sie hier konvertiert
         if not isinstance(self.position, pygame.Vector2):
@@ -46,7 +69,11 @@ class Buzzer(Object):
             not all(isinstance(dim, int) and dim >= 0 for dim in new_size)
         ):
             raise ValueError("Size must be a tuple of two non-negative integers (width, height).")
+        self._invalidate()
         self._size = new_size
+        self._sprite = None
+        self._invalidate()
+        self._geometry_changed()
 
     @property
     def in_color(self) -> pygame.Color:
@@ -59,6 +86,8 @@ class Buzzer(Object):
         if not isinstance(new_color, pygame.Color):
             raise TypeError("Inner color must be a pygame.Color object.")
         self._in_color = new_color
+        self._sprite = None
+        self._invalidate()
 
     # Getter und Setter für die innere Farbe (in_color_inactive)
     @property
@@ -98,6 +127,8 @@ class Buzzer(Object):
         if not isinstance(new_color, pygame.Color):
             raise TypeError("Outer color must be a pygame.Color object.")
         self._out_color = new_color
+        self._sprite = None
+        self._invalidate()
 
     # Getter und Setter für den Trigger-Key
     @property
@@ -110,7 +141,27 @@ class Buzzer(Object):
         """Setter for the trigger key."""
         if not isinstance(new_key, str):
             raise TypeError("Trigger key must be an string.")
+        old_bindings = self.event_bindings()
         self._trigger_key = new_key
+        self._trigger_code = self._resolve_key(new_key)
+        self._rebind(old_bindings)  # Dispatch-Index der Container aktualisieren
+
+    @property
+    def arbiter(self):
+        """Getter for the arbiter deciding the press order (None = no arbitration)."""
+        return self._arbiter
+
+    @arbiter.setter
+    def arbiter(self, new_arbiter):
+        """Setter for the arbiter."""
+        if new_arbiter is not None and not isinstance(new_arbiter, Arbiter):
+            raise TypeError("Arbiter must be an Arbiter object or None.")
+        self._arbiter = new_arbiter
+
+    @staticmethod
+    def _resolve_key(key: str):
+        """Converts the trigger key string to the Pygame key code (None if unknown)."""
+        return getattr(pygame, 'K_' + key, None)
 
     @property
     def sound(self) -> str:
@@ -123,48 +174,116 @@ class Buzzer(Object):
         if not isinstance(new_sound, str):
             raise TypeError("Sound must be an string.")
         self._sound = new_sound
+        self._loaded_sound = sound_bank.load(new_sound)
+
+    def bounding_rect(self) -> pygame.Rect:
+        """Returns the screen area covered by the buzzer."""
+        x, y = self.world_position
+        return pygame.Rect(int(x), int(y), self._size[0], self._size[1])
+
+    def fit(self, rect: pygame.Rect):
+        """Centers the buzzer in a layout cell as the largest square that fits."""
+        side = min(rect.width, rect.height)
+        self.size = (side, side)  # Sprite wird nur für die neue Größe neu gerendert
+        self.position = pygame.Vector2(rect.centerx - side // 2, rect.centery - side // 2)
+
+    def event_bindings(self):
+        """Returns the press and release events of the trigger key."""
+        if self._trigger_code is None:
+            return ()
+        return [(pygame.KEYDOWN, self._trigger_code), (pygame.KEYUP, self._trigger_code)]
 
     def handle_key_press(self, event):
         """
-        Handles key press and release events to change the buzzer's inner color.
+        Handles key, mouse button and touch events to change the buzzer's inner color.
+        Mouse and touch events are only delivered by the container if they hit the buzzer.
         
         Args:
             event: The Pygame event object.
         """
-        pygame.mixer.init()
-        sound = pygame.mixer.Sound(self.sound)
-        # Dynamically convert the trigger_key to the correct Pygame key code
-        trigger = getattr(pygame, 'K_' + self.trigger_key, None)  # Get the pygame key code from the string
-
-        if trigger is None:
-            return  # If the key code doesn't exist, do nothing
-
         if event.type == pygame.KEYDOWN:
-            if event.key == trigger:  # If the trigger key is pressed
-                self._in_color = self.in_color_active  # Change color to active
-                sound.play()
+            if event.key == self._trigger_code:  # If the trigger key is pressed
+                self.press(getattr(event, "timestamp", None))
         elif event.type == pygame.KEYUP:
-            if event.key == trigger:  # If the trigger key is released
-                self._in_color = self.in_color_inactive  # Reset to inactive color when key is released
+            if event.key == self._trigger_code:  # If the trigger key is released
+                self.release()
+        elif event.type in (pygame.MOUSEBUTTONDOWN, pygame.FINGERDOWN):
+            self.press(getattr(event, "timestamp", None))
+        elif event.type in (pygame.MOUSEBUTTONUP, pygame.FINGERUP):
+            self.release()
 
-    def draw(self, screen: pygame.Surface):
-        """Draw a buzzer. Square with a centered Circle inside"""
-        if self.visible:
-            # Größe als Tuple, daher Zugriff auf die einzelnen Dimensionen
-            width, height = self.size  # Unpacking der Größe in width und height
-            
-            # Rechteck erstellen
-            square = Rectangle(self.position, size=(width, height), color=self.out_color)
-            
-            # Berechnung des Zentrums, Annahme: self.position ist ein Vector
-            center = self.position + pygame.Vector2(width / 2, height / 2)  # Vermeide direkte Tuple-Operationen
-            
-            # Kreis erstellen
-            circle = Circle(center, radius=width / 2 - 5, color=self.in_color)  # radius basiert auf der Breite
-            
-            # Zeichne beide Objekte
-            square.draw(screen)
-            circle.draw(screen)
+    def press(self, timestamp=None):
+        """
+        Activates the buzzer: plays the sound and changes the color to active.
+        With an arbiter the buzzer stays dark if it was not first (lockout)
+        or if the press is only a key auto-repeat.
 
+        Args:
+            timestamp (int): Time of the press from time.perf_counter_ns().
+        """
+        if self._arbiter is not None and not self._arbiter.press(self, timestamp):
+            return
+        if instrumentation.enabled:
+            instrumentation.press_dispatched(self, timestamp)
+        if self._loaded_sound is not None:
+            audio_mixer.play(self._loaded_sound, self)  # Meldet den Start selbst an die Messung
+        self._in_color = self.in_color_active  # Change color to active
+        self._sprite = None
+        self._invalidate()
 
-    
+    def lock_out(self):
+        """
+        Takes back the feedback of a press that the arbiter ranked second after
+        all, because an earlier press arrived later: the buzzer goes dark and
+        its sound stops.
+        """
+        audio_mixer.stop(self)
+        self._in_color = self.in_color_inactive
+        self._sprite = None
+        self._invalidate()
+
+    def release(self):
+        """Resets the buzzer to the inactive color."""
+        if self._arbiter is not None:
+            self._arbiter.release(self)
+        self._in_color = self.in_color_inactive  # Reset to inactive color when released
+        self._sprite = None
+        self._invalidate()
+
+    @classmethod
+    def _render_sprite(cls, size: Tuple[int, int], in_color: pygame.Color,
+                       out_color: pygame.Color, per_pixel_alpha: bool) -> pygame.Surface:
+        """
+        Returns the pre-rendered image of a buzzer (square with a centered circle).
+        Each combination of size and colors is rasterized only once.
+        """
+        key = (size, tuple(in_color), tuple(out_color), per_pixel_alpha)
+        sprite = cls._sprite_cache.get(key)
+        if sprite is not None:
+            cls._sprite_cache.move_to_end(key)
+            return sprite
+
+        width, height = size
+        sprite = pygame.Surface(size, pygame.SRCALPHA if per_pixel_alpha else 0)
+        # Gleiche Zeichenbefehle wie Rectangle.draw und Circle.draw, nur lokal bei (0, 0)
+        Rectangle(pygame.Vector2(0, 0), size=size, color=out_color).draw(sprite)
+        Circle(pygame.Vector2(width / 2, height / 2), radius=width / 2 - 5, color=in_color).draw(sprite)
+        if pygame.display.get_surface() is not None:
+            # An das Pixelformat des Fensters anpassen, damit blit schnell ist
+            sprite = sprite.convert_alpha() if per_pixel_alpha else sprite.convert()
+
+        cls._sprite_cache[key] = sprite
+        if len(cls._sprite_cache) > cls.MAX_CACHED_SPRITES:
+            cls._sprite_cache.popitem(last=False)
+        return sprite
+
+    def draw(self, screen: pygame.Surface):
+        """Draw a buzzer as a single blit of its pre-rendered image."""
+        if self.visible:
+            if self._sprite is None:
+                self._sprite = self._render_sprite(self._size, self._in_color,
+                                                   self._out_color, self._per_pixel_alpha)
+            x, y = self.world_position
+            screen.blit(self._sprite, (int(x), int(y)))
+            if instrumentation.enabled:
+                instrumentation.buzzer_drawn(self)
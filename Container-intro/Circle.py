@@ -3,6 +3,8 @@ from typing import Tuple
 from Object import Object
 
 class Circle(Object):
+    __slots__ = ("_radius", "_color", "_border_color", "_border_width")
+
     def __init__(self, position: pygame.Vector2, 
                  visible=True, 
                  radius: int = 10, 
@@ -25,7 +27,10 @@ class Circle(Object):
         """Setter for the radius of the circle."""
         if not isinstance(new_radius, int) or new_radius < 0:
             raise ValueError("Radius must be a non-negative integer.")
+        self._invalidate()
         self._radius = new_radius
+        self._invalidate()
+        self._geometry_changed()
 
     @property
     def color(self) -> pygame.Color:
@@ -38,6 +43,7 @@ class Circle(Object):
         if not isinstance(new_color, pygame.Color):
             raise TypeError("Color must be a pygame.Color object.")
         self._color = new_color
+        self._invalidate()
 
     @property
     def border_color(self) -> pygame.Color:
@@ -50,6 +56,7 @@ class Circle(Object):
         if not isinstance(new_color, pygame.Color):
             raise TypeError("Border color must be a pygame.Color object.")
         self._border_color = new_color
+        self._invalidate()
 
     @property
     def border_width(self) -> int:
@@ -61,12 +68,29 @@ class Circle(Object):
         """Setter for the circle's border width."""
         if not isinstance(new_width, int) or new_width < 0:
             raise ValueError("Border width must be a non-negative integer.")
+        self._invalidate()
         self._border_width = new_width
+        self._invalidate()
+
+    def bounding_rect(self) -> pygame.Rect:
+        """Returns the screen area covered by the circle."""
+        x, y = self.world_position
+        x, y = int(x), int(y)
+        return pygame.Rect(x - self._radius, y - self._radius, 2 * self._radius + 1, 2 * self._radius + 1)
+
+    def fit(self, rect: pygame.Rect):
+        """Centers the circle in a layout cell with the largest radius that fits."""
+        self.radius = max(0, (min(rect.width, rect.height) - 1) // 2)
+        self.position = pygame.Vector2(rect.center)
 
     def change_size(self, amount: int):
         """Changes the radius by the given amount (can be positive or negative)."""
         self.radius = max(0, self._radius + amount)
 
+    def event_bindings(self):
+        """Returns the key presses handled by this object (keys 1, 2 and 3)."""
+        return [(pygame.KEYDOWN, pygame.K_1), (pygame.KEYDOWN, pygame.K_2), (pygame.KEYDOWN, pygame.K_3)]
+
     def handle_key_press(self, event):
         """
         Handles key press and release events to change the circle's color.
@@ -85,16 +109,17 @@ class Circle(Object):
     def draw(self, screen: pygame.Surface):
         """Draw the circle on the given screen."""
         if self.visible:
+            x, y = self.world_position
             # Draw the filled circle
             pygame.draw.circle(screen, 
                                self.color, 
-                               (int(self.position.x), int(self.position.y)), 
+                               (int(x), int(y)), 
                                self.radius)
             # Draw the border if width > 0
             if self.border_width > 0:
                 pygame.draw.circle(screen, 
                                    self.border_color, 
-                                   (int(self.position.x), int(self.position.y)), 
+                                   (int(x), int(y)), 
                                    self.radius, 
                                    self.border_width)
 
@@ -1,16 +1,54 @@
 import pygame
 import logging
-from typing import List
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
 from Object import Object
+from SpatialGrid import SpatialGrid
+from Instrumentation import instrumentation
+from Scheduler import Scheduler
+from Layout import Layout
 from Circle import Circle
 from Text import Text
 
 
+class _Batch:
+    """Changes collected by Container.batch."""
+    __slots__ = ("changed", "geometry", "overflow", "_limit")
+
+    def __init__(self, limit: int):
+        self.changed: Dict[Object, pygame.Rect] = {}  # Objekt -> Fläche vor der ersten Änderung
+        self.geometry: Dict[Object, None] = {}        # Objekte mit neuer Fläche, in Reihenfolge
+        self.overflow = False                         # Zu viele für einzelne Bereiche
+        self._limit = limit
+
+    def touch(self, obj: Object):
+        """Records an object before its first change in the batch."""
+        if self.overflow or obj in self.changed:
+            return
+        if len(self.changed) >= self._limit:
+            self.overflow = True
+            self.changed.clear()
+            return
+        self.changed[obj] = obj.bounding_rect()
+
+
 class Container(Object):
     """
     Represents a container that manages a list of objects.
     It can add or remove objects of the `Object` class.
+    The positions of the objects are relative to the position of the container,
+    so moving the container moves everything inside it.
     """
+    __slots__ = ("_objects", "_window_size", "_background_color", "_bindings",
+                 "_dirty_rects", "_dirty_full", "_hit_grid", "_pressed",
+                 "_bounds", "_scheduler", "_layout", "_layouts", "_arranged",
+                 "_batch", "_changes")
+
+    # Events, die über die Position statt über eine Taste zugestellt werden
+    POINTER_DOWN_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.FINGERDOWN)
+    POINTER_UP_EVENTS = (pygame.MOUSEBUTTONUP, pygame.FINGERUP)
+
     def __init__(
         self, 
         position: pygame.Vector2 = pygame.Vector2(0, 0), 
@@ -22,18 +60,56 @@ class Container(Object):
         self._objects: List[Object] = []
         self._window_size = window_size
         self._background_color = background_color
+        # Dispatch-Index über den gesamten Teilbaum: (event type, key code) -> Objekte
+        self._bindings: Dict[Tuple[int, int], List[Object]] = {}
+        # Geänderte Bildschirmbereiche, werden nur im obersten Container gesammelt
+        self._dirty_rects: List[pygame.Rect] = []
+        self._dirty_full = False
+        # Räumlicher Index der anklickbaren Objekte im gesamten Teilbaum
+        self._hit_grid = SpatialGrid()
+        self._pressed: Dict[tuple, Object] = {}  # Zeiger (Maustaste/Finger) -> gedrücktes Objekt
+        self._bounds: Optional[pygame.Rect] = None  # Zwischengespeicherte Fläche des Teilbaums
+        self._scheduler: Optional[Scheduler] = None  # Wird beim ersten Zugriff im obersten Container angelegt
+        self._layout: Optional[Layout] = None
+        self._layouts: Dict[tuple, list] = {}  # (Flächengröße, Layout-Version) -> Zellen
+        self._arranged: Optional[tuple] = None  # Zuletzt angewendeter Schlüssel
+        self._batch: Optional[_Batch] = None  # Offener Batch, nur im obersten Container
+        self._changes: Optional[Set[Object]] = None  # Geänderte Objekte, nur wenn jemand mitliest
 
     def add_object(self, obj: Object):
         """Adds an object to the container."""
         if not isinstance(obj, Object):
             raise TypeError("Only instances of Object can be added.")
+        if obj._parent is not None and obj._parent is not self:
+            obj._parent.remove_object(obj)  # Ein Objekt gehört immer nur zu einem Container
         self._objects.append(obj)
+        obj._parent = self
+        obj._transform_changed()  # Liegt jetzt relativ zu diesem Container
+        for handler, bindings in self._subtree_bindings(obj):
+            self._index(handler, bindings)
+        for target in self._subtree_hit_objects(obj):
+            self._index_hit(target)
+        self._invalidate_bounds()
+        obj._invalidate()
+        self._log_change(self)
+        self._relayout()
         logging.info(f"Added object at position {obj.position}. Total objects: {len(self._objects)}")
 
     def remove_object(self, obj: Object):
         """Removes an object from the container if it exists."""
         if obj in self._objects:
+            obj._invalidate()
             self._objects.remove(obj)
+            for handler, bindings in self._subtree_bindings(obj):
+                self._unindex(handler, bindings)
+            if obj not in self._objects:
+                for target in self._subtree_hit_objects(obj):
+                    self._unindex_hit(target)
+                obj._parent = None
+                obj._transform_changed()
+            self._invalidate_bounds()
+            self._log_change(self)
+            self._relayout()
             logging.info(f"Removed object from position {obj.position}. Total objects: {len(self._objects)}")
         else:
             logging.warning("Attempted to remove an object that is not in the container.")
@@ -41,7 +117,18 @@ class Container(Object):
     def clear_objects(self):
         """Removes all objects from the container."""
         count = len(self._objects)
+        for obj in self._objects:
+            obj._invalidate()
+            for handler, bindings in self._subtree_bindings(obj):
+                self._unindex(handler, bindings)
+            for target in self._subtree_hit_objects(obj):
+                self._unindex_hit(target)
+            obj._parent = None
+            obj._transform_changed()
         self._objects.clear()
+        self._invalidate_bounds()
+        self._log_change(self)
+        self._relayout()
         logging.info(f"Cleared all objects from the container. Removed {count} objects.")
 
     def get_objects(self) -> List[Object]:
@@ -64,6 +151,75 @@ class Container(Object):
         for obj in self._objects:
             obj.visible = is_visible  # Ensure contained objects match visibility
 
+    @property
+    def scheduler(self) -> Scheduler:
+        """Getter for the animation and timer scheduler, shared by the whole tree."""
+        root = self
+        while root._parent is not None:
+            root = root._parent
+        if root._scheduler is None:
+            root._scheduler = Scheduler()
+        return root._scheduler
+
+    @property
+    def layout(self) -> Optional[Layout]:
+        """Getter for the layout placing the objects (None = absolute positions)."""
+        return self._layout
+
+    @layout.setter
+    def layout(self, layout: Optional[Layout]):
+        """Setter for the layout. Applied right away if the container was already laid out."""
+        if layout is not None and not isinstance(layout, Layout):
+            raise TypeError("Layout must be a Layout instance or None.")
+        self._layout = layout
+        self._relayout()
+
+    def apply_layout(self, size: Optional[Tuple[int, int]] = None):
+        """
+        Places the objects for an area of the given size, recursively for nested
+        containers. Each size is computed once and cached, and calling this again
+        with the size already applied does nothing, so resized surfaces (buzzer
+        sprites, rendered texts) are only rebuilt when the size really changes.
+
+        Args:
+            size: Size of the area (default: the last applied size, or the window size).
+                Nested containers get the size of their cell, or without one the area
+                of their parent.
+        """
+        if size is None:
+            size = self._arranged[0] if self._arranged is not None else self._window_size
+        layout = self._layout
+        key = (tuple(size), -1 if layout is None else layout.version)
+        if key == self._arranged:
+            return
+        self._arranged = key
+        cells = None
+        if layout is not None:
+            cells = self._layouts.get(key)
+            if cells is None:
+                if len(self._layouts) >= 16:
+                    self._layouts.clear()
+                cells = self._layouts[key] = layout.arrange(self._objects, key[0])
+        for index, obj in enumerate(list(self._objects)):
+            cell = cells[index] if cells is not None else None
+            if cell is not None:
+                obj.fit(cell)
+            elif isinstance(obj, Container):
+                obj.apply_layout(key[0])
+
+    def _relayout(self):
+        """Drops the cached cells after the objects or the layout changed, and lays out again if already laid out."""
+        self._layouts.clear()
+        if self._arranged is not None:
+            size = self._arranged[0]
+            self._arranged = None
+            self.apply_layout(size)
+
+    def fit(self, rect: pygame.Rect):
+        """Moves the container to the cell and lays out its objects in the size of the cell."""
+        self.position = pygame.Vector2(rect.topleft)
+        self.apply_layout(rect.size)
+
     @property
     def window_size(self) -> tuple[int, int]:
         """Getter for the window size."""
@@ -75,6 +231,9 @@ class Container(Object):
         if not (isinstance(size, tuple) and len(size) == 2 and all(isinstance(dim, int) and dim > 0 for dim in size)):
             raise ValueError("window_size must be a tuple of two positive integers.")
         self._window_size = size
+        if self._parent is None:
+            with self.batch():
+                self.apply_layout(size)  # Nur bei neuer Größe wird neu angeordnet
 
     @property
     def background_color(self) -> pygame.Color:
@@ -83,24 +242,385 @@ class Container(Object):
 
     @background_color.setter
     def background_color(self, color: pygame.Color):
-        """Setter for the background color."""
+        """
+        Setter for the background color. Only the root container's background
+        is painted (it fills the window), so only there the window is redrawn.
+        """
         if not isinstance(color, pygame.Color):
             raise TypeError("background_color must be of type pygame.Color.")
         self._background_color = color
+        if self._parent is None:
+            self.invalidate_all()  # Der Hintergrund füllt das ganze Fenster
+
+    def bounding_rect(self) -> pygame.Rect:
+        """
+        Returns the union of the screen areas of all contained objects.
+        The result is cached until an object in the subtree changes its geometry.
+        """
+        if self._bounds is None:
+            rects = [rect for rect in (obj.bounding_rect() for obj in self._objects)
+                     if rect.width and rect.height]
+            if rects:
+                self._bounds = rects[0].unionall(rects[1:])
+            else:
+                x, y = self.world_position
+                self._bounds = pygame.Rect(int(x), int(y), 0, 0)
+        return self._bounds
+
+    def _transform_changed(self):
+        """
+        Drops the cached world positions and bounds of the whole subtree.
+        The objects compute their new world position on the next access.
+        """
+        self._world = None
+        self._bounds = None
+        for obj in self._objects:
+            obj._transform_changed()
+
+    def _geometry_changed(self):
+        """Moves the hit-test entries of the subtree after the container moved."""
+        batch = self._parent._open_batch() if self._parent is not None else None
+        if batch is not None:
+            batch.geometry[self] = None  # Wird am Ende des Batches einmal nachgeholt
+            return
+        for target in list(self._hit_grid._entries):
+            target._parent._index_hit(target)
+        super()._geometry_changed()
+
+    def _invalidate_bounds(self):
+        """Drops the cached bounds of this container and all parent containers."""
+        container = self
+        # Ist ein Container schon ungültig, sind es seine Eltern auch
+        while container is not None and container._bounds is not None:
+            container._bounds = None
+            container = container._parent
+
+    @contextmanager
+    def batch(self):
+        """
+        Defers the invalidation of all changes made inside the block to its end:
+        every changed object reports its old and new area once, and the areas
+        are marked dirty as one rectangle (or, for more than MAX_DIRTY_RECTS
+        objects, as the whole window). Index updates run once per object.
+        Batches can be nested; only the outermost one invalidates.
+        """
+        root = self._root()
+        if root._batch is not None:
+            yield
+            return
+        root._batch = _Batch(self.MAX_DIRTY_RECTS)
+        try:
+            yield
+        finally:
+            batch, root._batch = root._batch, None
+            root._finish_batch(batch)
+
+    def _open_batch(self) -> Optional["_Batch"]:
+        """Returns the open batch of the tree, or None."""
+        return self._root()._batch
+
+    def _root(self) -> "Container":
+        """Returns the topmost container of the tree."""
+        container = self
+        while container._parent is not None:
+            container = container._parent
+        return container
+
+    def track_changes(self):
+        """
+        Starts recording which objects of the tree change (see `take_changes`),
+        e.g. for a SceneBroadcaster that only republishes changed objects.
+        """
+        root = self._root()
+        if root._changes is None:
+            root._changes = set()
+
+    def take_changes(self) -> Set[Object]:
+        """
+        Returns the objects changed since the last call and starts a new record.
+        A container in the result means its objects were added, removed or moved.
+        """
+        root = self._root()
+        changes = root._changes
+        if changes is None:
+            raise RuntimeError("Changes are not tracked, call track_changes() first.")
+        root._changes = set()
+        return changes
+
+    def _log_change(self, obj: Object):
+        """Records a changed object if changes are tracked."""
+        root = self._root()
+        if root._changes is not None:
+            root._changes.add(obj)
+
+    def _finish_batch(self, batch: "_Batch"):
+        """Updates the indexes of the changed objects and marks their areas dirty at once."""
+        for obj in batch.geometry:
+            if obj._parent is None:
+                continue  # Im Batch entfernt
+            if isinstance(obj, Container):
+                obj._geometry_changed()
+            else:
+                obj._parent._child_geometry_changed(obj)
+        if batch.overflow:
+            self.invalidate_all()  # Viele Änderungen: ein ganzes Bild statt vieler Bereiche
+            return
+        rects = list(batch.changed.values())
+        rects += [obj.bounding_rect() for obj in batch.changed if obj._parent is not None]
+        rects = [rect for rect in rects if rect.width and rect.height]
+        if rects:
+            self._mark_dirty(rects[0].unionall(rects[1:]))
+
+    def update_objects(self, changes: Union[Mapping[Object, Mapping[str, Any]],
+                                            Iterable[Tuple[Object, Mapping[str, Any]]]]) -> int:
+        """
+        Changes many properties as one transaction, e.g. to reset all buzzers,
+        shapes and texts for a new round. Objects and property names are checked
+        before anything is changed; the values are checked by the setters, and
+        if one fails, every change already made is undone. The changed areas
+        are invalidated once at the end.
+
+        Args:
+            changes: {object: {property: value}} or (object, {property: value}) pairs.
+                The objects have to be in this container or below it.
+
+        Returns:
+            int: The number of properties set.
+
+        Raises:
+            ValueError: If an object is not in this container.
+            AttributeError: If a property does not exist or cannot be set.
+            TypeError, ValueError: If a setter rejects a value (after the rollback).
+        """
+        pairs = list(changes.items()) if isinstance(changes, Mapping) else list(changes)
+        # Erster Durchlauf: alles prüfen, bevor etwas geändert wird
+        settable = set()  # Schon geprüfte (Klasse, Eigenschaft)
+        for obj, values in pairs:
+            if not isinstance(obj, Object) or not self._contains(obj):
+                raise ValueError(f"{obj!r} is not in this container.")
+            for name in values:
+                if (type(obj), name) in settable:
+                    continue
+                prop = getattr(type(obj), name, None)
+                if not isinstance(prop, property) or prop.fset is None:
+                    raise AttributeError(f"{type(obj).__name__} has no settable property '{name}'.")
+                settable.add((type(obj), name))
+        undo: List[Tuple[Object, str, Any]] = []
+        with self.batch():
+            try:
+                for obj, values in pairs:
+                    for name, value in values.items():
+                        old_value = getattr(obj, name)
+                        setattr(obj, name, value)
+                        undo.append((obj, name, old_value))
+            except Exception:
+                for obj, name, old_value in reversed(undo):
+                    setattr(obj, name, old_value)
+                raise
+        return len(undo)
+
+    def _contains(self, obj: Object) -> bool:
+        """Returns True if the object is in this container or one of its nested containers."""
+        parent = obj._parent
+        while parent is not None:
+            if parent is self:
+                return True
+            parent = parent._parent
+        return False
+
+    # Maximale Anzahl gesammelter Bereiche, danach wird das ganze Fenster neu gezeichnet
+    MAX_DIRTY_RECTS = 64
+
+    def _mark_dirty(self, rect: pygame.Rect):
+        """Collects a changed screen area in the root container."""
+        container = self
+        while container._parent is not None:
+            container = container._parent
+        if container._dirty_full or rect.width == 0 or rect.height == 0:
+            return
+        if len(container._dirty_rects) >= self.MAX_DIRTY_RECTS:
+            container._dirty_full = True
+            container._dirty_rects.clear()
+        else:
+            container._dirty_rects.append(rect)
+
+    def invalidate_rect(self, rect: pygame.Rect):
+        """Marks a screen area as dirty, e.g. for overlays drawn outside the scene."""
+        self._mark_dirty(pygame.Rect(rect))
+
+    def invalidate_all(self):
+        """Marks the whole window as dirty, e.g. after a resize."""
+        self._dirty_full = True
+        self._dirty_rects.clear()
+
+    def has_dirty_rects(self) -> bool:
+        """Returns True if some screen area has to be redrawn."""
+        return self._dirty_full or bool(self._dirty_rects)
+
+    def collect_dirty_rects(self) -> List[pygame.Rect]:
+        """
+        Returns the changed screen areas since the last call and resets them.
+        Overlapping areas are merged, so no pixel is repainted twice.
+        """
+        if self._dirty_full:
+            self._dirty_full = False
+            self._dirty_rects.clear()
+            return [pygame.Rect((0, 0), self._window_size)]
+        merged: List[pygame.Rect] = []
+        for rect in self._dirty_rects:
+            # So lange zusammenfassen, bis kein Bereich mehr überlappt
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect = rect.union(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        self._dirty_rects.clear()
+        return merged
+
+    @staticmethod
+    def _subtree_bindings(obj: Object) -> List[Tuple[Object, List[Tuple[int, int]]]]:
+        """Returns (handler, bindings) for the object or, for containers, its whole subtree."""
+        if isinstance(obj, Container):
+            handlers: Dict[Object, List[Tuple[int, int]]] = {}
+            for binding, objects in obj._bindings.items():
+                for handler in objects:
+                    handlers.setdefault(handler, []).append(binding)
+            return list(handlers.items())
+        return [(obj, list(obj.event_bindings()))]
+
+    def _index(self, handler: Object, bindings: Iterable[Tuple[int, int]]):
+        """Registers a handler in this container and all parent containers."""
+        container = self
+        while container is not None:
+            for binding in bindings:
+                container._bindings.setdefault(binding, []).append(handler)
+            container = container._parent
+
+    def _unindex(self, handler: Object, bindings: Iterable[Tuple[int, int]]):
+        """Removes a handler from this container and all parent containers."""
+        container = self
+        while container is not None:
+            for binding in bindings:
+                handlers = container._bindings.get(binding)
+                if handlers and handler in handlers:
+                    handlers.remove(handler)
+                    if not handlers:
+                        del container._bindings[binding]
+            container = container._parent
+
+    @staticmethod
+    def _subtree_hit_objects(obj: Object) -> List[Object]:
+        """Returns the hit-testable objects of the object or, for containers, its whole subtree."""
+        if isinstance(obj, Container):
+            return list(obj._hit_grid._entries)
+        return [obj] if obj.hit_testable else []
+
+    def _index_hit(self, obj: Object):
+        """Registers (or moves) a hit-testable object in this container and all parent containers."""
+        rect = obj.bounding_rect()
+        container = self
+        while container is not None:
+            container._hit_grid.insert(obj, rect)
+            container = container._parent
+
+    def _unindex_hit(self, obj: Object):
+        """Removes a hit-testable object from this container and all parent containers."""
+        container = self
+        while container is not None:
+            container._hit_grid.remove(obj)
+            container._pressed = {pointer: target for pointer, target in container._pressed.items()
+                                  if target is not obj}
+            container = container._parent
+
+    def _child_geometry_changed(self, obj: Object):
+        """Keeps the spatial index up to date when a child moves or changes its size."""
+        if obj.hit_testable:
+            self._index_hit(obj)
+        self._invalidate_bounds()
+
+    def _draw_order(self, obj: Object) -> List[int]:
+        """Returns the position of the object in the drawing order of this container."""
+        path = []
+        while obj is not self and obj._parent is not None:
+            path.append(obj._parent._objects.index(obj))
+            obj = obj._parent
+        return path[::-1]
+
+    def hit_test(self, x: float, y: float):
+        """
+        Returns the top-most visible hit-testable object at the position, or None.
+        Only the objects in one grid cell are checked.
+        """
+        hits = [obj for obj in self._hit_grid.query_point(x, y) if obj.visible]
+        if not hits:
+            return None
+        if len(hits) == 1:
+            return hits[0]
+        return max(hits, key=self._draw_order)  # Zuletzt gezeichnetes Objekt liegt oben
+
+    def _pointer(self, event):
+        """Returns an id for the mouse button or finger and its position in pixels."""
+        if event.type in (pygame.FINGERDOWN, pygame.FINGERUP):
+            width, height = self._window_size
+            return ("finger", event.touch_id, event.finger_id), (event.x * width, event.y * height)
+        return ("mouse", event.button), event.pos
+
+    def _handle_pointer(self, event):
+        """Delivers mouse button and touch events to the object under the pointer."""
+        if getattr(event, "touch", False):
+            return  # Von SDL aus Touch erzeugte Maus-Events, der Finger wird schon behandelt
+        pointer, (x, y) = self._pointer(event)
+        if event.type in self.POINTER_DOWN_EVENTS:
+            target = self.hit_test(x, y)
+            if target is None:
+                return
+            self._pressed[pointer] = target
+        else:
+            # Loslassen geht an das gedrückte Objekt, auch wenn der Zeiger weitergewandert ist
+            target = self._pressed.pop(pointer, None)
+            if target is None:
+                return
+        target.handle_key_press(event)
 
     def handle_key_press(self, event):
         """
-        Handle all key press events by propagating the key press to 
-        all objects in the container.
+        Dispatches the event to the objects of the (nested) container that
+        subscribed to its event type and key code. Costs a single dict lookup.
+        Mouse and touch presses go to the top-most object under the pointer.
         """
-        for obj in self.get_objects():
-            if hasattr(obj, "handle_key_press"):  # Ensure the object has the method
+        if event.type in self.POINTER_DOWN_EVENTS or event.type in self.POINTER_UP_EVENTS:
+            self._handle_pointer(event)
+            return
+        handlers = self._bindings.get((event.type, getattr(event, "key", None)))
+        if handlers:
+            for obj in tuple(handlers):  # Kopie, falls ein Handler den Index ändert
                 obj.handle_key_press(event)
     
     def draw(self, screen):
-        """Draws all objects contained in this container."""
-        for obj in self.get_objects():
-            obj.draw(screen)  # Call the draw method of each object
+        """
+        Draws all objects contained in this container.
+        Invisible objects and objects (or whole nested containers) outside
+        the clip rect of the screen are skipped.
+        """
+        if not self._visible:
+            return
+        clip = screen.get_clip()
+        if not clip.colliderect(self.bounding_rect()):
+            return
+        if instrumentation.enabled:
+            self._draw_measured(screen, clip)
+            return
+        for obj in self._objects:
+            if obj.visible and clip.colliderect(obj.bounding_rect()):
+                obj.draw(screen)  # Call the draw method of each object
+
+    def _draw_measured(self, screen, clip):
+        """Same as draw, but records the draw time of every object."""
+        for obj in self._objects:
+            if obj.visible and clip.colliderect(obj.bounding_rect()):
+                start = time.perf_counter_ns()
+                obj.draw(screen)
+                instrumentation.add_draw_time(obj, time.perf_counter_ns() - start)
     
 
 if __name__ == "__main__":
@@ -0,0 +1,239 @@
+"""
+Recording and replay of the input events of a show.
+
+    python EventLog.py show.json recording.evl              # replay as fast as possible
+    python EventLog.py show.json recording.evl --realtime   # replay with the recorded timing
+    python EventLog.py show.json --storm 5000 --duration 2  # synthetic storm of 5000 presses/s
+"""
+import argparse
+import os
+import random
+import struct
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pygame
+
+MAGIC = b"EVL2"
+# Ein Eintrag: Zeit seit Aufnahmebeginn (ns), Event-Typ, Taste/Maustaste/Finger, Touch-Gerät, x, y.
+# SDL vergibt Finger- und Geräte-IDs als 64-Bit-Zahlen.
+RECORD = struct.Struct("<qHqqff")
+# Ältere Aufnahmen ohne Touch-Gerät und mit 32-Bit-Finger-IDs können weiter gelesen werden
+MAGIC_V1 = b"EVL1"
+RECORD_V1 = struct.Struct("<qHiff")
+
+KEY_EVENTS = (pygame.KEYDOWN, pygame.KEYUP)
+MOUSE_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+FINGER_EVENTS = (pygame.FINGERDOWN, pygame.FINGERUP)
+
+
+def encode_event(event: pygame.event.Event, start_ns: int) -> Optional[bytes]:
+    """Packs a press or release event into one record, or returns None for other events."""
+    timestamp = getattr(event, "timestamp", start_ns) - start_ns
+    if event.type in KEY_EVENTS:
+        return RECORD.pack(timestamp, event.type, event.key, 0, 0.0, 0.0)
+    if event.type in MOUSE_EVENTS:
+        if getattr(event, "touch", False):
+            return None  # Wird als Finger-Event schon aufgezeichnet
+        return RECORD.pack(timestamp, event.type, event.button, 0, *event.pos)
+    if event.type in FINGER_EVENTS:
+        return RECORD.pack(timestamp, event.type, event.finger_id, event.touch_id, event.x, event.y)
+    return None
+
+
+def decode_event(event_type: int, code: int, device: int, x: float, y: float,
+                 timestamp: int) -> pygame.event.Event:
+    """Creates the pygame event of one record, stamped with the given capture time."""
+    if event_type in MOUSE_EVENTS:
+        return pygame.event.Event(event_type, button=code, pos=(int(x), int(y)), timestamp=timestamp)
+    if event_type in FINGER_EVENTS:
+        return pygame.event.Event(event_type, touch_id=device, finger_id=code, x=x, y=y, timestamp=timestamp)
+    return pygame.event.Event(event_type, key=code, timestamp=timestamp)
+
+
+class EventRecorder:
+    """
+    Writes the key, mouse button and touch events handled by the main loop
+    into a compact binary file (34 bytes per event), with their capture
+    time relative to the start of the recording.
+    """
+    def __init__(self, path: str):
+        self._path = path
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+        self._start_ns = time.perf_counter_ns()
+        self.recorded = 0
+
+    @property
+    def path(self) -> str:
+        """Getter for the file the events are written to."""
+        return self._path
+
+    def record(self, events: Iterable[pygame.event.Event]):
+        """Appends the press and release events among `events`."""
+        records = [record for record in (encode_event(event, self._start_ns) for event in events)
+                   if record is not None]
+        if records:
+            self._file.write(b"".join(records))
+            self.recorded += len(records)
+
+    def close(self):
+        """Flushes and closes the file."""
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "EventRecorder":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class EventReplayer:
+    """
+    Feeds recorded events back through Container.handle_key_press, either with
+    the recorded timing or as fast as possible. No display is needed.
+    Each event is stamped with replay start + recorded offset, so an Arbiter
+    ranks the presses exactly as in the recording.
+    """
+    def __init__(self, records: Sequence[Tuple[int, int, int, int, float, float]]):
+        self._records = sorted(records)  # (timestamp, type, code, device, x, y)
+
+    @classmethod
+    def load(cls, path: str) -> "EventReplayer":
+        """Reads a recording written by EventRecorder (also in the older EVL1 format)."""
+        with open(path, "rb") as file:
+            data = file.read()
+        magic = data[:len(MAGIC)]
+        if magic not in (MAGIC, MAGIC_V1):
+            raise ValueError(f"{path} is not an event recording.")
+        record = RECORD if magic == MAGIC else RECORD_V1
+        body = memoryview(data)[len(MAGIC):]
+        if len(body) % record.size:
+            raise ValueError(f"{path} ends with an incomplete event.")
+        if record is RECORD_V1:
+            return cls([(timestamp, event_type, code, 0, x, y)
+                        for timestamp, event_type, code, x, y in RECORD_V1.iter_unpack(body)])
+        return cls(list(RECORD.iter_unpack(body)))
+
+    @classmethod
+    def storm(cls, keys: Sequence[int], rate: float, duration: float, hold: float = 0.05,
+              seed: int = 0) -> "EventReplayer":
+        """
+        Creates a synthetic storm: `rate` presses per second spread randomly over
+        `keys` for `duration` seconds, each released again after `hold` seconds.
+        The same seed always gives the same storm.
+        """
+        generator = random.Random(seed)
+        records = []
+        for _ in range(int(rate * duration)):
+            timestamp = int(generator.uniform(0, duration) * 1e9)
+            key = generator.choice(keys)
+            records.append((timestamp, pygame.KEYDOWN, key, 0, 0.0, 0.0))
+            records.append((timestamp + int(hold * 1e9), pygame.KEYUP, key, 0, 0.0, 0.0))
+        return cls(records)
+
+    def save(self, path: str):
+        """Writes the events in the recording format."""
+        with open(path, "wb") as file:
+            file.write(MAGIC)
+            file.write(b"".join(RECORD.pack(*record) for record in self._records))
+
+    def __len__(self) -> int:
+        """Returns the number of events."""
+        return len(self._records)
+
+    def events(self, base_ns: int = 0) -> Iterator[pygame.event.Event]:
+        """Yields the events, stamped with `base_ns` + their recorded offset."""
+        for timestamp, event_type, code, device, x, y in self._records:
+            yield decode_event(event_type, code, device, x, y, base_ns + timestamp)
+
+    def replay(self, container, realtime: bool = False, speed: float = 1.0) -> Dict[str, float]:
+        """
+        Dispatches all events to the container.
+
+        Args:
+            container (Container): The root container receiving the events.
+            realtime (bool): Wait until each event is due instead of replaying
+                as fast as possible.
+            speed (float): Replay speed in realtime mode, 2.0 = twice as fast.
+
+        Returns:
+            dict: Number of events, elapsed seconds, events per second and, in
+            realtime mode, how late events were dispatched (maximum and mean in microseconds).
+        """
+        if speed <= 0:
+            raise ValueError("speed must be positive.")
+        start = time.perf_counter_ns()
+        lateness = []
+        for event in self.events(start):
+            if realtime:
+                due = start + (event.timestamp - start) / speed
+                delay = due - time.perf_counter_ns()
+                if delay > 0:
+                    time.sleep(delay / 1e9)
+                lateness.append(max(0, time.perf_counter_ns() - due))
+            container.handle_key_press(event)
+        elapsed = (time.perf_counter_ns() - start) / 1e9
+        stats = {"events": len(self._records), "seconds": elapsed,
+                 "events_per_second": len(self._records) / elapsed if elapsed else 0.0}
+        if lateness:
+            stats["max_late_us"] = max(lateness) / 1000
+            stats["mean_late_us"] = sum(lateness) / len(lateness) / 1000
+        return stats
+
+
+def main() -> int:
+    # Wiedergabe ohne Fenster und ohne Soundkarte
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from Arbiter import Arbiter
+    from Buzzer import Buzzer
+    from Scene import Scene
+
+    parser = argparse.ArgumentParser(description="Replay recorded or synthetic buzzer events headless")
+    parser.add_argument("scene", help="scene file to replay the events into")
+    parser.add_argument("recording", nargs="?", help="file written by EventRecorder")
+    parser.add_argument("--realtime", action="store_true", help="keep the recorded timing")
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--storm", type=float, default=0.0, help="synthetic presses per second")
+    parser.add_argument("--duration", type=float, default=1.0, help="length of the storm in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pygame.init()
+    root = Scene.load(args.scene).root
+    buzzers: List[Buzzer] = []
+    pending = [root]
+    while pending:
+        obj = pending.pop()
+        if isinstance(obj, Buzzer):
+            buzzers.append(obj)
+        pending.extend(getattr(obj, "get_objects", list)())
+    arbiter = Arbiter()
+    for buzzer in buzzers:
+        buzzer.arbiter = arbiter
+
+    if args.storm:
+        keys = sorted({buzzer._trigger_code for buzzer in buzzers if buzzer._trigger_code is not None})
+        replayer = EventReplayer.storm(keys, args.storm, args.duration, seed=args.seed)
+    elif args.recording:
+        replayer = EventReplayer.load(args.recording)
+    else:
+        parser.error("either a recording or --storm is required")
+
+    arbiter.start_round()
+    stats = replayer.replay(root, realtime=args.realtime, speed=args.speed)
+    pygame.quit()
+    print(f"{stats['events']} events in {stats['seconds']:.3f} s "
+          f"({stats['events_per_second']:.0f} events/s)")
+    if "max_late_us" in stats:
+        print(f"dispatch lateness: mean {stats['mean_late_us']:.0f} us, max {stats['max_late_us']:.0f} us")
+    for buzzer, timestamp, delta in arbiter.ranking()[:5]:
+        print(f"  {buzzer.trigger_key}: +{delta / 1e6:.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+import pygame
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class FontCache:
+    """
+    Process-wide cache for fonts and rendered text surfaces.
+    Fonts and rendered surfaces are both kept in bounded LRU caches, so
+    layouts that pick new font sizes on every resize do not pile up fonts.
+    """
+    def __init__(self, max_surfaces: int = 256, max_fonts: int = 32):
+        if not isinstance(max_surfaces, int) or max_surfaces <= 0:
+            raise ValueError("max_surfaces must be a positive integer.")
+        if not isinstance(max_fonts, int) or max_fonts <= 0:
+            raise ValueError("max_fonts must be a positive integer.")
+        self._max_surfaces = max_surfaces
+        self._max_fonts = max_fonts
+        self._fonts: "OrderedDict[Tuple[Optional[str], int], pygame.font.Font]" = OrderedDict()
+        self._surfaces: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+
+    def get_font(self, size: int, name: Optional[str] = None) -> pygame.font.Font:
+        """Returns the font for the given file name (None = default font) and size."""
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is not None:
+            self._fonts.move_to_end(key)
+            return font
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = pygame.font.Font(name, size)
+        self._fonts[key] = font
+        if len(self._fonts) > self._max_fonts:
+            self._fonts.popitem(last=False)  # Gerenderte Flächen dieser Größe bleiben gültig
+        return font
+
+    def render(self, text: str, color: pygame.Color, size: int,
+               name: Optional[str] = None, antialias: bool = True) -> pygame.Surface:
+        """
+        Returns the rendered surface for the text.
+        Surfaces are shared, so callers must not draw onto them.
+        """
+        key = (text, tuple(color), size, name, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+        surface = self.get_font(size, name).render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self._max_surfaces:
+            self._surfaces.popitem(last=False)  # Am längsten unbenutzte Fläche entfernen
+        return surface
+
+    def clear(self):
+        """Removes all cached fonts and surfaces."""
+        self._fonts.clear()
+        self._surfaces.clear()
+
+    def __len__(self) -> int:
+        """Returns the number of cached surfaces."""
+        return len(self._surfaces)
+
+
+# Gemeinsame Instanz für alle Texte
+font_cache = FontCache()
@@ -0,0 +1,337 @@
+import logging
+import queue
+import select
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, List, Optional
+
+import pygame
+from AudioMixer import audio_mixer
+
+try:
+    import evdev
+except ImportError:  # Nur für EvdevInputSource nötig, und nur unter Linux verfügbar
+    evdev = None
+
+# Wird von Eingabe-Threads gepostet, um eine schlafende Hauptschleife zu wecken
+WAKEUP_EVENT = pygame.event.custom_type()
+
+
+def stamp_events(events, now: Optional[int] = None):
+    """
+    Gives every event a high-resolution timestamp (time.perf_counter_ns) right
+    after it was read, unless its source already stamped it.
+    """
+    if now is None:
+        now = time.perf_counter_ns()
+    for event in events:
+        if not hasattr(event, "timestamp"):
+            event.timestamp = now
+
+
+class InputSource(ABC):
+    """
+    Base class for everything that produces input events (keyboard,
+    network, hardware buzzers, tests). Threaded sources are read on
+    their own thread by the InputPump, the others on the main thread.
+    """
+    threaded = True
+
+    @abstractmethod
+    def read(self, timeout: float) -> List[pygame.event.Event]:
+        """
+        Returns the available events, blocking at most `timeout` seconds
+        if none are available.
+        """
+
+    def close(self):
+        """Releases the resources of the source."""
+        pass
+
+
+class PygameInputSource(InputSource):
+    """
+    Reads keyboard, mouse and window events from pygame.
+    SDL only allows pumping its event queue on the main thread,
+    so this source is polled by the main loop and not by a thread.
+    Events are stamped when they are read, so their resolution is the
+    polling interval: the main loop polls between frames with
+    InputPump.poll_for, not just once per frame. For exact capture times
+    read the buzzers with a threaded source like EvdevInputSource.
+    """
+    threaded = False
+
+    def read(self, timeout: float) -> List[pygame.event.Event]:
+        """Returns all pending pygame events, waiting up to `timeout` seconds for the first one."""
+        if timeout > 0:
+            event = pygame.event.wait(max(1, int(timeout * 1000)))  # 0 hieße: ewig warten
+            events = [] if event.type == pygame.NOEVENT else [event]
+            events += pygame.event.get()  # Weitere wartende Events gleich mitnehmen
+        else:
+            events = pygame.event.get()
+        stamp_events(events)
+        return [event for event in events if event.type != WAKEUP_EVENT]
+
+
+class EvdevInputSource(InputSource):
+    """
+    Reads key events of one Linux input device (a keyboard or a USB/HID
+    buzzer box) on its own thread via evdev. Every event carries the time
+    the kernel received it, converted to time.perf_counter_ns, so presses
+    are ordered correctly no matter when the main loop gets to them.
+
+    Args:
+        device: Path of the device (e.g. "/dev/input/event3") or an opened evdev.InputDevice.
+        keymap (dict): evdev key code -> pygame key. Defaults to the key of the same name.
+        grab (bool): Take the device exclusively, so its keys do not also reach
+            the pygame window and count twice.
+    """
+    EV_KEY = 1                      # Ereignistyp für Tasten, aus linux/input-event-codes.h
+    KEY_UP, KEY_DOWN, KEY_REPEAT = 0, 1, 2
+
+    def __init__(self, device, keymap: Optional[Dict[int, int]] = None, grab: bool = True):
+        if isinstance(device, str):
+            if evdev is None:
+                raise RuntimeError("EvdevInputSource needs the evdev package (pip install evdev).")
+            device = evdev.InputDevice(device)
+        self._device = device
+        self._keymap: Dict[int, Optional[int]] = dict(keymap or {})
+        self._grabbed = False
+        if grab:
+            device.grab()
+            self._grabbed = True
+
+    def _pygame_key(self, code: int) -> Optional[int]:
+        """Returns the pygame key for an evdev key code, looked up by name once per code."""
+        if code not in self._keymap:
+            key = None
+            if evdev is not None:
+                names = evdev.ecodes.KEY.get(code, ())
+                for name in [names] if isinstance(names, str) else names:
+                    try:
+                        key = pygame.key.key_code(name[len("KEY_"):].lower())
+                        break
+                    except ValueError:
+                        continue
+            self._keymap[code] = key
+        return self._keymap[code]
+
+    def read(self, timeout: float) -> List[pygame.event.Event]:
+        """Returns the key presses and releases read from the device, waiting up to `timeout` seconds."""
+        if not select.select([self._device.fd], [], [], timeout)[0]:
+            return []
+        # Kernel-Zeit (CLOCK_REALTIME) auf die Uhr von perf_counter_ns umrechnen
+        offset = time.perf_counter_ns() - time.time_ns()
+        events = []
+        try:
+            for raw in self._device.read():
+                if raw.type != self.EV_KEY or raw.value == self.KEY_REPEAT:
+                    continue  # Auto-Repeat erkennt der Arbiter selbst
+                key = self._pygame_key(raw.code)
+                if key is None:
+                    continue
+                timestamp = (raw.sec * 1_000_000_000 + raw.usec * 1000) + offset
+                events.append(pygame.event.Event(
+                    pygame.KEYDOWN if raw.value == self.KEY_DOWN else pygame.KEYUP,
+                    key=key, timestamp=timestamp))
+        except BlockingIOError:
+            pass  # Ein anderer Leser war schneller
+        return events
+
+    def close(self):
+        """Releases the device."""
+        if self._grabbed:
+            try:
+                self._device.ungrab()
+            except OSError:
+                pass
+            self._grabbed = False
+        self._device.close()
+
+
+class SyntheticInputSource(InputSource):
+    """Thread-safe source for events generated by tests, replays or load generators."""
+    def __init__(self):
+        self._queue: "queue.SimpleQueue[pygame.event.Event]" = queue.SimpleQueue()
+
+    def push(self, event: pygame.event.Event):
+        """Queues an event; it is stamped when the pump reads it unless it has a timestamp."""
+        self._queue.put(event)
+
+    def read(self, timeout: float) -> List[pygame.event.Event]:
+        """Returns the queued events, waiting up to `timeout` seconds for the first one."""
+        try:
+            events = [self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                return events
+
+
+class InputPump:
+    """
+    Input acquisition decoupled from rendering. Threaded sources are read
+    continuously on background threads, stamped at capture time and put
+    into a queue. Main-thread sources are polled for the rest of every
+    frame (see poll_for). The main loop drains the queue once per frame and
+    forwards the events, sorted by capture time, to the container.
+    Measures the latency from capture to handler dispatch.
+    """
+    def __init__(self, sources: Optional[List[InputSource]] = None, max_samples: int = 10000):
+        self._sources: List[InputSource] = []
+        self._queue: "queue.SimpleQueue[pygame.event.Event]" = queue.SimpleQueue()
+        self._threads: List[threading.Thread] = []
+        self._running = False
+        self._latencies: deque = deque(maxlen=max_samples)  # Nanosekunden
+        for source in sources or []:
+            self.add_source(source)
+
+    def add_source(self, source: InputSource):
+        """Adds an input source; threaded sources start reading immediately if the pump runs."""
+        if not isinstance(source, InputSource):
+            raise TypeError("Source must be an InputSource object.")
+        self._sources.append(source)
+        if self._running and source.threaded:
+            self._start_thread(source)
+
+    def start(self):
+        """Starts one reader thread per threaded source."""
+        if self._running:
+            return
+        self._running = True
+        for source in self._sources:
+            if source.threaded:
+                self._start_thread(source)
+
+    def stop(self):
+        """Stops the reader threads and closes all sources."""
+        self._running = False
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads.clear()
+        for source in self._sources:
+            source.close()
+
+    def _start_thread(self, source: InputSource):
+        """Starts the reader thread of a source."""
+        thread = threading.Thread(target=self._read_loop, args=(source,),
+                                  name=f"input-{type(source).__name__}", daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def _read_loop(self, source: InputSource):
+        """Reads a source until the pump is stopped."""
+        while self._running:
+            try:
+                events = source.read(0.05)
+            except Exception:
+                logging.exception(f"Input source {type(source).__name__} failed.")
+                return
+            if events:
+                stamp_events(events)
+                for event in events:
+                    self._queue.put(event)
+                self._wake_main_loop()
+
+    def inject(self, event: pygame.event.Event):
+        """Queues an event from any thread, stamping it now if it has no timestamp."""
+        stamp_events((event,))
+        self._queue.put(event)
+        self._wake_main_loop()
+
+    @staticmethod
+    def _wake_main_loop():
+        """Wakes a main loop sleeping in pygame.event.wait (posting is thread-safe in SDL)."""
+        if pygame.display.get_init():
+            try:
+                pygame.event.post(pygame.event.Event(WAKEUP_EVENT))
+            except pygame.error:
+                pass
+
+    def poll(self) -> int:
+        """
+        Reads the main-thread sources without waiting and queues their events,
+        stamped now. Returns the number of events read.
+        """
+        count = 0
+        for source in self._sources:
+            if not source.threaded:
+                events = source.read(0.0)
+                for event in events:
+                    self._queue.put(event)
+                count += len(events)
+        return count
+
+    def poll_for(self, duration: float, interval: float = 0.001):
+        """
+        Polls the main-thread sources every `interval` seconds for `duration`
+        seconds, e.g. for the rest of a frame instead of sleeping through it.
+        Presses within one frame so get timestamps `interval` apart instead of
+        all sharing the time the frame read them.
+        """
+        deadline = time.perf_counter() + duration
+        while True:
+            self.poll()
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return
+            time.sleep(min(interval, remaining))
+
+    def _take_queued(self) -> List[pygame.event.Event]:
+        """Returns all events captured by the reader threads without blocking."""
+        events = []
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                return events
+
+    def drain(self, timeout: float = 0.0) -> List[pygame.event.Event]:
+        """
+        Returns all events captured since the last call, sorted by capture time.
+        Waits up to `timeout` seconds if nothing has been captured yet.
+        """
+        events = self._take_queued()
+        main_thread_sources = [source for source in self._sources if not source.threaded]
+        if main_thread_sources:
+            wait = 0.0 if events else timeout
+            for source in main_thread_sources:
+                events += source.read(wait)
+                wait = 0.0
+        elif not events and timeout > 0:
+            try:
+                events.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                pass
+        events += self._take_queued()  # Beim Aufwachen können weitere Events angekommen sein
+        events.sort(key=lambda event: event.timestamp)
+        return events
+
+    def dispatch(self, container, events: List[pygame.event.Event]):
+        """
+        Forwards the events to the container and records their latency.
+        Sounds started by the events are played together, so a burst is mixed.
+        """
+        with audio_mixer.batch():
+            for event in events:
+                self._latencies.append(time.perf_counter_ns() - event.timestamp)
+                container.handle_key_press(event)
+
+    def latency_stats(self) -> Dict[str, float]:
+        """Returns count, mean, median, 99th percentile and maximum latency in microseconds."""
+        if not self._latencies:
+            return {"count": 0, "mean_us": 0.0, "p50_us": 0.0, "p99_us": 0.0, "max_us": 0.0}
+        samples = sorted(self._latencies)
+        count = len(samples)
+        return {
+            "count": count,
+            "mean_us": sum(samples) / count / 1000,
+            "p50_us": samples[count // 2] / 1000,
+            "p99_us": samples[min(count - 1, count * 99 // 100)] / 1000,
+            "max_us": samples[-1] / 1000,
+        }
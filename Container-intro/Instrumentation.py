@@ -0,0 +1,184 @@
+import json
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+import pygame
+from FontCache import font_cache
+
+
+class LatencyHistogram:
+    """Histogram of latencies with fixed buckets (upper bounds in microseconds)."""
+    BUCKETS_US = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000)
+
+    def __init__(self):
+        self._counts = [0] * (len(self.BUCKETS_US) + 1)  # Letzter Eimer: alles darüber
+        self._count = 0
+        self._total_ns = 0
+        self._max_ns = 0
+
+    def add(self, latency_ns: int):
+        """Adds one measurement."""
+        self._counts[bisect_left(self.BUCKETS_US, latency_ns / 1000)] += 1
+        self._count += 1
+        self._total_ns += latency_ns
+        if latency_ns > self._max_ns:
+            self._max_ns = latency_ns
+
+    @property
+    def count(self) -> int:
+        """Getter for the number of measurements."""
+        return self._count
+
+    def percentile_us(self, fraction: float) -> float:
+        """Returns the upper bound of the bucket containing the percentile (in microseconds)."""
+        if not self._count:
+            return 0.0
+        target = fraction * self._count
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= target:
+                if index < len(self.BUCKETS_US):
+                    return float(self.BUCKETS_US[index])
+                break
+        return self._max_ns / 1000
+
+    def to_dict(self) -> Dict:
+        """Returns the histogram as a JSON-serializable dict."""
+        return {
+            "count": self._count,
+            "mean_us": self._total_ns / self._count / 1000 if self._count else 0.0,
+            "max_us": self._max_ns / 1000,
+            "p50_us": self.percentile_us(0.5),
+            "p99_us": self.percentile_us(0.99),
+            "buckets_us": list(self.BUCKETS_US) + ["inf"],
+            "counts": list(self._counts),
+        }
+
+
+class Instrumentation:
+    """
+    Measures how long a buzz takes from the event receipt to the sound and
+    to the changed color being on screen. Records timestamps at event receipt,
+    handler dispatch, Sound.play, draw and display flip/update, keeps
+    per-buzzer latency histograms and per-object draw times.
+    All hooks check `enabled` first, so the disabled cost is one attribute lookup.
+    """
+    def __init__(self):
+        self.enabled = False
+        self._pending: Dict[object, Dict[str, int]] = {}  # Buzzer -> Zeitstempel des laufenden Drucks
+        self._key_to_sound: Dict[str, LatencyHistogram] = {}
+        self._key_to_frame: Dict[str, LatencyHistogram] = {}
+        self._dispatch: Dict[str, LatencyHistogram] = {}
+        self._draw_times: Dict[str, List[int]] = {}  # Objekt -> [Anzahl, Summe ns]
+
+    def reset(self):
+        """Forgets all measurements."""
+        self._pending.clear()
+        self._key_to_sound.clear()
+        self._key_to_frame.clear()
+        self._dispatch.clear()
+        self._draw_times.clear()
+
+    @staticmethod
+    def _label(obj) -> str:
+        """Returns a readable name for an object."""
+        key = getattr(obj, "trigger_key", None)
+        if key is not None:
+            return f"Buzzer {key}"
+        return f"{type(obj).__name__}@{id(obj):x}"
+
+    def press_dispatched(self, buzzer, receipt_ns: Optional[int]):
+        """Called when a press reaches the buzzer's handler."""
+        now = time.perf_counter_ns()
+        self._pending[buzzer] = {"receipt": now if receipt_ns is None else receipt_ns, "dispatch": now}
+
+    def sound_started(self, buzzer):
+        """Called right after Sound.play for a press."""
+        stamps = self._pending.get(buzzer)
+        if stamps is not None and "sound" not in stamps:
+            stamps["sound"] = time.perf_counter_ns()
+
+    def buzzer_drawn(self, buzzer):
+        """Called when a buzzer is drawn; the first draw after a press counts."""
+        stamps = self._pending.get(buzzer)
+        if stamps is not None and "draw" not in stamps:
+            stamps["draw"] = time.perf_counter_ns()
+
+    def frame_presented(self):
+        """Called right after display.flip/update; completes all drawn presses."""
+        if not self._pending:
+            return
+        now = time.perf_counter_ns()
+        for buzzer, stamps in list(self._pending.items()):
+            if "draw" not in stamps:
+                continue
+            label = self._label(buzzer)
+            receipt = stamps["receipt"]
+            self._dispatch.setdefault(label, LatencyHistogram()).add(stamps["dispatch"] - receipt)
+            if "sound" in stamps:
+                self._key_to_sound.setdefault(label, LatencyHistogram()).add(stamps["sound"] - receipt)
+            self._key_to_frame.setdefault(label, LatencyHistogram()).add(now - receipt)
+            del self._pending[buzzer]
+
+    def add_draw_time(self, obj, duration_ns: int):
+        """Adds the time one draw call of an object took."""
+        label = self._label(obj)
+        counter = self._draw_times.get(label)
+        if counter is None:
+            self._draw_times[label] = [1, duration_ns]
+        else:
+            counter[0] += 1
+            counter[1] += duration_ns
+
+    def summary(self) -> Dict:
+        """Returns all measurements as a JSON-serializable dict."""
+        return {
+            "key_to_dispatch": {label: hist.to_dict() for label, hist in self._dispatch.items()},
+            "key_to_sound": {label: hist.to_dict() for label, hist in self._key_to_sound.items()},
+            "key_to_frame": {label: hist.to_dict() for label, hist in self._key_to_frame.items()},
+            "draw_time": {label: {"count": count, "total_us": total / 1000, "mean_us": total / count / 1000}
+                          for label, (count, total) in self._draw_times.items()},
+        }
+
+    def dump(self, path: str):
+        """Writes the measurements as JSON to a file."""
+        with open(path, "w") as file:
+            json.dump(self.summary(), file, indent=2)
+
+    def overlay_lines(self, max_objects: int = 5) -> List[str]:
+        """Returns the text lines of the on-screen overlay."""
+        lines = ["latency p50/max (ms)   key->sound   key->frame"]
+        for label, frame in sorted(self._key_to_frame.items()):
+            sound = self._key_to_sound.get(label)
+            sound_text = (f"{sound.percentile_us(0.5) / 1000:.1f}/{sound.to_dict()['max_us'] / 1000:.1f}"
+                          if sound else "-")
+            lines.append(f"{label:<20}{sound_text:>13}"
+                         f"{frame.percentile_us(0.5) / 1000:>9.1f}/{frame.to_dict()['max_us'] / 1000:.1f}")
+        slowest = sorted(self._draw_times.items(), key=lambda item: item[1][1], reverse=True)
+        for label, (count, total) in slowest[:max_objects]:
+            lines.append(f"draw {label:<24}{total / count / 1000:>8.1f} us")
+        return lines
+
+    def draw_overlay(self, screen: pygame.Surface, position=(5, 5), fontsize: int = 18) -> pygame.Rect:
+        """
+        Draws the overlay onto the screen.
+
+        Returns:
+            pygame.Rect: The area covered by the overlay.
+        """
+        x, y = position
+        area = pygame.Rect(x, y, 0, 0)
+        for line in self.overlay_lines():
+            surface = font_cache.render(line, pygame.Color("black"), fontsize)
+            background = surface.get_rect(topleft=(x, y))
+            screen.fill(pygame.Color("white"), background)
+            screen.blit(surface, background)
+            area.union_ip(background)
+            y += background.height
+        return area
+
+
+# Gemeinsame Instanz, standardmäßig ausgeschaltet
+instrumentation = Instrumentation()
@@ -0,0 +1,141 @@
+import math
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import pygame
+
+# Benannte Ankerpunkte als Anteil an Breite und Höhe
+ANCHORS: Dict[str, Tuple[float, float]] = {
+    "topleft": (0.0, 0.0), "top": (0.5, 0.0), "topright": (1.0, 0.0),
+    "left": (0.0, 0.5), "center": (0.5, 0.5), "right": (1.0, 0.5),
+    "bottomleft": (0.0, 1.0), "bottom": (0.5, 1.0), "bottomright": (1.0, 1.0),
+}
+
+
+class Layout(ABC):
+    """
+    Places the objects of a Container inside its area, in fractions of the
+    area instead of pixels, so a scene keeps its layout at every window size.
+    The Container computes the layout once per area size and caches the result.
+    """
+    def __init__(self):
+        self.version = 0  # Wird bei jeder Änderung erhöht, damit Container ihren Cache verwerfen
+
+    def _changed(self):
+        """Marks cached results of this layout as outdated."""
+        self.version += 1
+
+    @abstractmethod
+    def arrange(self, objects: Sequence, size: Tuple[int, int]) -> List[Optional[pygame.Rect]]:
+        """
+        Returns the cell of each object in container coordinates, or None for
+        objects the layout leaves where they are.
+        """
+
+
+class GridLayout(Layout):
+    """
+    Places the objects row by row into a grid of equal cells.
+
+    Args:
+        columns (int): Number of columns.
+        rows (int): Number of rows (default: as many as the objects need).
+        margin (float): Space around the grid, as a fraction of the area.
+        spacing (float): Space between the cells, as a fraction of the area.
+    """
+    def __init__(self, columns: int, rows: Optional[int] = None, margin: float = 0.05, spacing: float = 0.02):
+        super().__init__()
+        if not isinstance(columns, int) or columns <= 0:
+            raise ValueError("columns must be a positive integer.")
+        if rows is not None and (not isinstance(rows, int) or rows <= 0):
+            raise ValueError("rows must be a positive integer.")
+        if not (0 <= margin < 0.5 and 0 <= spacing < 1):
+            raise ValueError("margin and spacing must be fractions of the area.")
+        self._columns = columns
+        self._rows = rows
+        self._margin = margin
+        self._spacing = spacing
+
+    @property
+    def columns(self) -> int:
+        """Getter for the number of columns."""
+        return self._columns
+
+    @columns.setter
+    def columns(self, columns: int):
+        """Setter for the number of columns."""
+        if not isinstance(columns, int) or columns <= 0:
+            raise ValueError("columns must be a positive integer.")
+        self._columns = columns
+        self._changed()
+
+    def arrange(self, objects: Sequence, size: Tuple[int, int]) -> List[Optional[pygame.Rect]]:
+        width, height = size
+        columns = self._columns
+        rows = self._rows or max(1, math.ceil(len(objects) / columns))
+        left, top = width * self._margin, height * self._margin
+        gap_x, gap_y = width * self._spacing, height * self._spacing
+        cell_width = (width - 2 * left - (columns - 1) * gap_x) / columns
+        cell_height = (height - 2 * top - (rows - 1) * gap_y) / rows
+        cells: List[Optional[pygame.Rect]] = []
+        for index in range(len(objects)):
+            row, column = divmod(index, columns)
+            if row >= rows:
+                cells.append(None)  # Mehr Objekte als Zellen: bleiben, wo sie sind
+                continue
+            x = left + column * (cell_width + gap_x)
+            y = top + row * (cell_height + gap_y)
+            cells.append(pygame.Rect(round(x), round(y), max(0, round(cell_width)), max(0, round(cell_height))))
+        return cells
+
+
+class AnchorLayout(Layout):
+    """
+    Places single objects relative to an anchor point of the area, e.g. a
+    title at the top, a scoreboard at the bottom right. Objects that were not
+    placed keep their position.
+    """
+    def __init__(self):
+        super().__init__()
+        self._placements: Dict[object, Tuple[Tuple[float, float], Tuple[float, float], Tuple[float, float]]] = {}
+
+    def place(self, obj, anchor: Union[str, Tuple[float, float]] = "center",
+              size: Tuple[float, float] = (0.2, 0.2), offset: Tuple[float, float] = (0.0, 0.0)):
+        """
+        Anchors an object to the area.
+
+        Args:
+            obj (Object): The object, which has to be in the container using this layout.
+            anchor: Name of the anchor ("topleft", "center", "bottomright", ...) or
+                (x, y) as fractions. The same point of the object sits on that point of the area.
+            size: Width and height of the object's cell as fractions of the area.
+            offset: Shift of the cell as fractions of the area.
+        """
+        if isinstance(anchor, str):
+            if anchor not in ANCHORS:
+                raise ValueError(f"Unknown anchor '{anchor}', expected one of {sorted(ANCHORS)}.")
+            anchor = ANCHORS[anchor]
+        if not all(0 <= value <= 1 for value in (*anchor, *size)):
+            raise ValueError("anchor and size must be fractions between 0 and 1.")
+        self._placements[obj] = (tuple(anchor), tuple(size), tuple(offset))
+        self._changed()
+
+    def remove(self, obj):
+        """Leaves an object where it is again."""
+        if self._placements.pop(obj, None) is not None:
+            self._changed()
+
+    def arrange(self, objects: Sequence, size: Tuple[int, int]) -> List[Optional[pygame.Rect]]:
+        width, height = size
+        cells: List[Optional[pygame.Rect]] = []
+        for obj in objects:
+            placement = self._placements.get(obj)
+            if placement is None:
+                cells.append(None)
+                continue
+            (anchor_x, anchor_y), (size_x, size_y), (offset_x, offset_y) = placement
+            cell_width, cell_height = width * size_x, height * size_y
+            x = (anchor_x + offset_x) * width - anchor_x * cell_width
+            y = (anchor_y + offset_y) * height - anchor_y * cell_height
+            cells.append(pygame.Rect(round(x), round(y), round(cell_width), round(cell_height)))
+        return cells
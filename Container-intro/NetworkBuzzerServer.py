@@ -0,0 +1,214 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, Mapping, Optional, Set, Tuple
+
+import pygame
+
+
+class BuzzerProtocol(asyncio.DatagramProtocol):
+    """
+    UDP protocol for remote buzzers. Each datagram holds one or more lines:
+
+        D <key>      press the buzzer with this trigger key
+        U <key>      release it again
+        P <token>    ping, answered with the same line (for latency measurement)
+
+    Presses become KEYDOWN/KEYUP events stamped with the server-side receive time.
+    UDP may lose a release, so a held key is released by the server after
+    `release_timeout` seconds; a client holding a key longer repeats its
+    "D" line, which only refreshes the hold. Datagrams from hosts without
+    permission are dropped, pings included.
+    """
+    def __init__(self, server: "NetworkBuzzerServer"):
+        self._server = server
+        self._transport = None
+
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def datagram_received(self, data: bytes, addr):
+        timestamp = time.perf_counter_ns()  # So früh wie möglich stempeln
+        server = self._server
+        allowed = server.permitted_keys(addr[0])
+        if not allowed:
+            server.rejected += 1
+            return
+        for line in data.split(b"\n"):
+            if not line:
+                continue
+            command, _, argument = line.partition(b" ")
+            if command == b"P":
+                self._transport.sendto(line, addr)
+                continue
+            event_type = server.COMMANDS.get(command)
+            key = server.key_code(argument)
+            if event_type is None or key is None:
+                server.invalid += 1
+                continue
+            if key not in allowed:
+                server.rejected += 1
+                continue
+            server.received += 1
+            server.clients.add(addr)
+            if event_type == pygame.KEYDOWN:
+                if not server._hold(addr, key):
+                    continue  # Wiederholtes "D" hält die Taste nur weiter gedrückt
+            elif not server._release(addr, key):
+                continue  # Schon losgelassen, z. B. nach Zeitüberschreitung
+            server.sink(pygame.event.Event(event_type, key=key, timestamp=timestamp, remote=addr))
+
+
+class NetworkBuzzerServer:
+    """
+    Asyncio UDP server that lets phones and laptops on the LAN act as buzzers.
+    A remote press maps onto a Buzzer exactly like its trigger_key, so the
+    events go through the normal Container dispatch. Events are handed to
+    `sink`, e.g. InputPump.inject, which is safe to call from the server thread.
+
+    Args:
+        sink: Receives the KEYDOWN/KEYUP events.
+        host, port: Address to listen on.
+        permissions (dict): Client host (IP address) -> trigger keys it may press.
+            The host "*" matches every client. Without permissions every
+            datagram is rejected.
+        release_timeout (float): Seconds after which a press without a release
+            is released by the server.
+    """
+    COMMANDS = {b"D": pygame.KEYDOWN, b"U": pygame.KEYUP}
+    ANY_HOST = "*"
+
+    def __init__(self, sink: Callable[[pygame.event.Event], None],
+                 host: str = "0.0.0.0", port: int = 5005,
+                 permissions: Optional[Mapping[str, Iterable[str]]] = None,
+                 release_timeout: float = 1.0):
+        if release_timeout <= 0:
+            raise ValueError("release_timeout must be positive.")
+        self.sink = sink
+        self._host = host
+        self._port = port
+        self._permissions: Dict[str, Set[int]] = {}
+        for client, keys in (permissions or {}).items():
+            self.allow(client, keys)
+        self._release_timeout = release_timeout
+        self._held: Dict[Tuple[Tuple[str, int], int], asyncio.TimerHandle] = {}  # (Absender, Taste) -> Timeout
+        self._key_codes: Dict[bytes, Optional[int]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._transport = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self.received = 0
+        self.invalid = 0
+        self.rejected = 0
+        self.expired = 0
+        self.clients: Set[Tuple[str, int]] = set()
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Getter for the address the server is bound to (useful with port 0)."""
+        if self._transport is None:
+            return (self._host, self._port)
+        return self._transport.get_extra_info("sockname")[:2]
+
+    def allow(self, client: str, keys: Iterable[str]):
+        """Lets a client host (or "*" for every host) press the buzzers with these trigger keys."""
+        codes = set()
+        for name in keys:
+            code = getattr(pygame, "K_" + name, None)
+            if code is None:
+                raise ValueError(f"'{name}' is not a pygame key name.")
+            codes.add(code)
+        self._permissions[client] = codes
+
+    def revoke(self, client: str):
+        """Rejects all further datagrams of a client host."""
+        self._permissions.pop(client, None)
+
+    def permitted_keys(self, client: str) -> Set[int]:
+        """Returns the key codes a client host may press (empty if it is not permitted)."""
+        keys = self._permissions.get(client)
+        wildcard = self._permissions.get(self.ANY_HOST)
+        if keys is None:
+            return wildcard or set()
+        return keys | wildcard if wildcard else keys
+
+    def key_code(self, key: bytes) -> Optional[int]:
+        """Returns the pygame key code for a trigger key name (cached, None if unknown)."""
+        try:
+            return self._key_codes[key]
+        except KeyError:
+            pass
+        code = getattr(pygame, "K_" + key.decode("utf-8", "replace"), None)
+        if len(self._key_codes) < 1024:  # Schutz vor beliebig vielen ungültigen Namen
+            self._key_codes[key] = code
+        return code
+
+    def _hold(self, addr: Tuple[str, int], key: int) -> bool:
+        """
+        Starts or refreshes the release timeout of a remote key.
+        Returns True if the key was not held before.
+        """
+        handle = self._held.pop((addr, key), None)
+        if handle is not None:
+            handle.cancel()
+        self._held[(addr, key)] = asyncio.get_running_loop().call_later(
+            self._release_timeout, self._expire, addr, key)
+        return handle is None
+
+    def _release(self, addr: Tuple[str, int], key: int) -> bool:
+        """Ends the hold of a remote key. Returns False if it was not held."""
+        handle = self._held.pop((addr, key), None)
+        if handle is None:
+            return False
+        handle.cancel()
+        return True
+
+    def _expire(self, addr: Tuple[str, int], key: int):
+        """Releases a key whose release datagram got lost."""
+        del self._held[(addr, key)]
+        self.expired += 1
+        self.sink(pygame.event.Event(pygame.KEYUP, key=key, timestamp=time.perf_counter_ns(), remote=addr))
+
+    async def serve(self):
+        """Binds the UDP socket in the running event loop."""
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: BuzzerProtocol(self), local_addr=(self._host, self._port))
+        logging.info(f"Buzzer server listening on {self.address}")
+
+    def start(self):
+        """Starts the server with its own event loop on a background thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="buzzer-server", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=5.0)
+        if self._transport is None:
+            raise OSError(f"Buzzer server could not bind to {self._host}:{self._port}.")
+
+    def _run(self):
+        """Runs the event loop of the server thread."""
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self.serve())
+        except OSError as error:
+            logging.error(f"Buzzer server failed to start: {error}")
+            self._ready.set()
+            return
+        self._ready.set()
+        self._loop.run_forever()
+        self._transport.close()
+        self._loop.run_until_complete(asyncio.sleep(0))
+        self._loop.close()
+
+    def stop(self):
+        """Stops the server thread."""
+        if self._thread is None:
+            return
+        if self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5.0)
+        self._thread = None
+        self._transport = None
+        self._held.clear()
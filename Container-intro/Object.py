@@ -1,16 +1,23 @@
 import pygame
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Iterable, Tuple
 
 class Object:
+    __slots__ = ("_position", "_visible", "_parent", "_world")
+
+    # Objekte, die per Maus oder Touch getroffen werden können
+    hit_testable = False
+
     def __init__(self, position: pygame.Vector2, 
                  visible=True):
         self._position = position  # Private attribute for position
         self._visible = visible    # Private attribute for visibility
+        self._parent = None        # Container, in dem das Objekt liegt
+        self._world = None         # Zwischengespeicherte Position auf dem Bildschirm
 
     @property
     def position(self) -> pygame.Vector2:
-        """Getter for the position."""
+        """Getter for the position, relative to the containing container."""
         return self._position
 
     @position.setter
@@ -18,7 +25,30 @@ class Object:
         """Setter for the position."""
         if not isinstance(new_position, pygame.Vector2):
             raise TypeError("Position must be a pygame.Vector2 object.")
+        self._invalidate()  # Alte Fläche neu zeichnen
         self._position = new_position
+        self._transform_changed()
+        self._invalidate()
+        self._geometry_changed()
+
+    @property
+    def world_position(self) -> pygame.Vector2:
+        """
+        Getter for the position on screen: the own position plus the positions
+        of all containing containers. Cached until the object or a container above it moves.
+        """
+        world = self._world
+        if world is None:
+            if self._parent is None:
+                world = pygame.Vector2(self._position)
+            else:
+                world = self._parent.world_position + self._position
+            self._world = world
+        return world
+
+    def _transform_changed(self):
+        """Drops the cached world position after the object or a parent moved."""
+        self._world = None
 
     @property
     def visible(self) -> bool:
@@ -31,10 +61,59 @@ class Object:
         if not isinstance(is_visible, bool):
             raise TypeError("Visible must be a boolean value.")
         self._visible = is_visible
+        self._invalidate()
+
+    @property
+    def parent(self):
+        """Getter for the container holding this object (None if not added)."""
+        return self._parent
+
+    def bounding_rect(self) -> pygame.Rect:
+        """Returns the screen area covered by the object."""
+        x, y = self.world_position
+        return pygame.Rect(int(x), int(y), 0, 0)
+
+    def fit(self, rect: pygame.Rect):
+        """Places the object into a layout cell (container coordinates). Subclasses also resize."""
+        self.position = pygame.Vector2(rect.topleft)
+
+    def _invalidate(self):
+        """Reports the current screen area of the object as dirty to the root container."""
+        if self._parent is not None:
+            root = self._parent._root()
+            if root._changes is not None:
+                root._changes.add(self)
+            if root._batch is not None:
+                root._batch.touch(self)
+                return
+            root._mark_dirty(self.bounding_rect())
+
+    def _geometry_changed(self):
+        """Tells the containers that the bounding rect of the object changed."""
+        if self._parent is not None:
+            batch = self._parent._open_batch()
+            if batch is not None:
+                batch.geometry[self] = None  # Wird am Ende des Batches einmal nachgeholt
+                return
+            self._parent._child_geometry_changed(self)
+
+    def event_bindings(self) -> Iterable[Tuple[int, int]]:
+        """
+        Returns the (event type, key code) pairs this object wants to receive.
+        Containers only dispatch events matching one of these pairs.
+        """
+        return ()
+
+    def _rebind(self, old_bindings: Iterable[Tuple[int, int]]):
+        """Updates the dispatch index of the containers after the bindings changed."""
+        if self._parent is not None:
+            self._parent._unindex(self, old_bindings)
+            self._parent._index(self, self.event_bindings())
 
     def toggle_visibility(self):
         """Toggles the visibility of the object."""
         self._visible = not self._visible
+        self._invalidate()
     
     @abstractmethod
     def draw(self, screen: pygame.Surface):
@@ -3,6 +3,8 @@ from typing import Tuple
 from Object import Object
 
 class Rectangle(Object):
+    __slots__ = ("_size", "_color", "_border_color", "_border_width")
+
     def __init__(self, position: pygame.Vector2, 
                  visible=True, 
                  size: Tuple[int, int] = (20, 10), 
@@ -27,7 +29,10 @@ class Rectangle(Object):
             len(new_size) != 2 or 
             not all(isinstance(dim, int) and dim >= 0 for dim in new_size)):
             raise ValueError("Size must be a tuple of two non-negative integers (width, height).")
+        self._invalidate()
         self._size = new_size
+        self._invalidate()
+        self._geometry_changed()
 
     @property
     def color(self) -> pygame.Color:
@@ -40,6 +45,7 @@ class Rectangle(Object):
         if not isinstance(new_color, pygame.Color):
             raise TypeError("Color must be a pygame.Color object.")
         self._color = new_color
+        self._invalidate()
 
     @property
     def border_color(self) -> pygame.Color:
@@ -52,6 +58,7 @@ class Rectangle(Object):
         if not isinstance(new_color, pygame.Color):
             raise TypeError("Border color must be a pygame.Color object.")
         self._border_color = new_color
+        self._invalidate()
 
     @property
     def border_width(self) -> int:
@@ -64,6 +71,17 @@ class Rectangle(Object):
         if not isinstance(new_width, int) or new_width < 0:
             raise ValueError("Border width must be a non-negative integer.")
         self._border_width = new_width
+        self._invalidate()
+
+    def bounding_rect(self) -> pygame.Rect:
+        """Returns the screen area covered by the rectangle."""
+        x, y = self.world_position
+        return pygame.Rect(int(x), int(y), self._size[0], self._size[1])
+
+    def fit(self, rect: pygame.Rect):
+        """Fills a layout cell."""
+        self.size = rect.size
+        self.position = pygame.Vector2(rect.topleft)
 
     def change_size(self, width_delta: int, height_delta: int):
         """
@@ -77,6 +95,10 @@ class Rectangle(Object):
         new_height = max(0, self._size[1] + height_delta)
         self.size = (new_width, new_height)
 
+    def event_bindings(self):
+        """Returns the key presses handled by this object (keys 1, 2 and 3)."""
+        return [(pygame.KEYDOWN, pygame.K_1), (pygame.KEYDOWN, pygame.K_2), (pygame.KEYDOWN, pygame.K_3)]
+
     def handle_key_press(self, event):
         """
         Handles key press and release events to change the circle's color.
@@ -95,19 +117,20 @@ class Rectangle(Object):
     def draw(self, screen: pygame.Surface):
         """Draw the rectangle on the given screen."""
         if self.visible:
+            x, y = self.world_position
             # Draw the filled rectangle
             pygame.draw.rect(screen, 
                              self.color, 
-                             pygame.Rect(int(self.position.x), 
-                                         int(self.position.y), 
+                             pygame.Rect(int(x), 
+                                         int(y), 
                                          self._size[0], 
                                          self._size[1]))
             # Draw the border if width > 0
             if self.border_width > 0:
                 pygame.draw.rect(screen, 
                                  self.border_color, 
-                                 pygame.Rect(int(self.position.x), 
-                                             int(self.position.y), 
+                                 pygame.Rect(int(x), 
+                                             int(y), 
                                              self._size[0], 
                                              self._size[1]), 
                                  self.border_width)
@@ -0,0 +1,327 @@
+import inspect
+import json
+import logging
+import marshal
+import os
+from typing import List, Optional, Set, Tuple
+
+import pygame
+from Object import Object
+from Container import Container
+from Circle import Circle
+from Rectangle import Rectangle
+from Text import Text
+from Buzzer import Buzzer
+from AssetLoader import AssetLoader
+
+try:
+    import tomllib  # Ab Python 3.11
+except ImportError:
+    tomllib = None
+
+
+class SceneError(ValueError):
+    """Raised when a scene file does not describe a valid scene."""
+
+
+class Scene:
+    """
+    A show layout loaded from a scene file (JSON or TOML):
+
+        {
+          "window_size": [800, 800],
+          "background_color": "white",
+          "objects": [
+            {"type": "circle", "position": [150, 150], "radius": 50, "color": "red"},
+            {"type": "text", "position": [180, 160], "text": "Overlap", "fontsize": 36},
+            {"type": "container", "objects": [
+              {"type": "buzzer", "position": [10, 10], "trigger_key": "a", "sound": "buzzer.wav"}
+            ]}
+          ]
+        }
+
+    Colors are pygame color names, "#rrggbb" strings or [r, g, b(, a)] lists.
+    Sound paths are relative to the scene file.
+
+    The file is validated once and compiled into a binary cache next to it
+    (`<file>.cache`). Later loads read the cache and skip parsing and
+    validation as long as the file is unchanged. The object tree is only
+    built when `root` is first accessed.
+    """
+    CACHE_SUFFIX = ".cache"
+    CACHE_VERSION = 3
+
+    # Erlaubte Felder pro Objekttyp: Name -> Art des Werts
+    FIELDS = {
+        "container": {"position": "vector", "visible": "bool", "objects": "objects"},
+        "circle": {"position": "vector", "visible": "bool", "radius": "int", "color": "color",
+                   "border_color": "color", "border_width": "int"},
+        "rectangle": {"position": "vector", "visible": "bool", "size": "size", "color": "color",
+                      "border_color": "color", "border_width": "int"},
+        "text": {"position": "vector", "visible": "bool", "text": "str", "color": "color",
+                 "fontsize": "int"},
+        "buzzer": {"position": "vector", "visible": "bool", "size": "size", "in_color": "color",
+                   "in_color_inactive": "color", "in_color_active": "color", "out_color": "color",
+                   "trigger_key": "key", "sound": "path", "per_pixel_alpha": "bool"},
+    }
+    CLASSES = {"container": Container, "circle": Circle, "rectangle": Rectangle,
+               "text": Text, "buzzer": Buzzer}
+    # Vorgaben der Klassen für Felder, die eine Szene weglassen darf
+    DEFAULT_SOUND = inspect.signature(Buzzer).parameters["sound"].default
+    DEFAULT_FONTSIZE = inspect.signature(Text).parameters["fontsize"].default
+
+    def __init__(self, path: str, window_size: Tuple[int, int], background_color: Tuple[int, ...],
+                 objects: list):
+        self._path = path
+        self._window_size = window_size
+        self._background_color = background_color
+        self._objects = objects  # Kompilierte Beschreibung: (type, fields, children)
+        self._root: Optional[Container] = None
+
+    @classmethod
+    def load(cls, path: str, use_cache: bool = True) -> "Scene":
+        """
+        Loads a scene file, using the compiled cache when it is up to date.
+
+        Raises:
+            SceneError: If the file is not a valid scene.
+        """
+        stat = os.stat(path)
+        cache_path = path + cls.CACHE_SUFFIX
+        # Relative Pfade werden beim Kompilieren aufgelöst, der Cache gilt also nur für dieses Verzeichnis
+        base_dir = os.path.dirname(os.path.abspath(path))
+        if use_cache:
+            compiled = cls._read_cache(cache_path, stat, base_dir)
+            if compiled is not None:
+                return cls(path, *compiled)
+        compiled = cls.compile(cls._parse(path), base_dir)
+        if use_cache:
+            cls._write_cache(cache_path, stat, base_dir, compiled)
+        return cls(path, *compiled)
+
+    @staticmethod
+    def _parse(path: str) -> dict:
+        """Reads the raw scene description from a JSON or TOML file."""
+        try:
+            if path.endswith(".toml"):
+                if tomllib is None:
+                    raise SceneError("TOML scene files need Python 3.11 or newer.")
+                with open(path, "rb") as file:
+                    return tomllib.load(file)
+            with open(path, encoding="utf-8") as file:
+                return json.load(file)
+        except (ValueError, UnicodeDecodeError) as error:
+            if isinstance(error, SceneError):
+                raise
+            raise SceneError(f"{path}: {error}") from error
+
+    @classmethod
+    def compile(cls, description: dict, base_dir: str = "") -> Tuple[tuple, tuple, list]:
+        """
+        Validates a raw scene description and converts it into plain tuples.
+
+        Returns:
+            tuple: (window_size, background_color, objects)
+
+        Raises:
+            SceneError: With the location of the first invalid entry.
+        """
+        if not isinstance(description, dict):
+            raise SceneError("scene: must be an object.")
+        unknown = set(description) - {"window_size", "background_color", "objects"}
+        if unknown:
+            raise SceneError(f"scene: unknown fields {sorted(unknown)}.")
+        window_size = cls._convert("size", description.get("window_size", [800, 800]),
+                                   "window_size", base_dir)
+        if 0 in window_size:
+            raise SceneError("window_size: must be positive.")
+        background_color = cls._convert("color", description.get("background_color", [255, 255, 255, 100]),
+                                        "background_color", base_dir)
+        objects = cls._convert("objects", description.get("objects", []), "objects", base_dir)
+        return window_size, background_color, objects
+
+    @classmethod
+    def _compile_object(cls, entry, where: str, base_dir: str) -> tuple:
+        """Validates one object entry."""
+        if not isinstance(entry, dict):
+            raise SceneError(f"{where}: must be an object.")
+        kind = entry.get("type")
+        fields = cls.FIELDS.get(kind)
+        if fields is None:
+            raise SceneError(f"{where}.type: must be one of {sorted(cls.FIELDS)}, not {kind!r}.")
+        values = {}
+        children = []
+        for name, value in entry.items():
+            if name == "type":
+                continue
+            if name not in fields:
+                raise SceneError(f"{where}.{name}: unknown field for {kind}.")
+            converted = cls._convert(fields[name], value, f"{where}.{name}", base_dir)
+            if name == "objects":
+                children = converted
+            else:
+                values[name] = converted
+        if kind == "buzzer" and "sound" not in values:
+            # Der Standardklang liegt neben der Szene, nicht im Arbeitsverzeichnis
+            values["sound"] = cls._convert("path", cls.DEFAULT_SOUND, f"{where}.sound", base_dir)
+        return kind, values, children
+
+    @classmethod
+    def _convert(cls, value_type: str, value, where: str, base_dir: str):
+        """Validates a single value and converts it into its compiled form."""
+        if value_type == "objects":
+            if not isinstance(value, list):
+                raise SceneError(f"{where}: must be a list.")
+            return [cls._compile_object(entry, f"{where}[{i}]", base_dir) for i, entry in enumerate(value)]
+        if value_type == "vector":
+            if (not isinstance(value, list) or len(value) != 2 or
+                    not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value)):
+                raise SceneError(f"{where}: must be a list of two numbers.")
+            return (float(value[0]), float(value[1]))
+        if value_type == "size":
+            if (not isinstance(value, list) or len(value) != 2 or
+                    not all(isinstance(v, int) and not isinstance(v, bool) and v >= 0 for v in value)):
+                raise SceneError(f"{where}: must be a list of two non-negative integers.")
+            return (value[0], value[1])
+        if value_type == "int":
+            if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                raise SceneError(f"{where}: must be a non-negative integer.")
+            return value
+        if value_type == "bool":
+            if not isinstance(value, bool):
+                raise SceneError(f"{where}: must be true or false.")
+            return value
+        if value_type == "str":
+            if not isinstance(value, str):
+                raise SceneError(f"{where}: must be a string.")
+            return value
+        if value_type == "key":
+            if not isinstance(value, str) or not hasattr(pygame, "K_" + value):
+                raise SceneError(f"{where}: {value!r} is not a pygame key name.")
+            return value
+        if value_type == "path":
+            if not isinstance(value, str):
+                raise SceneError(f"{where}: must be a file path.")
+            return os.path.normpath(os.path.join(base_dir, value)) if value else value
+        if value_type == "color":
+            try:
+                if isinstance(value, str):
+                    color = pygame.Color(value)
+                elif isinstance(value, list) and len(value) in (3, 4):
+                    color = pygame.Color(*value)
+                else:
+                    raise ValueError
+            except (ValueError, TypeError):
+                raise SceneError(f"{where}: {value!r} is not a color.") from None
+            return (color.r, color.g, color.b, color.a)
+        raise SceneError(f"{where}: unknown value type {value_type}.")
+
+    @classmethod
+    def _read_cache(cls, cache_path: str, stat: os.stat_result, base_dir: str) -> Optional[tuple]:
+        """
+        Returns the compiled scene from the cache, or None if it is missing, stale
+        or was compiled in another directory (the show was copied or moved).
+        """
+        try:
+            with open(cache_path, "rb") as file:
+                # Einmal lesen: marshal.load auf Dateien liest in kleinen Stücken
+                version, mtime_ns, size, cached_dir, compiled = marshal.loads(file.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if (version != cls.CACHE_VERSION or mtime_ns != stat.st_mtime_ns or size != stat.st_size or
+                cached_dir != base_dir):
+            return None
+        return compiled
+
+    @classmethod
+    def _write_cache(cls, cache_path: str, stat: os.stat_result, base_dir: str, compiled: tuple):
+        """Stores the compiled scene next to the scene file (best effort)."""
+        temporary = cache_path + ".tmp"
+        try:
+            with open(temporary, "wb") as file:
+                file.write(marshal.dumps((cls.CACHE_VERSION, stat.st_mtime_ns, stat.st_size, base_dir,
+                                          compiled)))
+            os.replace(temporary, cache_path)  # Andere Prozesse sehen nie eine halbe Datei
+        except OSError as error:
+            logging.warning(f"Could not write scene cache {cache_path}: {error}")
+
+    @property
+    def path(self) -> str:
+        """Getter for the path of the scene file."""
+        return self._path
+
+    @property
+    def window_size(self) -> Tuple[int, int]:
+        """Getter for the window size of the scene."""
+        return self._window_size
+
+    @property
+    def root(self) -> Container:
+        """Getter for the root container. The object tree is built on first access."""
+        if self._root is None:
+            self._root = self.build()
+        return self._root
+
+    def build(self) -> Container:
+        """Builds a new object tree from the compiled scene."""
+        root = Container(window_size=self._window_size,
+                         background_color=pygame.Color(*self._background_color))
+        self._build_children(root, self._objects)
+        return root
+
+    def _build_children(self, container: Container, objects: list):
+        """Creates the objects of one container level."""
+        for kind, values, children in objects:
+            arguments = dict(values)
+            if "position" in arguments:
+                arguments["position"] = pygame.Vector2(arguments["position"])
+            else:
+                arguments["position"] = pygame.Vector2(0, 0)
+            for name, value_type in self.FIELDS[kind].items():
+                if value_type == "color" and name in arguments:
+                    arguments[name] = pygame.Color(*arguments[name])
+            obj: Object = self.CLASSES[kind](**arguments)
+            if kind == "container":
+                self._build_children(obj, children)
+            container.add_object(obj)
+
+    def count_objects(self) -> int:
+        """Returns the number of objects described by the scene, without building it."""
+        def count(objects: List[tuple]) -> int:
+            return sum(1 + count(children) for _, _, children in objects)
+        return count(self._objects)
+
+    def assets(self) -> Tuple[Set[str], Set[int]]:
+        """
+        Returns every asset the scene refers to, without building it.
+
+        Returns:
+            tuple: (sound paths, font sizes)
+        """
+        sounds: Set[str] = set()
+        fonts: Set[int] = set()
+
+        def scan(objects: List[tuple]):
+            for kind, values, children in objects:
+                if kind == "buzzer":
+                    sounds.add(values["sound"])
+                elif kind == "text":
+                    fonts.add(values.get("fontsize", self.DEFAULT_FONTSIZE))
+                scan(children)
+        scan(self._objects)
+        sounds.discard("")
+        return sounds, fonts
+
+    def __repr__(self) -> str:
+        return f"Scene({self._path!r}, {self.count_objects()} objects)"
+
+
+def load_scene(path: str, preload: bool = True) -> Container:
+    """
+    Loads a scene file and returns its root container.
+    With `preload`, all sounds and fonts are loaded in parallel before the tree is built.
+    """
+    scene = Scene.load(path)
+    if preload:
+        AssetLoader().preload_scene(scene)
+    return scene.root
@@ -0,0 +1,228 @@
+import heapq
+import itertools
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional, Tuple
+
+import pygame
+
+
+def linear(t: float) -> float:
+    """Easing: constant speed."""
+    return t
+
+
+def ease_in_out(t: float) -> float:
+    """Easing: slow start and end (smoothstep)."""
+    return t * t * (3 - 2 * t)
+
+
+def interpolate(start, end, t: float):
+    """Returns the value between start and end for t in [0, 1] (numbers, Vector2, Color)."""
+    if isinstance(start, pygame.Color):
+        return pygame.Color(start).lerp(end, t)
+    if isinstance(start, pygame.Vector2):
+        return start.lerp(end, t)
+    if isinstance(start, int) and isinstance(end, int):
+        return round(start + (end - start) * t)
+    return start + (end - start) * t
+
+
+class Task(ABC):
+    """Base class of everything the Scheduler runs. Can be cancelled at any time."""
+    __slots__ = ("cancelled",)
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        """Stops the task; it is dropped the next time it is due."""
+        self.cancelled = True
+
+    @abstractmethod
+    def run(self, now: float) -> Optional[float]:
+        """Runs the task and returns the time it is due again, or None if it is finished."""
+
+
+class Timer(Task):
+    """Calls a function after a delay, optionally repeated. A count of 0 or less never calls it."""
+    __slots__ = ("_callback", "_interval", "_remaining")
+
+    def __init__(self, callback: Callable[[], None], interval: float, count: Optional[int] = 1):
+        super().__init__()
+        self._callback = callback
+        self._interval = interval
+        self._remaining = count  # None = für immer
+
+    def run(self, now: float) -> Optional[float]:
+        if self._remaining is not None and self._remaining <= 0:
+            return None
+        self._callback()
+        if self._remaining is not None:
+            self._remaining -= 1
+            if self._remaining <= 0:
+                return None
+        return now + self._interval
+
+
+class Tween(Task):
+    """
+    Animates one property of an object from a start to an end value over time.
+    The property is assigned through its setter, so the object marks itself dirty.
+    """
+    __slots__ = ("target", "attribute", "_start", "_end", "_duration", "_easing",
+                 "_began", "_repeat", "_yoyo", "_on_done", "_frame")
+
+    def __init__(self, target, attribute: str, end, duration: float, start=None,
+                 easing: Callable[[float], float] = linear, repeat: Optional[int] = 1,
+                 yoyo: bool = False, on_done: Optional[Callable[[], None]] = None,
+                 frame: float = 1 / 60):
+        super().__init__()
+        if duration <= 0:
+            raise ValueError("duration must be positive.")
+        self.target = target
+        self.attribute = attribute
+        self._start = start
+        self._end = end
+        self._duration = duration
+        self._easing = easing
+        self._began = None
+        self._repeat = repeat  # Anzahl Durchläufe, None = für immer
+        self._yoyo = yoyo      # Jeder zweite Durchlauf rückwärts
+        self._on_done = on_done
+        self._frame = frame
+
+    def run(self, now: float) -> Optional[float]:
+        if self._began is None:
+            self._began = now
+            if self._start is None:
+                self._start = getattr(self.target, self.attribute)
+        cycle, progress = divmod((now - self._began) / self._duration, 1.0)
+        finished = self._repeat is not None and cycle >= self._repeat
+        if finished:
+            cycle, progress = self._repeat - 1, 1.0
+        if self._yoyo and int(cycle) % 2 == 1:
+            progress = 1.0 - progress
+        setattr(self.target, self.attribute, interpolate(self._start, self._end, self._easing(progress)))
+        if finished:
+            if self._on_done is not None:
+                self._on_done()
+            return None
+        return now + self._frame
+
+
+class Scheduler:
+    """
+    Time-based animation and timer scheduler, attached to the root Container.
+    Active tweens and timers live in a priority queue ordered by due time, so a
+    frame only touches the objects that are animating right now; idle objects
+    cost nothing. The main loop calls `update` once per frame and sleeps at
+    most until `next_wakeup`.
+    """
+    def __init__(self, frame_interval: float = 1 / 60, clock: Callable[[], float] = time.perf_counter):
+        self._frame_interval = frame_interval
+        self._clock = clock
+        self._queue: List[Tuple[float, int, Task]] = []  # (fällig, Reihenfolge, Aufgabe)
+        self._order = itertools.count()
+
+    def __len__(self) -> int:
+        """Returns the number of scheduled tasks (cancelled ones until they are due)."""
+        return len(self._queue)
+
+    def schedule(self, task: Task, due: Optional[float] = None) -> Task:
+        """Adds a task that runs at `due` (default: now)."""
+        if not isinstance(task, Task):
+            raise TypeError("Only Task instances can be scheduled.")
+        heapq.heappush(self._queue, (self._clock() if due is None else due, next(self._order), task))
+        return task
+
+    def after(self, delay: float, callback: Callable[[], None]) -> Timer:
+        """Calls `callback` once after `delay` seconds."""
+        return self.schedule(Timer(callback, delay), self._clock() + delay)
+
+    def every(self, interval: float, callback: Callable[[], None], count: Optional[int] = None) -> Timer:
+        """Calls `callback` every `interval` seconds, `count` times (None = until cancelled)."""
+        return self.schedule(Timer(callback, interval, count), self._clock() + interval)
+
+    def tween(self, target, attribute: str, end, duration: float, **options) -> Tween:
+        """Animates `target.attribute` to `end` in `duration` seconds. See Tween for the options."""
+        options.setdefault("frame", self._frame_interval)
+        return self.schedule(Tween(target, attribute, end, duration, **options))
+
+    def cancel(self, target, attribute: Optional[str] = None):
+        """Cancels all tweens of an object (or only those of one property)."""
+        for _, _, task in self._queue:
+            if isinstance(task, Tween) and task.target is target and attribute in (None, task.attribute):
+                task.cancel()
+
+    def update(self, now: Optional[float] = None) -> int:
+        """
+        Runs every task that is due.
+
+        Returns:
+            int: The number of tasks that ran.
+        """
+        now = self._clock() if now is None else now
+        queue = self._queue
+        ran = 0
+        while queue and queue[0][0] <= now:
+            _, order, task = heapq.heappop(queue)
+            if task.cancelled:
+                continue
+            try:
+                due = task.run(now)
+            except Exception:
+                logging.exception("Scheduled task failed and was removed.")
+                continue
+            ran += 1
+            if due is not None:
+                heapq.heappush(queue, (due, order, task))  # Reihenfolge bleibt stabil
+        return ran
+
+    def next_wakeup(self, now: Optional[float] = None) -> Optional[float]:
+        """Returns the seconds until the next task is due (0 if overdue), or None if nothing is scheduled."""
+        queue = self._queue
+        while queue and queue[0][2].cancelled:
+            heapq.heappop(queue)
+        if not queue:
+            return None
+        now = self._clock() if now is None else now
+        return max(0.0, queue[0][0] - now)
+
+    # Fertige Effekte für Buzzer und Texte
+
+    def pulse(self, target, attribute: str, color: pygame.Color, period: float = 0.8,
+              cycles: Optional[int] = None) -> Tween:
+        """Lets a color property swell to `color` and back, `cycles` times (None = until cancelled)."""
+        return self.tween(target, attribute, color, period / 2, easing=ease_in_out, yoyo=True,
+                          repeat=None if cycles is None else 2 * cycles)
+
+    def flash(self, target, attribute: str, color: pygame.Color, times: int = 3,
+              interval: float = 0.15) -> Timer:
+        """Toggles a property between its current value and `color`, e.g. for the winner's buzzer."""
+        original = getattr(target, attribute)
+        state = {"on": False}
+
+        def toggle():
+            state["on"] = not state["on"]
+            setattr(target, attribute, color if state["on"] else original)
+        return self.every(interval, toggle, count=2 * times)
+
+    def countdown(self, text, seconds: int, on_done: Optional[Callable[[], None]] = None) -> Timer:
+        """Counts a Text down from `seconds` to 0, one step per second, then calls `on_done`."""
+        if seconds <= 0:
+            # Nichts zu zählen: sofort fertig, der zurückgegebene Timer läuft nie
+            text.text = "0"
+            if on_done is not None:
+                on_done()
+            return Timer(lambda: None, 1.0, count=0)
+        text.text = str(seconds)
+        remaining = {"value": seconds}
+
+        def tick():
+            remaining["value"] -= 1
+            text.text = str(remaining["value"])
+            if remaining["value"] == 0 and on_done is not None:
+                on_done()
+        return self.every(1.0, tick, count=seconds)
@@ -0,0 +1,204 @@
+import pygame
+from typing import Dict, List, Tuple
+from Object import Object
+
+try:
+    import numpy as np
+except ImportError:  # NumPy ist optional und wird nur für ShapeBatch benötigt
+    np = None
+
+
+class ShapeBatch(Object):
+    """
+    Particle-style batch of circles or rectangles for effects like confetti.
+    Positions, velocities, sizes and colors live in NumPy arrays, are updated
+    with vectorized operations and drawn with one Surface.blits call using
+    cached stamps (one pre-rendered surface per size and color).
+    Shape positions are relative to the position of the batch.
+    """
+    __slots__ = ("_kind", "_positions", "_velocities", "_sizes", "_colors",
+                 "_stamp_ids", "_stamps", "_stamp_keys")
+
+    CIRCLE = "circle"
+    RECTANGLE = "rectangle"
+
+    def __init__(self, position: pygame.Vector2 = pygame.Vector2(0, 0),
+                 visible=True,
+                 kind: str = CIRCLE):
+        if np is None:
+            raise ImportError("ShapeBatch requires numpy (pip install numpy).")
+        super().__init__(position, visible)
+        if kind not in (self.CIRCLE, self.RECTANGLE):
+            raise ValueError("Kind must be 'circle' or 'rectangle'.")
+        self._kind = kind
+        self._positions = np.zeros((0, 2), dtype=np.float32)
+        self._velocities = np.zeros((0, 2), dtype=np.float32)
+        self._sizes = np.zeros((0, 2), dtype=np.int32)    # Radius bei Kreisen in Spalte 0
+        self._colors = np.zeros((0, 4), dtype=np.uint8)
+        self._stamp_ids = np.zeros(0, dtype=np.int32)
+        self._stamps: List[pygame.Surface] = []
+        self._stamp_keys: Dict[Tuple[int, int, int, int, int, int], int] = {}
+
+    @property
+    def kind(self) -> str:
+        """Getter for the kind of shapes in the batch."""
+        return self._kind
+
+    @property
+    def positions(self):
+        """Getter for the (N, 2) array of positions. May be modified in place."""
+        return self._positions
+
+    @property
+    def velocities(self):
+        """Getter for the (N, 2) array of velocities in pixels per second."""
+        return self._velocities
+
+    def __len__(self) -> int:
+        """Returns the number of shapes in the batch."""
+        return len(self._positions)
+
+    def add(self, positions, sizes, colors, velocities=None):
+        """
+        Adds many shapes at once.
+
+        Args:
+            positions: (N, 2) array of centers (circles) or top-left corners (rectangles).
+            sizes: (N,) radii for circles or (N, 2) sizes for rectangles.
+            colors: (N, 3) or (N, 4) array of RGB(A) values.
+            velocities: optional (N, 2) array of velocities in pixels per second.
+        """
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 2)
+        count = len(positions)
+        sizes = np.asarray(sizes, dtype=np.int32)
+        if sizes.ndim == 1:
+            sizes = np.repeat(sizes[:, None], 2, axis=1)
+        colors = np.asarray(colors, dtype=np.uint8)
+        if colors.ndim != 2 or colors.shape[1] not in (3, 4):
+            raise ValueError("Colors must be an (N, 3) or (N, 4) array.")
+        if colors.shape[1] == 3:
+            colors = np.hstack([colors, np.full((count, 1), 255, dtype=np.uint8)])
+        if velocities is None:
+            velocities = np.zeros((count, 2), dtype=np.float32)
+        velocities = np.asarray(velocities, dtype=np.float32).reshape(-1, 2)
+        if not len(sizes) == len(colors) == len(velocities) == count:
+            raise ValueError("All arrays must have the same length.")
+        if (sizes < 0).any():
+            raise ValueError("Sizes must be non-negative.")
+
+        self._invalidate()
+        self._positions = np.concatenate([self._positions, positions])
+        self._velocities = np.concatenate([self._velocities, velocities])
+        self._sizes = np.concatenate([self._sizes, sizes])
+        self._colors = np.concatenate([self._colors, colors])
+        self._stamp_ids = np.concatenate([self._stamp_ids, self._assign_stamps(sizes, colors)])
+        self._invalidate()
+        self._geometry_changed()
+
+    def _assign_stamps(self, sizes, colors):
+        """Returns the stamp index for each shape, rendering only new size/color combinations."""
+        keys = np.hstack([sizes, colors.astype(np.int32)])
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+        ids = np.empty(len(unique), dtype=np.int32)
+        for i, key in enumerate(map(tuple, unique.tolist())):
+            stamp_id = self._stamp_keys.get(key)
+            if stamp_id is None:
+                stamp_id = len(self._stamps)
+                self._stamps.append(self._render_stamp(key))
+                self._stamp_keys[key] = stamp_id
+            ids[i] = stamp_id
+        return ids[inverse.reshape(-1)]
+
+    def _render_stamp(self, key) -> pygame.Surface:
+        """Renders one shape into a small surface."""
+        width, height, red, green, blue, alpha = key
+        color = pygame.Color(red, green, blue, alpha)
+        if self._kind == self.CIRCLE and alpha < 255:
+            stamp = pygame.Surface((2 * width + 1, 2 * width + 1), pygame.SRCALPHA)
+            pygame.draw.circle(stamp, color, (width, width), width)
+        elif self._kind == self.CIRCLE:
+            # Deckende Kreise mit Colorkey statt Alphakanal, das blittet deutlich schneller
+            key_color = (0, 0, 0) if (red, green, blue) != (0, 0, 0) else (255, 255, 255)
+            stamp = pygame.Surface((2 * width + 1, 2 * width + 1))
+            stamp.fill(key_color)
+            pygame.draw.circle(stamp, color, (width, width), width)
+            stamp.set_colorkey(key_color, pygame.RLEACCEL)
+        else:
+            stamp = pygame.Surface((width, height), pygame.SRCALPHA if alpha < 255 else 0)
+            stamp.fill(color)
+        if pygame.display.get_surface() is not None:
+            stamp = stamp.convert_alpha() if stamp.get_flags() & pygame.SRCALPHA else stamp.convert()
+        return stamp
+
+    def update(self, dt: float, gravity: Tuple[float, float] = (0.0, 0.0)):
+        """
+        Moves all shapes by their velocity (vectorized).
+
+        Args:
+            dt (float): Elapsed time in seconds.
+            gravity: Acceleration in pixels per second squared.
+        """
+        if not len(self._positions):
+            return
+        self._invalidate()
+        self._velocities += np.asarray(gravity, dtype=np.float32) * dt
+        self._positions += self._velocities * dt
+        self._invalidate()
+        self._geometry_changed()
+
+    def keep(self, mask):
+        """Keeps only the shapes where the boolean mask is True, e.g. to drop finished particles."""
+        mask = np.asarray(mask, dtype=bool)
+        self._invalidate()
+        self._positions = self._positions[mask]
+        self._velocities = self._velocities[mask]
+        self._sizes = self._sizes[mask]
+        self._colors = self._colors[mask]
+        self._stamp_ids = self._stamp_ids[mask]
+        self._prune_stamps()
+        self._geometry_changed()
+
+    def _prune_stamps(self):
+        """Drops the stamps no remaining shape uses, so random colors do not pile up stamps."""
+        used = np.bincount(self._stamp_ids, minlength=len(self._stamps)) > 0
+        if used.all():
+            return
+        remap = np.cumsum(used, dtype=np.int32) - 1  # Alter Index -> neuer Index
+        self._stamps = [stamp for stamp, keep in zip(self._stamps, used.tolist()) if keep]
+        self._stamp_keys = {key: int(remap[stamp_id]) for key, stamp_id in self._stamp_keys.items()
+                            if used[stamp_id]}
+        self._stamp_ids = remap[self._stamp_ids]
+
+    def clear(self):
+        """Removes all shapes from the batch."""
+        self.keep(np.zeros(len(self._positions), dtype=bool))
+
+    def _top_left(self):
+        """Returns the integer top-left corner of every shape on screen."""
+        positions = self._positions + np.asarray(self.world_position, dtype=np.float32)
+        if self._kind == self.CIRCLE:
+            positions -= self._sizes[:, :1]
+        return positions.astype(np.int32)
+
+    def bounding_rect(self) -> pygame.Rect:
+        """Returns the screen area covered by all shapes."""
+        if not len(self._positions):
+            x, y = self.world_position
+            return pygame.Rect(int(x), int(y), 0, 0)
+        top_left = self._top_left()
+        if self._kind == self.CIRCLE:
+            extent = 2 * self._sizes + 1
+        else:
+            extent = self._sizes
+        left, top = top_left.min(axis=0).tolist()
+        right, bottom = (top_left + extent).max(axis=0).tolist()
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def draw(self, screen: pygame.Surface):
+        """Draws the whole batch with a single blits call."""
+        if not self.visible or not len(self._positions):
+            return
+        stamps = self._stamps
+        screen.blits(zip(map(stamps.__getitem__, self._stamp_ids.tolist()),
+                         self._top_left().tolist()),
+                     doreturn=False)
@@ -0,0 +1,254 @@
+import pygame
+from array import array
+from typing import Optional, Tuple
+from Object import Object
+
+
+class ShapeGroup(Object):
+    """
+    Packed storage for many shapes of the same kind (circles or rectangles),
+    e.g. confetti or an audience wall. Every attribute is kept in a flat
+    array column instead of one Python object per shape.
+    Single shapes are accessed through lightweight ShapeView objects.
+    Shape positions are relative to the position of the group.
+    """
+    __slots__ = ("_kind", "_x", "_y", "_width", "_height", "_colors", "_shown",
+                 "_border_color", "_border_width", "_bounds")
+
+    CIRCLE = "circle"
+    RECTANGLE = "rectangle"
+
+    def __init__(self, position: pygame.Vector2 = pygame.Vector2(0, 0),
+                 visible=True,
+                 kind: str = CIRCLE,
+                 border_color: pygame.Color = pygame.Color("black"),
+                 border_width: int = 1):
+        super().__init__(position, visible)
+        if kind not in (self.CIRCLE, self.RECTANGLE):
+            raise ValueError("Kind must be 'circle' or 'rectangle'.")
+        self._kind = kind
+        self._x = array("d")
+        self._y = array("d")
+        self._width = array("i")   # Radius bei Kreisen
+        self._height = array("i")
+        self._colors = array("I")  # Farbe als 0xRRGGBBAA
+        self._shown = array("b")
+        self._border_color = border_color
+        self._border_width = border_width
+        self._bounds: Optional[pygame.Rect] = None  # Zwischengespeicherte Vereinigung aller Formen
+
+    @property
+    def kind(self) -> str:
+        """Getter for the kind of shapes in the group."""
+        return self._kind
+
+    def add_circle(self, position: pygame.Vector2, radius: int = 10,
+                   color: pygame.Color = pygame.Color("white")) -> "ShapeView":
+        """Adds a circle to the group and returns a view on it."""
+        if self._kind != self.CIRCLE:
+            raise TypeError("Circles can only be added to a circle group.")
+        return self._append(position, (radius, radius), color)
+
+    def add_rectangle(self, position: pygame.Vector2, size: Tuple[int, int] = (20, 10),
+                      color: pygame.Color = pygame.Color("white")) -> "ShapeView":
+        """Adds a rectangle to the group and returns a view on it."""
+        if self._kind != self.RECTANGLE:
+            raise TypeError("Rectangles can only be added to a rectangle group.")
+        return self._append(position, size, color)
+
+    def _append(self, position, size, color) -> "ShapeView":
+        """Appends one shape to all columns."""
+        view = ShapeView(self, len(self._x))
+        # Werte über die View setzen, damit dieselbe Validierung greift
+        self._x.append(0.0)
+        self._y.append(0.0)
+        self._width.append(0)
+        self._height.append(0)
+        self._colors.append(0)
+        self._shown.append(1)
+        try:
+            view.position = position
+            if self._kind == self.CIRCLE:
+                view.radius = size[0]
+            else:
+                view.size = size
+            view.color = color
+        except (TypeError, ValueError):
+            for column in (self._x, self._y, self._width, self._height, self._colors, self._shown):
+                column.pop()
+            self._bounds = None
+            raise
+        return view
+
+    def clear(self):
+        """Removes all shapes from the group."""
+        self._invalidate()
+        for column in (self._x, self._y, self._width, self._height, self._colors, self._shown):
+            del column[:]
+        self._bounds = None
+        self._geometry_changed()
+
+    def __len__(self) -> int:
+        """Returns the number of shapes in the group."""
+        return len(self._x)
+
+    def __getitem__(self, index: int) -> "ShapeView":
+        """Returns a view on the shape with the given index."""
+        if not -len(self._x) <= index < len(self._x):
+            raise IndexError("Shape index out of range.")
+        return ShapeView(self, index % len(self._x))
+
+    def shape_rect(self, index: int) -> pygame.Rect:
+        """Returns the screen area covered by a single shape."""
+        left, top = self.world_position
+        x, y = int(left + self._x[index]), int(top + self._y[index])
+        if self._kind == self.CIRCLE:
+            radius = self._width[index]
+            return pygame.Rect(x - radius, y - radius, 2 * radius + 1, 2 * radius + 1)
+        return pygame.Rect(x, y, self._width[index], self._height[index])
+
+    def _invalidate_shape(self, index: int):
+        """Reports the area of a single shape as dirty and drops the cached bounds."""
+        if self._parent is not None:
+            root = self._parent._root()
+            if root._changes is not None:
+                root._changes.add(self)
+            if root._batch is not None:
+                root._batch.touch(self)  # Fläche vor der ersten Änderung, markiert am Ende des Batches
+            else:
+                root._mark_dirty(self.shape_rect(index))
+        self._bounds = None
+
+    def _transform_changed(self):
+        """Drops the cached world position and bounds after the group or a parent moved."""
+        self._world = None
+        self._bounds = None
+
+    def bounding_rect(self) -> pygame.Rect:
+        """Returns the union of the screen areas of all shapes, computed once per change."""
+        if self._bounds is None:
+            if not self._x:
+                x, y = self.world_position
+                self._bounds = pygame.Rect(int(x), int(y), 0, 0)
+            else:
+                self._bounds = self.shape_rect(0).unionall([self.shape_rect(i) for i in range(1, len(self._x))])
+        return self._bounds
+
+    def draw(self, screen: pygame.Surface):
+        """Draws all shown shapes of the group."""
+        if not self.visible:
+            return
+        border_width = self._border_width
+        border_color = self._border_color
+        circle = self._kind == self.CIRCLE
+        left, top = self.world_position
+        for i in range(len(self._x)):
+            if not self._shown[i]:
+                continue
+            color = pygame.Color(self._colors[i])
+            if circle:
+                center = (int(left + self._x[i]), int(top + self._y[i]))
+                pygame.draw.circle(screen, color, center, self._width[i])
+                if border_width > 0:
+                    pygame.draw.circle(screen, border_color, center, self._width[i], border_width)
+            else:
+                rect = pygame.Rect(int(left + self._x[i]), int(top + self._y[i]), self._width[i], self._height[i])
+                pygame.draw.rect(screen, color, rect)
+                if border_width > 0:
+                    pygame.draw.rect(screen, border_color, rect, border_width)
+
+
+class ShapeView:
+    """
+    View on one shape of a ShapeGroup with the same properties and
+    validation as Circle and Rectangle. Holds no data of its own.
+    """
+    __slots__ = ("_group", "_index")
+
+    def __init__(self, group: ShapeGroup, index: int):
+        self._group = group
+        self._index = index
+
+    @property
+    def position(self) -> pygame.Vector2:
+        """Getter for the position (a copy, changes must be assigned back)."""
+        return pygame.Vector2(self._group._x[self._index], self._group._y[self._index])
+
+    @position.setter
+    def position(self, new_position: pygame.Vector2):
+        """Setter for the position."""
+        if not isinstance(new_position, pygame.Vector2):
+            raise TypeError("Position must be a pygame.Vector2 object.")
+        self._group._invalidate_shape(self._index)
+        self._group._x[self._index] = new_position.x
+        self._group._y[self._index] = new_position.y
+        self._group._invalidate_shape(self._index)
+        self._group._geometry_changed()
+
+    @property
+    def visible(self) -> bool:
+        """Getter for the visibility."""
+        return bool(self._group._shown[self._index])
+
+    @visible.setter
+    def visible(self, is_visible: bool):
+        """Setter for the visibility."""
+        if not isinstance(is_visible, bool):
+            raise TypeError("Visible must be a boolean value.")
+        self._group._shown[self._index] = is_visible
+        self._group._invalidate_shape(self._index)
+
+    @property
+    def color(self) -> pygame.Color:
+        """Getter for the fill color."""
+        return pygame.Color(self._group._colors[self._index])
+
+    @color.setter
+    def color(self, new_color: pygame.Color):
+        """Setter for the fill color."""
+        if not isinstance(new_color, pygame.Color):
+            raise TypeError("Color must be a pygame.Color object.")
+        self._group._colors[self._index] = int(new_color)
+        self._group._invalidate_shape(self._index)
+
+    @property
+    def radius(self) -> int:
+        """Getter for the radius of a circle."""
+        if self._group._kind != ShapeGroup.CIRCLE:
+            raise AttributeError("Only circles have a radius.")
+        return self._group._width[self._index]
+
+    @radius.setter
+    def radius(self, new_radius: int):
+        """Setter for the radius of a circle."""
+        if self._group._kind != ShapeGroup.CIRCLE:
+            raise AttributeError("Only circles have a radius.")
+        if not isinstance(new_radius, int) or new_radius < 0:
+            raise ValueError("Radius must be a non-negative integer.")
+        self._group._invalidate_shape(self._index)
+        self._group._width[self._index] = new_radius
+        self._group._height[self._index] = new_radius
+        self._group._invalidate_shape(self._index)
+        self._group._geometry_changed()
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Getter for the size (width, height) of a rectangle."""
+        if self._group._kind != ShapeGroup.RECTANGLE:
+            raise AttributeError("Only rectangles have a size.")
+        return (self._group._width[self._index], self._group._height[self._index])
+
+    @size.setter
+    def size(self, new_size: Tuple[int, int]):
+        """Setter for the size of a rectangle."""
+        if self._group._kind != ShapeGroup.RECTANGLE:
+            raise AttributeError("Only rectangles have a size.")
+        if (not isinstance(new_size, tuple) or
+            len(new_size) != 2 or
+            not all(isinstance(dim, int) and dim >= 0 for dim in new_size)):
+            raise ValueError("Size must be a tuple of two non-negative integers (width, height).")
+        self._group._invalidate_shape(self._index)
+        self._group._width[self._index] = new_size[0]
+        self._group._height[self._index] = new_size[1]
+        self._group._invalidate_shape(self._index)
+        self._group._geometry_changed()
@@ -0,0 +1,360 @@
+"""
+Shares the render state of a Container tree with other processes, e.g. a
+host screen and a separate audience screen driven by one game state.
+
+    python SharedScene.py buzzer-show --size 1920x1080   # renderer for the show "buzzer-show"
+"""
+import argparse
+import struct
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pygame
+from Object import Object
+from Container import Container
+from Circle import Circle
+from Rectangle import Rectangle
+from Text import Text
+from Buzzer import Buzzer
+from FontCache import font_cache
+
+# Art eines Eintrags im Schnappschuss
+CIRCLE, RECTANGLE, TEXT, BUZZER = 1, 2, 3, 4
+
+SEQUENCE = struct.Struct("<Q")
+# Kopf: Bildnummer, Fenstergröße, Anzahl Objekte, Platz für Objekte, Hintergrundfarbe, Länge der Texte
+HEADER = struct.Struct("<IIIII4sI")
+# Ein Objekt: Art, Position, Breite/Radius, Höhe, Farbe, Rand-/Außenfarbe,
+# Randbreite/Schriftgröße, Textanfang, Textlänge
+RECORD = struct.Struct("<BffHH4s4sHIH")
+
+
+def _rgba(color: pygame.Color) -> bytes:
+    """Returns a color as four bytes."""
+    return bytes((color.r, color.g, color.b, color.a))
+
+
+class SceneSnapshot:
+    """One published frame of the render state."""
+    __slots__ = ("frame", "window_size", "background_color", "objects")
+
+    def __init__(self, frame: int, window_size: Tuple[int, int], background_color: pygame.Color,
+                 objects: List[tuple]):
+        self.frame = frame
+        self.window_size = window_size
+        self.background_color = background_color
+        self.objects = objects  # (kind, x, y, width, height, color, color2, number, text)
+
+
+class SceneBroadcaster:
+    """
+    Publishes the render state of a Container tree into a named shared memory
+    block, once per frame, from the process that owns input (single writer).
+    Readers never block the writer: a sequence counter that is odd while a
+    frame is written (a seqlock) lets them detect and retry torn reads.
+
+    Every object has a fixed-size record at a fixed slot, so a frame only
+    re-packs the records of the objects that changed since the last one
+    (changed texts are appended to the text area). The whole scene is only
+    written again after objects were added, removed, shown or hidden, or a
+    container moved, or when the text area is full.
+
+    Circles, rectangles, texts and buzzers are shared. ShapeGroup, ShapeBatch
+    and other objects are not part of the shared scene.
+    """
+    SHARED_TYPES = (Buzzer, Circle, Rectangle, Text)
+
+    def __init__(self, container: Container, name: Optional[str] = None,
+                 max_objects: int = 4096, text_bytes: int = 65536):
+        if not isinstance(container, Container):
+            raise TypeError("container must be a Container.")
+        self._container = container
+        self._max_objects = max_objects
+        self._text_bytes = text_bytes
+        self._records_offset = SEQUENCE.size + HEADER.size
+        self._texts_offset = self._records_offset + max_objects * RECORD.size
+        self._shm = shared_memory.SharedMemory(name=name, create=True,
+                                               size=self._texts_offset + text_bytes)
+        self._sequence = 0
+        self.frame = 0
+        self._slots: Dict[Object, int] = {}  # Geteiltes Objekt -> Platz seines Eintrags
+        self._text_length = 0
+        self._full = True  # Das erste Bild wird komplett geschrieben
+        container.track_changes()
+        SEQUENCE.pack_into(self._shm.buf, 0, 0)
+
+    @property
+    def name(self) -> str:
+        """Getter for the name renderers attach to."""
+        return self._shm.name
+
+    def publish(self) -> int:
+        """
+        Writes the changes since the last call as a new frame.
+
+        Returns:
+            int: The number of object records written.
+
+        Raises:
+            ValueError: If the scene does not fit into the shared memory block.
+        """
+        changes = self._container.take_changes()
+        if self._full or self._structure_changed(changes):
+            return self._publish_full()
+        slots = self._slots
+        texts = bytearray()
+        updates = [(slots[obj], self._pack(obj, texts, self._text_length))
+                   for obj in changes if obj in slots]
+        if self._text_length + len(texts) > self._text_bytes:
+            return self._publish_full()  # Textbereich voll: komplett neu und damit kompakt
+        self._write(updates, texts, self._text_length, len(slots))
+        self._text_length += len(texts)
+        return len(updates)
+
+    def _structure_changed(self, changes) -> bool:
+        """Returns True if the changes cannot be written as single records."""
+        for obj in changes:
+            if isinstance(obj, Container) or (obj in self._slots) != self._shared(obj):
+                return True
+        return False
+
+    def _shared(self, obj: Object) -> bool:
+        """Returns True if the object is visible in the tree and part of the shared scene."""
+        if not isinstance(obj, self.SHARED_TYPES):
+            return False
+        while obj is not None:
+            if not obj.visible:
+                return False
+            if obj is self._container:
+                return True
+            obj = obj.parent
+        return False  # Nicht mehr im Baum
+
+    def _publish_full(self) -> int:
+        """Writes all records and texts again."""
+        objects: List[Object] = []
+        self._collect(self._container, objects)
+        if len(objects) > self._max_objects:
+            self._full = True
+            raise ValueError(f"Scene with {len(objects)} objects does not fit into the shared memory "
+                             f"block (max_objects={self._max_objects}).")
+        texts = bytearray()
+        updates = [(slot, self._pack(obj, texts, 0)) for slot, obj in enumerate(objects)]
+        if len(texts) > self._text_bytes:
+            self._full = True
+            raise ValueError(f"Scene with {len(texts)} text bytes does not fit into the shared memory "
+                             f"block (text_bytes={self._text_bytes}).")
+        self._slots = {obj: slot for slot, obj in enumerate(objects)}
+        self._write(updates, texts, 0, len(objects))
+        self._text_length = len(texts)
+        self._full = False
+        return len(updates)
+
+    def _write(self, updates: List[Tuple[int, bytes]], texts: bytearray, text_start: int, count: int):
+        """Writes records into their slots and the texts behind `text_start`, as one frame."""
+        buf = self._shm.buf
+        self._sequence += 1  # Ungerade: Schreiben läuft
+        SEQUENCE.pack_into(buf, 0, self._sequence)
+        self.frame += 1
+        HEADER.pack_into(buf, SEQUENCE.size, self.frame, *self._container.window_size, count,
+                         self._max_objects, _rgba(self._container.background_color),
+                         text_start + len(texts))
+        offset = self._records_offset
+        for slot, record in updates:
+            start = offset + slot * RECORD.size
+            buf[start:start + RECORD.size] = record
+        start = self._texts_offset + text_start
+        buf[start:start + len(texts)] = texts
+        self._sequence += 1  # Gerade: Bild vollständig
+        SEQUENCE.pack_into(buf, 0, self._sequence)
+
+    def _collect(self, container: Container, objects: List[Object]):
+        """Appends all visible shared objects in draw order."""
+        for obj in container.get_objects():
+            if not obj.visible:
+                continue
+            if isinstance(obj, Container):
+                self._collect(obj, objects)
+            elif isinstance(obj, self.SHARED_TYPES):
+                objects.append(obj)
+
+    @staticmethod
+    def _pack(obj: Object, texts: bytearray, text_base: int) -> bytes:
+        """Packs the record of one object; its text is appended to `texts`."""
+        x, y = obj.world_position
+        if isinstance(obj, Buzzer):
+            return RECORD.pack(BUZZER, x, y, *obj.size, _rgba(obj.in_color), _rgba(obj.out_color), 0, 0, 0)
+        if isinstance(obj, Circle):
+            return RECORD.pack(CIRCLE, x, y, obj.radius, 0, _rgba(obj.color),
+                               _rgba(obj.border_color), obj.border_width, 0, 0)
+        if isinstance(obj, Rectangle):
+            return RECORD.pack(RECTANGLE, x, y, *obj.size, _rgba(obj.color),
+                               _rgba(obj.border_color), obj.border_width, 0, 0)
+        text = obj.text.encode("utf-8")
+        record = RECORD.pack(TEXT, x, y, 0, 0, _rgba(obj.color), bytes(4), obj.fontsize,
+                             text_base + len(texts), len(text))
+        texts += text
+        return record
+
+    def close(self):
+        """Releases and removes the shared memory block."""
+        self._shm.close()
+        self._shm.unlink()
+
+
+class SceneView:
+    """
+    Read side of a SceneBroadcaster, used by renderer processes. Draws the
+    shared scene at the resolution of its own screen, with an optional
+    per-display overlay.
+    """
+    def __init__(self, name: str):
+        self._shm = self._attach(name)
+        self._records_offset = SEQUENCE.size + HEADER.size
+        self._last_sequence = 0
+        self.snapshot: Optional[SceneSnapshot] = None
+
+    @staticmethod
+    def _attach(name: str) -> shared_memory.SharedMemory:
+        """
+        Opens the block without registering it with the resource tracker:
+        only the broadcaster may remove it, not the exit of a renderer.
+        """
+        if sys.version_info >= (3, 13):
+            return shared_memory.SharedMemory(name=name, track=False)
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None  # Vor 3.13 registriert jedes Öffnen
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+    def read(self, retries: int = 100) -> Optional[SceneSnapshot]:
+        """
+        Returns the newest frame, or None if nothing new was published
+        (or the writer kept the block busy for `retries` attempts).
+        """
+        buf = self._shm.buf
+        for _ in range(retries):
+            sequence = SEQUENCE.unpack_from(buf, 0)[0]
+            if sequence == self._last_sequence:
+                return None
+            if sequence & 1:
+                time.sleep(0)  # Schreiber ist mitten im Bild
+                continue
+            frame, width, height, count, max_objects, background, text_length = \
+                HEADER.unpack_from(buf, SEQUENCE.size)
+            texts_offset = self._records_offset + max_objects * RECORD.size
+            records = bytes(buf[self._records_offset:self._records_offset + count * RECORD.size])
+            texts = bytes(buf[texts_offset:texts_offset + text_length])
+            if SEQUENCE.unpack_from(buf, 0)[0] != sequence:
+                continue  # Während des Kopierens überschrieben
+            self._last_sequence = sequence
+            self.snapshot = SceneSnapshot(frame, (width, height), pygame.Color(*background),
+                                          self._decode(records, texts))
+            return self.snapshot
+        return None
+
+    @staticmethod
+    def _decode(records: bytes, texts: bytes) -> List[tuple]:
+        """Unpacks the object records."""
+        objects = []
+        for kind, x, y, width, height, color, color2, number, start, length in RECORD.iter_unpack(records):
+            text = texts[start:start + length].decode("utf-8") if kind == TEXT else ""
+            objects.append((kind, x, y, width, height, pygame.Color(*color), pygame.Color(*color2),
+                            number, text))
+        return objects
+
+    def draw(self, screen: pygame.Surface,
+             overlay: Optional[Callable[[pygame.Surface, SceneSnapshot], None]] = None) -> bool:
+        """
+        Draws the last read frame scaled to the screen (aspect ratio kept).
+
+        Returns:
+            bool: False if no frame has been published yet.
+        """
+        snapshot = self.snapshot
+        if snapshot is None:
+            return False
+        screen_width, screen_height = screen.get_size()
+        window_width, window_height = snapshot.window_size
+        scale = min(screen_width / window_width, screen_height / window_height)
+        left = (screen_width - window_width * scale) / 2
+        top = (screen_height - window_height * scale) / 2
+        screen.fill(snapshot.background_color)
+        for kind, x, y, width, height, color, color2, number, text in snapshot.objects:
+            x = left + x * scale
+            y = top + y * scale
+            border = max(1, round(number * scale)) if number else 0
+            if kind == CIRCLE:
+                pygame.draw.circle(screen, color, (int(x), int(y)), round(width * scale))
+                if border:
+                    pygame.draw.circle(screen, color2, (int(x), int(y)), round(width * scale), border)
+            elif kind == RECTANGLE:
+                rect = pygame.Rect(int(x), int(y), round(width * scale), round(height * scale))
+                pygame.draw.rect(screen, color, rect)
+                if border:
+                    pygame.draw.rect(screen, color2, rect, border)
+            elif kind == TEXT:
+                screen.blit(font_cache.render(text, color, max(1, round(number * scale))), (int(x), int(y)))
+            elif kind == BUZZER:
+                size = (round(width * scale), round(height * scale))
+                screen.blit(Buzzer._render_sprite(size, color, color2, False), (int(x), int(y)))
+        if overlay is not None:
+            overlay(screen, snapshot)
+        return True
+
+    def close(self):
+        """Detaches from the shared memory block."""
+        self._shm.close()
+
+
+def run_renderer(name: str, size: Tuple[int, int], overlay=None, frames: Optional[int] = None,
+                 fps: int = 60) -> Optional[pygame.Surface]:
+    """
+    Opens a window of the given size and draws the shared scene until the
+    window is closed or `frames` frames were drawn.
+
+    Returns:
+        pygame.Surface: A copy of the last drawn screen when `frames` is given.
+    """
+    view = SceneView(name)
+    pygame.init()
+    screen = pygame.display.set_mode(size, pygame.RESIZABLE)
+    pygame.display.set_caption(f"Shared scene {name}")
+    clock = pygame.time.Clock()
+    drawn = 0
+    running = True
+    while running and (frames is None or drawn < frames):
+        resized = False
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.VIDEORESIZE:
+                screen = pygame.display.get_surface()
+                resized = True
+        # Nur neu zeichnen, wenn ein neues Bild veröffentlicht wurde
+        if (view.read() is not None or resized) and view.draw(screen, overlay):
+            pygame.display.flip()
+            drawn += 1
+        clock.tick(fps)
+    result = screen.copy() if frames is not None else None
+    view.close()
+    pygame.quit()
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Renderer for a shared scene")
+    parser.add_argument("name", help="name of the shared memory block of the show")
+    parser.add_argument("--size", default="1280x720", help="window size, e.g. 1920x1080")
+    args = parser.parse_args()
+    width, _, height = args.size.partition("x")
+    run_renderer(args.name, (int(width), int(height)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
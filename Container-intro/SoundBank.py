@@ -0,0 +1,95 @@
+import pygame
+import logging
+from typing import Dict, Optional
+
+
+class SoundBank:
+    """
+    Shared audio engine for all buzzers.
+    Initializes the mixer exactly once and keeps every decoded sound in memory,
+    so that playing a sound never touches the disk again.
+    """
+    def __init__(self,
+                 frequency: int = 44100,
+                 size: int = -16,
+                 channels: int = 2,
+                 buffer: int = 512):   # Kleiner Puffer = geringe Latenz
+        self._frequency = frequency
+        self._size = size
+        self._channels = channels
+        self._buffer = buffer
+        self._sounds: Dict[str, Optional[pygame.mixer.Sound]] = {}
+
+    @property
+    def buffer(self) -> int:
+        """Getter for the mixer buffer size in samples."""
+        return self._buffer
+
+    @buffer.setter
+    def buffer(self, new_buffer: int):
+        """
+        Setter for the mixer buffer size.
+        Only takes effect if the mixer has not been initialized yet.
+        """
+        if not isinstance(new_buffer, int) or new_buffer <= 0:
+            raise ValueError("Buffer must be a positive integer.")
+        if pygame.mixer.get_init():
+            logging.warning("Mixer is already initialized, new buffer size is ignored.")
+        self._buffer = new_buffer
+
+    def init(self) -> bool:
+        """
+        Initializes the mixer if that has not happened yet.
+
+        Returns:
+            bool: True if the mixer is ready to play sounds.
+        """
+        if pygame.mixer.get_init():
+            return True
+        try:
+            pygame.mixer.init(self._frequency, self._size, self._channels, self._buffer)
+        except pygame.error as error:
+            logging.warning(f"Could not initialize the mixer: {error}")
+            return False
+        return True
+
+    def load(self, path: str) -> Optional[pygame.mixer.Sound]:
+        """
+        Returns the decoded sound for the given path.
+        Each file is decoded only once; failures are cached as well,
+        so a missing file is not looked up again on every key press.
+        """
+        if path in self._sounds:
+            return self._sounds[path]
+        sound = None
+        if self.init():
+            try:
+                sound = pygame.mixer.Sound(path)
+            except (pygame.error, FileNotFoundError) as error:
+                logging.warning(f"Could not load sound '{path}': {error}")
+        self._sounds[path] = sound
+        return sound
+
+    def store(self, path: str, sound: Optional[pygame.mixer.Sound]):
+        """Puts an already decoded sound into the bank (e.g. from the asset preloader)."""
+        self._sounds[path] = sound
+
+    def unload(self, path: str):
+        """Removes a sound from the bank."""
+        self._sounds.pop(path, None)
+
+    def clear(self):
+        """Removes all sounds from the bank."""
+        self._sounds.clear()
+
+    def __contains__(self, path: str) -> bool:
+        """Returns True if the sound for the path has already been loaded."""
+        return path in self._sounds
+
+    def __len__(self) -> int:
+        """Returns the number of cached sounds."""
+        return len(self._sounds)
+
+
+# Gemeinsame Instanz, die von allen Buzzern verwendet wird
+sound_bank = SoundBank()
@@ -0,0 +1,60 @@
+import pygame
+from typing import Dict, List, Tuple
+
+
+class SpatialGrid:
+    """
+    Uniform grid for fast point queries ("which objects are under the mouse?").
+    Each object is registered in every cell its bounding rect overlaps,
+    so a query only has to look at the objects of a single cell.
+    """
+    def __init__(self, cell_size: int = 64):
+        if not isinstance(cell_size, int) or cell_size <= 0:
+            raise ValueError("cell_size must be a positive integer.")
+        self._cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], List[object]] = {}
+        self._entries: Dict[object, Tuple[pygame.Rect, List[Tuple[int, int]]]] = {}
+
+    def _cells_for(self, rect: pygame.Rect) -> List[Tuple[int, int]]:
+        """Returns the grid cells overlapped by the rect."""
+        size = self._cell_size
+        # Leere Rects belegen trotzdem die Zelle ihrer Position
+        right = rect.left + max(rect.width, 1) - 1
+        bottom = rect.top + max(rect.height, 1) - 1
+        return [(cx, cy)
+                for cx in range(rect.left // size, right // size + 1)
+                for cy in range(rect.top // size, bottom // size + 1)]
+
+    def insert(self, obj, rect: pygame.Rect):
+        """Adds an object with its bounding rect, or moves it if it is already in the grid."""
+        if obj in self._entries:
+            self.remove(obj)
+        cells = self._cells_for(rect)
+        for cell in cells:
+            self._cells.setdefault(cell, []).append(obj)
+        self._entries[obj] = (pygame.Rect(rect), cells)
+
+    def remove(self, obj):
+        """Removes an object from the grid."""
+        entry = self._entries.pop(obj, None)
+        if entry is None:
+            return
+        for cell in entry[1]:
+            objects = self._cells[cell]
+            objects.remove(obj)
+            if not objects:
+                del self._cells[cell]
+
+    def query_point(self, x: int, y: int) -> List[object]:
+        """Returns all objects whose bounding rect contains the point."""
+        size = self._cell_size
+        candidates = self._cells.get((int(x) // size, int(y) // size), ())
+        return [obj for obj in candidates if self._entries[obj][0].collidepoint(x, y)]
+
+    def __contains__(self, obj) -> bool:
+        """Returns True if the object is in the grid."""
+        return obj in self._entries
+
+    def __len__(self) -> int:
+        """Returns the number of objects in the grid."""
+        return len(self._entries)
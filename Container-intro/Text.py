@@ -1,7 +1,15 @@
+import bisect
 import pygame
 from Object import Object
+from FontCache import font_cache
 
 class Text(Object):
+    __slots__ = ("_text", "_color", "_fontsize", "_surface")
+
+    # Schriftgrößen für fit(), etwa 12 % auseinander: beim Ziehen am Fenster
+    # teilen sich viele Größen dieselben Fonts und gerenderten Texte
+    FIT_SIZES = tuple(sorted({round(8 * 1.12 ** step) for step in range(40)}))
+
     def __init__(self, position: pygame.Vector2, 
                  visible=True, 
                  color: pygame.Color = pygame.Color("white"),
@@ -11,6 +19,7 @@ class Text(Object):
         self._text = text  # Use private attributes for encapsulation
         self._color = color
         self._fontsize = fontsize
+        self._surface = None  # Gerenderter Text, wird bei Änderungen verworfen
 
     @property
     def fontsize(self) -> int:
@@ -26,15 +35,23 @@ class Text(Object):
     def fontsize(self, new_size: int):
         """Setter for the fontsize."""
         if not isinstance(new_size, int):
-            raise TypeError("Text must be a int.")
-        self._text = new_size
+            raise TypeError("Fontsize must be a int.")
+        self._invalidate()
+        self._fontsize = new_size
+        self._surface = None
+        self._invalidate()
+        self._geometry_changed()
 
     @text.setter
     def text(self, new_text: str):
         """Setter for the text content."""
         if not isinstance(new_text, str):
             raise TypeError("Text must be a string.")
+        self._invalidate()
         self._text = new_text
+        self._surface = None
+        self._invalidate()
+        self._geometry_changed()
 
     @property
     def color(self) -> pygame.Color:
@@ -47,6 +64,39 @@ class Text(Object):
         if not isinstance(new_color, pygame.Color):
             raise TypeError("Color must be a pygame.Color object.")
         self._color = new_color
+        self._surface = None
+        self._invalidate()
+
+    def bounding_rect(self) -> pygame.Rect:
+        """Returns the screen area covered by the rendered text."""
+        x, y = self.world_position
+        return self.render().get_rect(topleft=(int(x), int(y)))
+
+    def fit(self, rect: pygame.Rect):
+        """Centers the text in a layout cell with the largest font size that fits."""
+        fontsize = self._fit_size(rect.height)
+        width, height = font_cache.render(self._text, self._color, fontsize).get_size()
+        scale = min(rect.width / width if width else 1.0, rect.height / height if height else 1.0)
+        if scale < 1.0:
+            fontsize = self._fit_size(int(fontsize * scale))
+        self.fontsize = fontsize
+        self.position = pygame.Vector2(self.render().get_rect(center=rect.center).topleft)
+
+    @classmethod
+    def _fit_size(cls, size: int) -> int:
+        """Rounds a font size down to the nearest of FIT_SIZES (sizes below the smallest are kept)."""
+        index = bisect.bisect_right(cls.FIT_SIZES, size)
+        return cls.FIT_SIZES[index - 1] if index else max(1, size)
+
+    def render(self) -> pygame.Surface:
+        """Returns the rendered text surface, rendering it only after changes."""
+        if self._surface is None:
+            self._surface = font_cache.render(self._text, self._color, self._fontsize)
+        return self._surface
+
+    def event_bindings(self):
+        """Returns the key presses handled by this object (keys 1, 2 and 3)."""
+        return [(pygame.KEYDOWN, pygame.K_1), (pygame.KEYDOWN, pygame.K_2), (pygame.KEYDOWN, pygame.K_3)]
 
     def handle_key_press(self, event):
         """
@@ -66,7 +116,5 @@ class Text(Object):
     def draw(self, screen: pygame.Surface):
         """Draw the text on the given screen."""
         if self.visible:
-            font = pygame.font.Font(None, self.fontsize)  # Default font and size
-            text_surface = font.render(self.text, True, self.color)
-            screen.blit(text_surface, 
-                        (int(self.position.x), int(self.position.y)))
\ No newline at end of file
+            x, y = self.world_position
+            screen.blit(self.render(), (int(x), int(y)))
\ No newline at end of file
@@ -0,0 +1,240 @@
+"""
+Headless rendering benchmark for the Container/shape stack.
+Uses SDL's dummy video driver, so it runs without a window (e.g. in CI).
+
+    python benchmark.py                   # run and compare with benchmark_baseline.json
+    python benchmark.py --save-baseline   # store the current results as baseline
+
+Exits with code 1 if a scene got slower than the baseline allows, and with
+code 2 if there is no baseline to compare with (unless it is being saved).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from Container import Container
+from Circle import Circle
+from Text import Text
+from Buzzer import Buzzer
+from drawing import build_demo_container
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+KEYS = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+
+def build_buzzers(count: int) -> Container:
+    """Scene with `count` buzzers in a grid."""
+    root = Container(window_size=(1280, 720))
+    for i in range(count):
+        root.add_object(Buzzer(pygame.Vector2(60 * (i % 20), 60 * (i // 20) % 720),
+                               trigger_key=KEYS[i % len(KEYS)], sound=""))
+    return root
+
+
+def build_texts(count: int) -> Container:
+    """Scene with `count` text labels."""
+    root = Container(window_size=(1280, 720))
+    for i in range(count):
+        root.add_object(Text(pygame.Vector2(120 * (i % 10), 30 * (i // 10) % 720),
+                             text=f"Player {i}", color=pygame.Color("black"), fontsize=24))
+    return root
+
+
+def build_nested(depth: int, per_level: int = 5) -> Container:
+    """Scene with containers nested `depth` levels deep, each holding `per_level` circles."""
+    root = Container(window_size=(1280, 720))
+    container = root
+    for level in range(depth):
+        for i in range(per_level):
+            container.add_object(Circle(pygame.Vector2(40 + 60 * i, 40 + 30 * level), radius=12,
+                                        color=pygame.Color("blue")))
+        nested = Container()
+        container.add_object(nested)
+        container = nested
+    return root
+
+
+def build_demo(scale: int) -> Container:
+    """The drawing.py demo scene repeated `scale` times."""
+    root = Container(window_size=(800, 800))
+    for _ in range(scale):
+        root.add_object(build_demo_container())
+    return root
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Returns the given percentile of sorted samples."""
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def measure_draw(container: Container, frames: int) -> Dict[str, float]:
+    """Draws the container `frames` times and returns timing and allocation figures."""
+    screen = pygame.display.set_mode(container.window_size)
+    for _ in range(5):  # Aufwärmen: Caches füllen
+        screen.fill(container.background_color)
+        container.draw(screen)
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        screen.fill(container.background_color)
+        container.draw(screen)
+        times.append(time.perf_counter() - start)
+
+    # Speicher pro Frame in einem eigenen Durchlauf, tracemalloc bremst stark
+    tracemalloc.start()
+    peaks = []
+    for _ in range(min(frames, 20)):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        container.draw(screen)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    blocks_before = sys.getallocatedblocks()
+    container.draw(screen)
+    blocks_after = sys.getallocatedblocks()
+    tracemalloc.stop()
+
+    times.sort()
+    return {
+        "fps": len(times) / sum(times),
+        "p50_ms": percentile(times, 0.50) * 1000,
+        "p95_ms": percentile(times, 0.95) * 1000,
+        "p99_ms": percentile(times, 0.99) * 1000,
+        "alloc_bytes_per_frame": max(peaks),
+        "net_blocks_per_frame": blocks_after - blocks_before,
+    }
+
+
+def measure_events(container: Container, rounds: int) -> Dict[str, float]:
+    """
+    Dispatches a press and release of every trigger key and returns timing
+    and allocation figures per handle_key_press call.
+    """
+    events = []
+    for key in KEYS:
+        code = getattr(pygame, "K_" + key)
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=code, timestamp=0))
+        events.append(pygame.event.Event(pygame.KEYUP, key=code, timestamp=0))
+    handle = container.handle_key_press
+    clock = time.perf_counter_ns
+    times = []
+    for _ in range(rounds):
+        for event in events:
+            start = clock()
+            handle(event)
+            times.append(clock() - start)
+    container.collect_dirty_rects()
+
+    # Speicher pro Event in einem eigenen Durchlauf, wie bei measure_draw
+    tracemalloc.start()
+    peaks = []
+    for event in events:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        handle(event)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    blocks_before = sys.getallocatedblocks()
+    for event in events:
+        handle(event)
+    blocks_after = sys.getallocatedblocks()
+    tracemalloc.stop()
+    container.collect_dirty_rects()
+
+    times.sort()
+    return {
+        "event_us": sum(times) / len(times) / 1000,
+        "event_p50_us": percentile(times, 0.50) / 1000,
+        "event_p95_us": percentile(times, 0.95) / 1000,
+        "event_p99_us": percentile(times, 0.99) / 1000,
+        "event_alloc_bytes": max(peaks),
+        "event_net_blocks": (blocks_after - blocks_before) / len(events),
+    }
+
+
+def run(scenes: Dict[str, Callable[[], Container]], frames: int) -> Dict[str, Dict[str, float]]:
+    """Runs all scenes and returns the results per scene."""
+    results = {}
+    for name, build in scenes.items():
+        container = build()
+        result = measure_draw(container, frames)
+        result.update(measure_events(container, max(1, frames // 10)))
+        results[name] = result
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float) -> List[str]:
+    """
+    Returns a message for every scene whose median frame or event time regressed,
+    and for every scene or metric the baseline has no value for.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            regressions.append(f"{name}: not in baseline, run with --save-baseline")
+            continue
+        for metric in ("p50_ms", "event_us"):
+            if metric not in reference:
+                regressions.append(f"{name}: {metric} not in baseline, run with --save-baseline")
+            elif result[metric] > reference[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {result[metric]:.3f} > "
+                                   f"baseline {reference[metric]:.3f} (+{tolerance:.0%})")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Headless rendering benchmark")
+    parser.add_argument("--buzzers", type=int, default=200)
+    parser.add_argument("--texts", type=int, default=200)
+    parser.add_argument("--depth", type=int, default=20)
+    parser.add_argument("--demo-scale", type=int, default=50)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+    if not args.save_baseline and not os.path.exists(args.baseline):
+        # Ohne Baseline gibt es nichts zu prüfen; das darf in CI nicht als Erfolg durchgehen
+        print(f"No baseline found at {args.baseline}, run with --save-baseline first.")
+        return 2
+
+    pygame.init()
+    scenes = {
+        f"buzzers_{args.buzzers}": lambda: build_buzzers(args.buzzers),
+        f"texts_{args.texts}": lambda: build_texts(args.texts),
+        f"nested_depth_{args.depth}": lambda: build_nested(args.depth),
+        f"demo_x{args.demo_scale}": lambda: build_demo(args.demo_scale),
+    }
+    results = run(scenes, args.frames)
+    pygame.quit()
+
+    print(f"{'scene':<20}{'fps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'bytes/frame':>13}{'blocks':>8}{'event us':>10}{'ev p99 us':>11}{'bytes/ev':>10}")
+    for name, result in results.items():
+        print(f"{name:<20}{result['fps']:>10.0f}{result['p50_ms']:>10.3f}{result['p95_ms']:>10.3f}"
+              f"{result['p99_ms']:>10.3f}{result['alloc_bytes_per_frame']:>13.0f}"
+              f"{result['net_blocks_per_frame']:>8}{result['event_us']:>10.2f}"
+              f"{result['event_p99_us']:>11.2f}{result['event_alloc_bytes']:>10.0f}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    with open(args.baseline) as file:
+        regressions = compare(results, json.load(file), args.tolerance)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Load generator for the NetworkBuzzerServer.
+Simulates many remote buzzers that press and release their key and measures
+the round-trip time to the server with ping messages.
+
+Run with: python buzz_loadgen.py --clients 200 --duration 5 --host 127.0.0.1
+The server has to permit the host of the load generator, e.g.
+permissions={"127.0.0.1": string.ascii_lowercase + string.digits}.
+"""
+import argparse
+import asyncio
+import statistics
+import string
+import time
+from typing import List
+
+
+class LoadClient(asyncio.DatagramProtocol):
+    """One simulated remote buzzer."""
+    def __init__(self, rtts: List[int]):
+        self._rtts = rtts
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr):
+        command, _, token = data.partition(b" ")
+        if command == b"P":
+            self._rtts.append(time.perf_counter_ns() - int(token))
+
+
+async def run_client(host: str, port: int, key: str, rate: float, duration: float,
+                     rtts: List[int], counter: List[int]):
+    """Presses and releases one key `rate` times per second, with a ping per press."""
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(lambda: LoadClient(rtts),
+                                                       remote_addr=(host, port))
+    press = f"D {key}".encode()
+    release = f"U {key}".encode()
+    end = time.perf_counter() + duration
+    try:
+        while time.perf_counter() < end:
+            transport.sendto(press)
+            transport.sendto(f"P {time.perf_counter_ns()}".encode())
+            transport.sendto(release)
+            counter[0] += 2
+            await asyncio.sleep(1.0 / rate)
+        await asyncio.sleep(0.2)  # Auf letzte Antworten warten
+    finally:
+        transport.close()
+
+
+async def main(host: str, port: int, clients: int, rate: float, duration: float):
+    """Runs all clients and prints throughput and round-trip statistics."""
+    keys = string.ascii_lowercase + string.digits
+    rtts: List[int] = []
+    counter = [0]
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(host, port, keys[i % len(keys)], rate, duration, rtts, counter)
+                           for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    print(f"clients: {clients}, buzz messages sent: {counter[0]} ({counter[0] / elapsed:.0f}/s)")
+    if rtts:
+        samples = sorted(rtts)
+        print(f"round trip: median {statistics.median(samples) / 1e6:.3f} ms, "
+              f"p99 {samples[len(samples) * 99 // 100] / 1e6:.3f} ms, "
+              f"max {samples[-1] / 1e6:.3f} ms ({len(samples)} pings)")
+    else:
+        print("no ping answers received, is the server running?")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load generator for remote buzzers")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5005)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=10.0, help="presses per second and client")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds")
+    args = parser.parse_args()
+    asyncio.run(main(args.host, args.port, args.clients, args.rate, args.duration))
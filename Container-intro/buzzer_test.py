@@ -0,0 +1,773 @@
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import types
+import unittest
+
+# Tests laufen ohne Fenster und ohne Soundkarte
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from Arbiter import Arbiter
+from AudioMixer import AudioMixer, audio_mixer
+from AssetLoader import AssetLoader
+from BuzzJournal import BuzzJournal
+from EventLog import MAGIC_V1, RECORD_V1, EventRecorder, EventReplayer
+from Buzzer import Buzzer
+from Container import Container
+from NetworkBuzzerServer import NetworkBuzzerServer
+from Scene import Scene
+from SoundBank import SoundBank, sound_bank
+from FontCache import FontCache
+from Instrumentation import Instrumentation, LatencyHistogram, instrumentation
+from InputPump import (EvdevInputSource, InputPump, InputSource, PygameInputSource, SyntheticInputSource,
+                       WAKEUP_EVENT)
+
+BUZZER_WAV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "buzzer.wav")
+
+
+def key_event(event_type, key, timestamp):
+    """Creates a key event with a capture timestamp."""
+    return pygame.event.Event(event_type, key=key, timestamp=timestamp)
+
+
+class TestArbiter(unittest.TestCase):
+    def test_first_press_wins_and_locks_out(self):
+        arbiter = Arbiter()
+        arbiter.start_round(timestamp=0)
+        self.assertTrue(arbiter.press("a", 100))
+        self.assertFalse(arbiter.press("b", 150))
+        self.assertEqual(arbiter.winner, "a")
+        self.assertEqual(arbiter.ranking(), [("a", 100, 0), ("b", 150, 50)])
+        self.assertEqual(arbiter.reaction_times(), {"a": 100, "b": 150})
+
+    def test_out_of_order_delivery_is_ranked_by_time(self):
+        arbiter = Arbiter()
+        arbiter.start_round()
+        arbiter.press("late", 200)
+        arbiter.press("early", 100)
+        self.assertEqual(arbiter.winner, "early")
+        self.assertTrue(arbiter.is_locked_out("late"))
+
+    def test_auto_repeat_and_round_reset(self):
+        arbiter = Arbiter(lockout=False)
+        self.assertFalse(arbiter.press("a", 1))  # Noch keine Runde gestartet
+        arbiter.release("a")
+        arbiter.start_round()
+        self.assertTrue(arbiter.press("a", 10))
+        self.assertFalse(arbiter.press("a", 20))  # Auto-Repeat
+        self.assertTrue(arbiter.press("b", 30))   # Ohne Lockout leuchten alle
+        self.assertEqual([buzzer for buzzer, _, _ in arbiter.ranking()], ["a", "b"])
+
+        arbiter.end_round()
+        self.assertEqual(arbiter.start_round(), 2)
+        self.assertEqual(arbiter.ranking(), [])
+
+    def test_stuck_key_competes_in_next_round(self):
+        arbiter = Arbiter()
+        arbiter.start_round()
+        self.assertTrue(arbiter.press("a", 10))  # Loslassen geht verloren
+        arbiter.start_round()
+        self.assertTrue(arbiter.press("a", 20))
+        self.assertEqual(arbiter.winner, "a")
+
+    def test_late_earlier_press_corrects_feedback(self):
+        arbiter = Arbiter()
+        root = Container()
+        first = Buzzer((0, 0), trigger_key='a', sound=BUZZER_WAV, arbiter=arbiter)
+        second = Buzzer((60, 0), trigger_key='b', sound=BUZZER_WAV, arbiter=arbiter)
+        root.add_object(first)
+        root.add_object(second)
+        arbiter.start_round(timestamp=0)
+
+        # "b" kommt zuerst an und leuchtet, "a" wurde aber früher gedrückt
+        with audio_mixer.batch():
+            root.handle_key_press(key_event(pygame.KEYDOWN, pygame.K_b, 20))
+            self.assertEqual(second.in_color, second.in_color_active)
+            root.handle_key_press(key_event(pygame.KEYDOWN, pygame.K_a, 10))
+            if audio_mixer._pending:
+                self.assertEqual([owner for _, owner in audio_mixer._pending], [first])
+        self.assertIs(arbiter.winner, first)
+        self.assertEqual(first.in_color, first.in_color_active)
+        self.assertEqual(second.in_color, second.in_color_inactive)  # Wieder dunkel
+
+    def test_many_buzzers_in_one_frame(self):
+        arbiter = Arbiter()
+        root = Container()
+        keys = "abcdefghijklmnopqrstuvwxyz0123456789"
+        buzzers = [Buzzer((0, 0), trigger_key=key, sound=BUZZER_WAV, arbiter=arbiter) for key in keys]
+        for buzzer in buzzers:
+            root.add_object(buzzer)
+        arbiter.start_round(timestamp=0)
+
+        # Alle Drücke landen im selben Frame, zeitlich rückwärts sortiert
+        for i, buzzer in reversed(list(enumerate(buzzers))):
+            root.handle_key_press(key_event(pygame.KEYDOWN, buzzer._trigger_code, 1000 + i))
+        self.assertIs(arbiter.winner, buzzers[0])
+        self.assertEqual([buzzer for buzzer, _, _ in arbiter.ranking()], buzzers)
+        self.assertEqual(arbiter.ranking()[-1][2], len(buzzers) - 1)
+        self.assertEqual([buzzer for buzzer in buzzers if buzzer.in_color == buzzer.in_color_active], buzzers[:1])
+
+    def test_buzzer_lockout(self):
+        arbiter = Arbiter()
+        first = Buzzer((0, 0), trigger_key='a', sound=BUZZER_WAV, arbiter=arbiter)
+        second = Buzzer((60, 0), trigger_key='b', sound=BUZZER_WAV, arbiter=arbiter)
+        arbiter.start_round()
+
+        first.handle_key_press(key_event(pygame.KEYDOWN, pygame.K_a, 10))
+        second.handle_key_press(key_event(pygame.KEYDOWN, pygame.K_b, 20))
+        self.assertEqual(first.in_color, first.in_color_active)
+        self.assertEqual(second.in_color, second.in_color_inactive)
+
+        with self.assertRaises(TypeError):
+            first.arbiter = "not an arbiter"
+
+
+class TestInputPump(unittest.TestCase):
+    def test_threaded_source_stamps_at_capture(self):
+        source = SyntheticInputSource()
+        pump = InputPump([source])
+        pump.start()
+        try:
+            before = time.perf_counter_ns()
+            source.push(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a))
+            source.push(pygame.event.Event(pygame.KEYUP, key=pygame.K_a))
+            events = pump.drain(timeout=1.0)
+            while len(events) < 2:
+                events += pump.drain(timeout=1.0)
+        finally:
+            pump.stop()
+        self.assertEqual([event.type for event in events], [pygame.KEYDOWN, pygame.KEYUP])
+        self.assertTrue(all(event.timestamp >= before for event in events))
+
+    def test_events_are_sorted_and_dispatched(self):
+        pump = InputPump()
+        root = Container()
+        arbiter = Arbiter()
+        first = Buzzer((0, 0), trigger_key='a', sound=BUZZER_WAV, arbiter=arbiter)
+        second = Buzzer((60, 0), trigger_key='b', sound=BUZZER_WAV, arbiter=arbiter)
+        root.add_object(first)
+        root.add_object(second)
+        arbiter.start_round(timestamp=0)
+
+        # Aus verschiedenen Quellen in falscher Reihenfolge angekommen
+        pump.inject(key_event(pygame.KEYDOWN, pygame.K_b, time.perf_counter_ns()))
+        pump.inject(key_event(pygame.KEYDOWN, pygame.K_a, 1))
+        events = pump.drain()
+        pump.dispatch(root, events)
+        self.assertIs(arbiter.winner, first)
+        self.assertEqual(pump.latency_stats()["count"], 2)
+        self.assertGreaterEqual(pump.latency_stats()["max_us"], 0)
+
+    def test_pygame_source_waits_and_filters_wakeups(self):
+        pygame.display.init()
+        pygame.event.clear()
+        source = PygameInputSource()
+        self.assertEqual(source.read(0.01), [])  # Zeitüberschreitung
+
+        pygame.event.post(pygame.event.Event(WAKEUP_EVENT))
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a))
+        pygame.event.post(pygame.event.Event(pygame.KEYUP, key=pygame.K_a))
+        events = source.read(1.0)
+        self.assertEqual([event.type for event in events], [pygame.KEYDOWN, pygame.KEYUP])
+        self.assertTrue(all(hasattr(event, "timestamp") for event in events))
+
+    def test_thread_wakes_sleeping_main_loop(self):
+        pygame.display.init()
+        pygame.event.clear()
+        source = SyntheticInputSource()
+        pump = InputPump([PygameInputSource(), source])
+        pump.start()
+        try:
+            threading.Timer(0.05, source.push,
+                            [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a)]).start()
+            start = time.perf_counter()
+            events = []
+            while not events and time.perf_counter() - start < 2.0:
+                events = pump.drain(timeout=2.0)
+        finally:
+            pump.stop()
+        self.assertEqual([event.type for event in events], [pygame.KEYDOWN])
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_presses_in_one_frame_get_own_timestamps(self):
+        pygame.display.init()
+        pygame.event.clear()
+        pump = InputPump([PygameInputSource()])
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a))
+        # Zweiter Druck kommt, während die Hauptschleife den Rest des Bildes abfragt
+        threading.Timer(0.005, pygame.event.post, [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_b)]).start()
+        pump.poll_for(1 / 60)
+        events = pump.drain()
+        self.assertEqual([event.key for event in events], [pygame.K_a, pygame.K_b])
+        self.assertGreaterEqual(events[1].timestamp - events[0].timestamp, 4_000_000)
+
+    def test_evdev_source_uses_kernel_time(self):
+        read_end, write_end = os.pipe()
+        os.write(write_end, b"x")  # Gerät meldet sich lesebereit
+        now = time.time_ns()
+
+        def raw(code, value, ns):
+            return types.SimpleNamespace(type=EvdevInputSource.EV_KEY, code=code, value=value,
+                                         sec=ns // 1_000_000_000, usec=ns // 1000 % 1_000_000)
+
+        def read():
+            os.read(read_end, 1)  # Wie beim Gerät: gelesene Events sind weg
+            return [raw(30, 1, now - 3_000_000), raw(48, 1, now - 2_000_000),
+                    raw(30, 2, now - 1_000_000), raw(99, 1, now)]
+        device = types.SimpleNamespace(fd=read_end, read=read, grab=lambda: None, ungrab=lambda: None,
+                                       close=lambda: os.close(read_end))
+        source = EvdevInputSource(device, keymap={30: pygame.K_a, 48: pygame.K_b, 99: None})
+        pump = InputPump([source])
+        pump.start()
+        try:
+            events = pump.drain(timeout=1.0)
+            while len(events) < 2:
+                events += pump.drain(timeout=1.0)
+        finally:
+            pump.stop()
+            os.close(write_end)
+        self.assertEqual([(event.type, event.key) for event in events],
+                         [(pygame.KEYDOWN, pygame.K_a), (pygame.KEYDOWN, pygame.K_b)])
+        # Abstand der Kernel-Zeitstempel bleibt erhalten, Auto-Repeat und fremde Tasten fehlen
+        self.assertAlmostEqual(events[1].timestamp - events[0].timestamp, 1_000_000, delta=1000)
+        self.assertLess(abs(events[1].timestamp - time.perf_counter_ns()), 1_000_000_000)
+
+    def test_invalid_source(self):
+        with self.assertRaises(TypeError):
+            InputPump(["keyboard"])
+        with self.assertRaises(TypeError):
+            InputSource()  # Abstrakt
+
+
+class TestNetworkBuzzerServer(unittest.TestCase):
+    def setUp(self):
+        self.pump = InputPump()
+        self.server = NetworkBuzzerServer(self.pump.inject, host="127.0.0.1", port=0,
+                                          permissions={"127.0.0.1": {"a", "b"}}, release_timeout=0.2)
+        self.server.start()
+        self.client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.client.settimeout(2.0)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def receive(self, count):
+        events = []
+        deadline = time.perf_counter() + 2.0
+        while len(events) < count and time.perf_counter() < deadline:
+            events += self.pump.drain(timeout=0.05)
+        return events
+
+    def test_remote_press_reaches_buzzer(self):
+        root = Container()
+        buzzer = Buzzer((0, 0), trigger_key='a', sound=BUZZER_WAV)
+        root.add_object(buzzer)
+
+        before = time.perf_counter_ns()
+        self.client.sendto(b"D a", self.server.address)
+        events = self.receive(1)
+        self.assertEqual(len(events), 1)
+        self.assertGreaterEqual(events[0].timestamp, before)
+        self.assertEqual(events[0].remote[1], self.client.getsockname()[1])
+        self.pump.dispatch(root, events)
+        self.assertEqual(buzzer.in_color, buzzer.in_color_active)
+
+    def test_batched_lines_and_invalid_keys(self):
+        self.client.sendto(b"D a\nU a\nD z\nX b\n", self.server.address)
+        events = self.receive(2)
+        self.assertEqual([event.type for event in events], [pygame.KEYDOWN, pygame.KEYUP])
+        time.sleep(0.05)
+        self.assertEqual(self.server.invalid, 1)
+        self.assertEqual(self.server.rejected, 1)  # "z" ist für diesen Client nicht freigegeben
+
+    def test_lost_release_times_out(self):
+        self.client.sendto(b"D a", self.server.address)
+        self.client.sendto(b"D a", self.server.address)  # Hält nur weiter gedrückt
+        events = self.receive(2)
+        self.assertEqual([event.type for event in events], [pygame.KEYDOWN, pygame.KEYUP])
+        self.assertGreater(events[1].timestamp - events[0].timestamp, 150_000_000)
+        self.assertEqual(self.server.expired, 1)
+
+        # Das verspätete "U" erzeugt kein zweites Loslassen
+        self.client.sendto(b"U a", self.server.address)
+        self.client.sendto(b"D b", self.server.address)
+        self.assertEqual([event.key for event in self.receive(1)], [pygame.K_b])
+
+    def test_unknown_hosts_are_rejected(self):
+        self.server.revoke("127.0.0.1")
+        self.server.allow("10.0.0.7", ["a"])
+        self.client.sendto(b"D a\nP 1", self.server.address)
+        self.assertEqual(self.receive(1), [])
+        self.assertEqual(self.server.rejected, 1)
+        with self.assertRaises(ValueError):
+            self.server.allow("10.0.0.8", ["not a key"])
+
+    def test_ping_is_answered(self):
+        self.client.sendto(b"P 123", self.server.address)
+        self.assertEqual(self.client.recvfrom(64)[0], b"P 123")
+
+
+class TestInstrumentation(unittest.TestCase):
+    def tearDown(self):
+        instrumentation.enabled = False
+        instrumentation.reset()
+
+    def test_histogram(self):
+        histogram = LatencyHistogram()
+        for latency_us in (100, 300, 700, 700, 200000):
+            histogram.add(latency_us * 1000)
+        self.assertEqual(histogram.count, 5)
+        self.assertEqual(histogram.percentile_us(0.5), 1000)
+        self.assertEqual(histogram.percentile_us(1.0), 200000)
+        self.assertEqual(histogram.to_dict()["counts"][-1], 1)
+
+    def test_press_to_frame(self):
+        root = Container()
+        buzzer = Buzzer((0, 0), trigger_key='a', sound=BUZZER_WAV)
+        root.add_object(buzzer)
+        screen = pygame.Surface((100, 100))
+
+        root.handle_key_press(key_event(pygame.KEYDOWN, pygame.K_a, time.perf_counter_ns()))
+        root.draw(screen)
+        instrumentation.frame_presented()
+        self.assertEqual(instrumentation.summary()["key_to_frame"], {})  # Ausgeschaltet
+
+        instrumentation.enabled = True
+        receipt = time.perf_counter_ns()
+        root.handle_key_press(key_event(pygame.KEYDOWN, pygame.K_a, receipt))
+        instrumentation.frame_presented()  # Noch nicht gezeichnet
+        root.draw(screen)
+        instrumentation.frame_presented()
+        summary = instrumentation.summary()
+        self.assertEqual(summary["key_to_frame"]["Buzzer a"]["count"], 1)
+        self.assertEqual(summary["key_to_sound"]["Buzzer a"]["count"], 1)
+        self.assertLessEqual(summary["key_to_sound"]["Buzzer a"]["max_us"],
+                             summary["key_to_frame"]["Buzzer a"]["max_us"])
+        self.assertEqual(summary["draw_time"]["Buzzer a"]["count"], 1)
+
+        area = instrumentation.draw_overlay(screen)
+        self.assertGreater(area.height, 0)
+
+    def test_dump(self):
+        monitor = Instrumentation()
+        monitor.press_dispatched("buzzer", None)
+        monitor.buzzer_drawn("buzzer")
+        monitor.frame_presented()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "latency.json")
+            monitor.dump(path)
+            with open(path) as file:
+                self.assertEqual(len(json.load(file)["key_to_frame"]), 1)
+
+
+class TestAssetLoader(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.sounds = [os.path.join(self.directory, f"sound{i}.wav") for i in range(3)]
+        for path in self.sounds:
+            shutil.copy(BUZZER_WAV, path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_parallel_preload_with_progress(self):
+        bank = SoundBank()
+        font_threads = set()
+
+        class RecordingFontCache(FontCache):
+            def get_font(self, size, name=None):
+                font_threads.add(threading.current_thread())
+                return super().get_font(size, name)
+
+        fonts = RecordingFontCache()
+        reports = []
+        loader = AssetLoader(workers=3, sounds=bank, fonts=fonts)
+        loader.preload(self.sounds + [os.path.join(self.directory, "missing.wav")], [24, 36],
+                       progress=lambda done, total, name: reports.append((done, total)))
+        self.assertEqual(reports[-1], (6, 6))
+        self.assertEqual([done for done, _ in reports], list(range(1, 7)))
+        self.assertEqual(loader.stats(), {"decoded": 3, "mapped": 0, "failed": 1})
+        self.assertTrue(all(path in bank and bank.load(path) is not None for path in self.sounds))
+        self.assertTrue(all(os.path.exists(path + AssetLoader.PCM_SUFFIX) for path in self.sounds))
+        self.assertIs(fonts.get_font(24), fonts.get_font(24))
+        self.assertEqual(font_threads, {threading.current_thread()})  # FreeType nur auf einem Thread
+
+    def test_pcm_cache_is_mapped_on_later_runs(self):
+        AssetLoader(sounds=SoundBank()).preload(self.sounds)
+        bank = SoundBank()
+        loader = AssetLoader(sounds=bank)
+        loader.preload(self.sounds)
+        self.assertEqual(loader.stats()["mapped"], 3)
+        original = pygame.mixer.Sound(BUZZER_WAV)
+        self.assertEqual(bank.load(self.sounds[0]).get_raw(), original.get_raw())
+
+        # Geänderte Quelldatei wird neu dekodiert
+        os.utime(self.sounds[0], ns=(0, 0))
+        loader = AssetLoader(sounds=SoundBank())
+        loader.preload(self.sounds)
+        self.assertEqual(loader.stats(), {"decoded": 1, "mapped": 2, "failed": 0})
+
+    def test_scene_assets(self):
+        path = os.path.join(self.directory, "show.json")
+        with open(path, "w") as file:
+            json.dump({"objects": [
+                {"type": "buzzer", "trigger_key": "a", "sound": "sound0.wav"},
+                {"type": "container", "objects": [
+                    {"type": "buzzer", "trigger_key": "b", "sound": "sound1.wav"},
+                    {"type": "text", "fontsize": 20}, {"type": "text"}]}]}, file)
+        scene = Scene.load(path)
+        sounds, fonts = scene.assets()
+        self.assertEqual(sounds, set(self.sounds[:2]))
+        self.assertEqual(fonts, {20, 36})
+
+        bank = SoundBank()
+        AssetLoader(sounds=bank).preload_scene(scene)
+        self.assertEqual(len(bank), 2)
+
+
+class TestEventLog(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "show.evl")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_record_and_load(self):
+        with EventRecorder(self.path) as recorder:
+            start = time.perf_counter_ns()
+            recorder.record([
+                key_event(pygame.KEYDOWN, pygame.K_a, start + 1000),
+                pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(10, 20), timestamp=start + 2000),
+                pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(10, 20), touch=True, timestamp=start),
+                pygame.event.Event(pygame.FINGERUP, touch_id=3, finger_id=2, x=0.5, y=0.25,
+                                   timestamp=start + 3000),
+                pygame.event.Event(pygame.VIDEORESIZE, size=(100, 100), timestamp=start),
+            ])
+        self.assertEqual(recorder.recorded, 3)
+        self.assertEqual(os.path.getsize(self.path), 4 + 3 * 34)
+
+        events = list(EventReplayer.load(self.path).events(base_ns=0))
+        self.assertEqual([event.type for event in events],
+                         [pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.FINGERUP])
+        self.assertEqual(events[0].key, pygame.K_a)
+        self.assertEqual(events[1].pos, (10, 20))
+        self.assertEqual((events[2].touch_id, events[2].finger_id, events[2].x, events[2].y), (3, 2, 0.5, 0.25))
+        self.assertLess(events[0].timestamp, events[1].timestamp)
+
+        with open(self.path, "ab") as file:
+            file.write(b"x")
+        with self.assertRaises(ValueError):
+            EventReplayer.load(self.path)
+
+    def test_large_touch_ids_round_trip(self):
+        touch_id, finger_id = 2 ** 62 + 11, -(2 ** 40) - 5  # SDL vergibt 64-Bit-IDs
+        with EventRecorder(self.path) as recorder:
+            recorder.record([pygame.event.Event(pygame.FINGERDOWN, touch_id=touch_id, finger_id=finger_id,
+                                                x=0.1, y=0.2, timestamp=time.perf_counter_ns())])
+        event = next(EventReplayer.load(self.path).events())
+        self.assertEqual((event.touch_id, event.finger_id), (touch_id, finger_id))
+
+    def test_old_recordings_still_load(self):
+        with open(self.path, "wb") as file:
+            file.write(MAGIC_V1 + RECORD_V1.pack(5, pygame.FINGERUP, 7, 0.5, 0.5))
+        event = next(EventReplayer.load(self.path).events())
+        self.assertEqual((event.type, event.finger_id, event.touch_id), (pygame.FINGERUP, 7, 0))
+
+    def test_replay_matches_live_run(self):
+        def build():
+            root = Container()
+            arbiter = Arbiter()
+            buzzers = [Buzzer((60 * i, 0), trigger_key=key, sound=BUZZER_WAV, arbiter=arbiter)
+                       for i, key in enumerate("abc")]
+            for buzzer in buzzers:
+                root.add_object(buzzer)
+            arbiter.start_round(timestamp=0)
+            return root, arbiter, buzzers
+
+        def state(arbiter, buzzers):
+            return ([(buzzer.trigger_key, delta) for buzzer, _, delta in arbiter.ranking()],
+                    [tuple(buzzer.in_color) for buzzer in buzzers])
+
+        # Live: Drücke aus mehreren Frames, teils in falscher Reihenfolge angekommen
+        root, arbiter, buzzers = build()
+        start = time.perf_counter_ns()
+        frames = [[key_event(pygame.KEYDOWN, pygame.K_c, start + 3_000_000),
+                   key_event(pygame.KEYDOWN, pygame.K_b, start + 2_000_000)],
+                  [key_event(pygame.KEYUP, pygame.K_c, start + 5_000_000),
+                   key_event(pygame.KEYDOWN, pygame.K_a, start + 4_000_000)]]
+        with EventRecorder(self.path) as recorder:
+            for events in frames:
+                recorder.record(events)
+                for event in events:
+                    root.handle_key_press(event)
+        live = state(arbiter, buzzers)
+
+        root, arbiter, buzzers = build()
+        EventReplayer.load(self.path).replay(root)
+        self.assertEqual(state(arbiter, buzzers), live)
+        self.assertEqual(arbiter.winner.trigger_key, "b")
+
+    def test_storm_replay_is_deterministic(self):
+        keys = "abcdefgh"
+        codes = [getattr(pygame, "K_" + key) for key in keys]
+        storm = EventReplayer.storm(codes, rate=5000, duration=0.5, seed=7)
+        self.assertEqual(len(storm), 5000)
+        storm.save(self.path)
+        replayer = EventReplayer.load(self.path)
+        first_press = next(event.key for event in replayer.events() if event.type == pygame.KEYDOWN)
+
+        for _ in range(2):
+            root = Container()
+            arbiter = Arbiter()
+            buzzers = {}
+            for key in keys:
+                buzzers[key] = Buzzer((0, 0), trigger_key=key, sound=BUZZER_WAV, arbiter=arbiter)
+                root.add_object(buzzers[key])
+            arbiter.start_round(timestamp=0)
+            stats = replayer.replay(root)
+            self.assertEqual(stats["events"], 5000)
+            self.assertGreater(stats["events_per_second"], 5000)
+            self.assertEqual(arbiter.winner._trigger_code, first_press)
+            self.assertEqual(len(arbiter.ranking()), len(keys))
+
+    def test_realtime_replay(self):
+        replayer = EventReplayer([(0, pygame.KEYDOWN, pygame.K_a, 0, 0.0, 0.0),
+                                  (40_000_000, pygame.KEYUP, pygame.K_a, 0, 0.0, 0.0)])
+        root = Container()
+        buzzer = Buzzer((0, 0), trigger_key='a', sound=BUZZER_WAV)
+        root.add_object(buzzer)
+        stats = replayer.replay(root, realtime=True, speed=2.0)
+        self.assertGreaterEqual(stats["seconds"], 0.02)
+        self.assertIn("max_late_us", stats)
+        self.assertEqual(buzzer.in_color, buzzer.in_color_inactive)
+
+
+class TestBuzzJournal(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "show.bzj")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_arbiter_decisions_are_journaled(self):
+        with BuzzJournal(self.path, flush_interval=0.01) as journal:
+            arbiter = Arbiter(journal=journal)
+            first = Buzzer((0, 0), trigger_key='a', sound=BUZZER_WAV, arbiter=arbiter)
+            second = Buzzer((60, 0), trigger_key='b', sound=BUZZER_WAV, arbiter=arbiter)
+            first.handle_key_press(key_event(pygame.KEYDOWN, pygame.K_a, time.perf_counter_ns()))
+            first.handle_key_press(key_event(pygame.KEYUP, pygame.K_a, time.perf_counter_ns()))
+            arbiter.start_round()
+            first.handle_key_press(key_event(pygame.KEYDOWN, pygame.K_a, time.perf_counter_ns()))
+            first.handle_key_press(key_event(pygame.KEYDOWN, pygame.K_a, time.perf_counter_ns()))  # Auto-Repeat
+            second.handle_key_press(key_event(pygame.KEYDOWN, pygame.K_b, time.perf_counter_ns()))
+            arbiter.end_round()
+            self.assertTrue(journal.flush())
+
+            entries = BuzzJournal.read(self.path)
+            self.assertEqual([(entry.kind, entry.round, entry.key, entry.decision) for entry in entries], [
+                (BuzzJournal.PRESS, 0, "a", BuzzJournal.OUTSIDE_ROUND),
+                (BuzzJournal.RELEASE, 0, "a", BuzzJournal.NONE),
+                (BuzzJournal.ROUND_START, 1, "", BuzzJournal.NONE),
+                (BuzzJournal.PRESS, 1, "a", BuzzJournal.ACCEPTED),
+                (BuzzJournal.PRESS, 1, "b", BuzzJournal.LOCKED_OUT),
+                (BuzzJournal.ROUND_END, 1, "", BuzzJournal.NONE),
+            ])
+            self.assertLessEqual(abs(entries[0].timestamp_ns - time.time_ns()), 10 ** 9)  # Wanduhrzeit
+
+    def test_many_events_never_block(self):
+        with BuzzJournal(self.path, capacity=100_000) as journal:
+            start = time.perf_counter()
+            for i in range(50_000):
+                journal.append(BuzzJournal.PRESS, i // 1000, key="a", decision=BuzzJournal.ACCEPTED)
+            self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(journal.written, 50_000)
+        self.assertEqual(BuzzJournal.count(self.path), 50_000)
+
+        self.assertEqual([entry.round for entry in BuzzJournal.read(self.path, 1999, 2001)], [1, 2])
+        entries = BuzzJournal.read_rounds(self.path, 10, 11)
+        self.assertEqual(len(entries), 2000)
+        self.assertEqual({entry.round for entry in entries}, {10, 11})
+        self.assertEqual(BuzzJournal.read_rounds(self.path, 99), [])
+        seen = []
+        self.assertEqual(BuzzJournal.replay(self.path, seen.append), 50_000)
+        self.assertEqual(seen[-1].round, 49)
+
+    def test_full_buffer_drops_and_reopen_appends(self):
+        journal = BuzzJournal(self.path, capacity=10, flush_interval=60)
+        for _ in range(15):
+            journal.append(BuzzJournal.PRESS, 1)
+        self.assertEqual(journal.dropped, 5)
+        journal.close()
+        with BuzzJournal(self.path) as journal:
+            journal.append(BuzzJournal.ROUND_END, 1)
+        self.assertEqual(BuzzJournal.count(self.path), 11)
+
+        with open(self.path, "wb") as file:
+            file.write(b"nope")
+        with self.assertRaises(ValueError):
+            BuzzJournal.read(self.path)
+
+    def test_torn_tail_is_cut_off_on_reopen(self):
+        with BuzzJournal(self.path) as journal:
+            for round in (1, 2, 3):
+                journal.append(BuzzJournal.ROUND_START, round)
+        with open(self.path, "ab") as file:
+            file.write(b"\x01\x02\x03")  # Absturz mitten im Eintrag
+        with self.assertLogs(level="WARNING"):
+            journal = BuzzJournal(self.path)
+        with journal:
+            journal.append(BuzzJournal.ROUND_START, 4)
+        self.assertEqual(BuzzJournal.count(self.path), 4)
+        entries = BuzzJournal.read_rounds(self.path, 4)
+        self.assertEqual([(entry.kind, entry.round) for entry in entries], [(BuzzJournal.ROUND_START, 4)])
+
+    def test_round_numbering_continues_after_crash(self):
+        journal = BuzzJournal(self.path)
+        arbiter = Arbiter(journal=journal)
+        buzzer = Buzzer((0, 0), trigger_key='a', sound=BUZZER_WAV, arbiter=arbiter)
+        for _ in range(2):
+            arbiter.start_round()
+            buzzer.handle_key_press(key_event(pygame.KEYDOWN, pygame.K_a, time.perf_counter_ns()))
+            buzzer.handle_key_press(key_event(pygame.KEYUP, pygame.K_a, time.perf_counter_ns()))
+        journal.close()  # Ohne ROUND_END, wie bei einem Absturz
+        with open(self.path, "ab") as file:
+            file.write(b"\x01\x02")
+        with self.assertLogs(level="WARNING"):
+            journal = BuzzJournal(self.path)
+        with journal:
+            self.assertEqual(journal.last_round, 2)
+            arbiter = Arbiter(journal=journal)
+            buzzer = Buzzer((0, 0), trigger_key='a', sound=BUZZER_WAV, arbiter=arbiter)
+            self.assertEqual(arbiter.start_round(), 3)
+            buzzer.handle_key_press(key_event(pygame.KEYDOWN, pygame.K_a, time.perf_counter_ns()))
+            arbiter.end_round()
+            with self.assertRaises(ValueError):
+                journal.append(BuzzJournal.ROUND_START, 1)
+
+        for round in (1, 2):
+            entries = BuzzJournal.read_rounds(self.path, round)
+            self.assertEqual([(entry.kind, entry.round) for entry in entries], [
+                (BuzzJournal.ROUND_START, round), (BuzzJournal.PRESS, round), (BuzzJournal.RELEASE, round)])
+        entries = BuzzJournal.read_rounds(self.path, 3)
+        self.assertEqual([(entry.kind, entry.decision) for entry in entries], [
+            (BuzzJournal.ROUND_START, BuzzJournal.NONE), (BuzzJournal.PRESS, BuzzJournal.ACCEPTED),
+            (BuzzJournal.ROUND_END, BuzzJournal.NONE)])
+
+    def test_failed_write_is_counted(self):
+        class BrokenFile:
+            def write(self, data):
+                raise OSError("disk full")
+
+            def truncate(self, size):
+                pass
+
+        journal = BuzzJournal(self.path, flush_interval=0.01)
+        working, journal._file = journal._file, BrokenFile()
+        with self.assertLogs(level="ERROR"):
+            journal.append(BuzzJournal.PRESS, 1)
+            self.assertFalse(journal.flush(timeout=2.0))
+        self.assertEqual(journal.failed, 1)
+        journal._file = working
+        journal.append(BuzzJournal.PRESS, 2)
+        self.assertTrue(journal.flush())
+        journal.close()
+        self.assertEqual([entry.round for entry in BuzzJournal.read(self.path)], [2])
+
+
+class TestAudioMixer(unittest.TestCase):
+    def setUp(self):
+        self.sound = sound_bank.load(BUZZER_WAV)
+        if self.sound is None:
+            self.skipTest("No mixer available.")
+        pygame.mixer.stop()
+
+    def test_pool_and_voice_stealing(self):
+        mixer = AudioMixer(channels=2)
+        self.assertTrue(mixer.play(self.sound))
+        self.assertTrue(mixer.play(self.sound))
+        self.assertTrue(mixer.play(self.sound))  # Stoppt den ältesten Sound
+        self.assertEqual(mixer.stolen, 1)
+
+        mixer.steal = AudioMixer.STEAL_NONE
+        self.assertFalse(mixer.play(self.sound))
+        self.assertEqual(mixer.stats()["dropped"], 1)
+        with self.assertRaises(ValueError):
+            mixer.steal = "loudest"
+
+    def test_reserved_channel(self):
+        mixer = AudioMixer(channels=2, steal=AudioMixer.STEAL_NONE)
+        buzzer = Buzzer((0, 0), trigger_key='a', sound=BUZZER_WAV)
+        self.assertTrue(mixer.reserve(buzzer))
+        self.assertFalse(mixer.reserve("second"))  # Der letzte Kanal bleibt für alle
+        self.assertTrue(mixer.play(self.sound))
+        self.assertFalse(mixer.play(self.sound))  # Gemeinsamer Kanal belegt
+        self.assertTrue(mixer.play(self.sound, buzzer))
+        self.assertTrue(mixer.play(self.sound, buzzer))  # Startet den eigenen Sound neu
+        mixer.unreserve(buzzer)
+        self.assertEqual(mixer.stats()["reserved"], 0)
+
+    def test_burst_is_mixed_without_clipping(self):
+        mixer = AudioMixer(channels=4)
+        with mixer.batch():
+            for _ in range(50):
+                mixer.play(self.sound)
+        self.assertEqual(mixer.played, 1)
+        self.assertEqual(mixer.mixed, 50)
+
+        samples = pygame.sndarray.array(mixer._mix([self.sound] * 50))
+        self.assertEqual(samples.shape, pygame.sndarray.array(self.sound).shape)
+        self.assertGreater(abs(int(samples.max())), 30000)
+        self.assertLessEqual(abs(int(samples.min())), 32767)
+
+        with mixer.batch():
+            mixer.play(self.sound)  # Kleine Gruppen werden nicht gemischt
+        self.assertEqual(mixer.played, 2)
+        self.assertEqual(mixer.mixed, 50)
+
+    def test_mixing_follows_the_sample_format(self):
+        loud = np.full((4, 2), 0.75, dtype=np.float32)
+        mixed = AudioMixer._mix_samples([(loud, 2)], np.float32)
+        self.assertEqual(mixed.dtype, np.float32)
+        self.assertAlmostEqual(float(mixed.max()), 1.0)  # Auf Vollausschlag begrenzt
+
+        quiet = np.array([[10.0, -10.0]], dtype=np.float32)  # Um die Stille herum
+        mixed = AudioMixer._mix_samples([(quiet, 3)], np.uint8)
+        self.assertEqual(mixed.tolist(), [[158, 98]])
+        with self.assertRaises(ValueError):
+            AudioMixer._mix_samples([(quiet, 1)], np.complex64)
+
+    def test_sample_cache_is_bounded(self):
+        mixer = AudioMixer(channels=4, sample_cache_size=2)
+        self.assertTrue(mixer.init())
+        array = pygame.sndarray.array(self.sound)
+        sounds = [pygame.sndarray.make_sound(array) for _ in range(3)]
+        for sound in sounds:
+            mixer._samples_of(sound)
+        self.assertEqual(list(mixer._samples), sounds[1:])
+        self.assertIsNotNone(mixer._mix(sounds * 2))
+
+    def test_pump_dispatches_in_one_batch(self):
+        root = Container()
+        keys = "abcdef"
+        for index, key in enumerate(keys):
+            root.add_object(Buzzer((60 * index, 0), trigger_key=key, sound=BUZZER_WAV))
+        mixed = audio_mixer.mixed
+        pump = InputPump()
+        now = time.perf_counter_ns()
+        pump.dispatch(root, [key_event(pygame.KEYDOWN, getattr(pygame, f"K_{key}"), now) for key in keys])
+        self.assertEqual(audio_mixer.mixed, mixed + len(keys))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,6 @@
+import logging
+import sys
+import time
 import pygame
 from Container import Container
 from Object import Object
@@ -5,47 +8,162 @@ from Circle import Circle
 from Text import Text
 from Rectangle import Rectangle
 from Buzzer import Buzzer
+from InputPump import InputPump, PygameInputSource
+from Instrumentation import instrumentation
+from Scene import load_scene
+from EventLog import EventRecorder
+from SharedScene import SceneBroadcaster
 
+# Das Mess-Overlay wird höchstens zweimal pro Sekunde und nur bei geänderten Werten neu gezeichnet
+OVERLAY_INTERVAL = 0.5
 
-def display_container_dyn(container):
+
+def display_container_dyn(container, dirty_rects: bool = False, idle: bool = False,
+                          idle_timeout: int = 1000, input_pump: InputPump = None,
+                          instrument: bool = False, instrument_dump: str = None,
+                          recorder: EventRecorder = None, broadcaster: SceneBroadcaster = None):
     """
     Displays all objects in the container, including nested containers, within a Pygame window.
 
     Args:
         container (Container): The container holding objects to display.
+        dirty_rects (bool): Only repaint the screen areas changed by the objects
+            and update just those areas instead of flipping the whole window.
+        idle (bool): Sleep until the next event or the next animation step while
+            nothing has changed instead of redrawing at a fixed 60 frames per second.
+        idle_timeout (int): Maximum sleep time in milliseconds in idle mode.
+        input_pump (InputPump): Delivers the input events with their capture time.
+            Defaults to a pump reading only the pygame event queue.
+        instrument (bool): Measure key-to-sound and key-to-frame latencies and
+            per-object draw times and show them in an on-screen overlay.
+        instrument_dump (str): JSON file the measurements are written to on exit.
+        recorder (EventRecorder): Records every handled press and release for a later
+            replay. Closed on exit.
+        broadcaster (SceneBroadcaster): Publishes the render state to renderer processes
+            (e.g. an audience screen) after every frame in which something changed.
+            If the scene outgrows its shared memory block, sharing stops with an error log.
     """
     # Initialize Pygame
     pygame.init()
     screen = pygame.display.set_mode(container.window_size, pygame.RESIZABLE)
     pygame.display.set_caption("Container Display")
     clock = pygame.time.Clock()
+    container.apply_layout(container.window_size)  # Bei VIDEORESIZE erneut über window_size
+    container.invalidate_all()  # Erstes Bild komplett zeichnen
+    if input_pump is None:
+        input_pump = InputPump([PygameInputSource()])
+    input_pump.start()
+    instrumentation.enabled = instrument
+    overlay = instrumentation.draw_overlay if instrument else None
+    overlay_area = pygame.Rect(0, 0, 0, 0)
+    overlay_lines = None
+    overlay_checked = 0.0
+    scheduler = container.scheduler
 
     # Main loop
     running = True
     while running:
+        frame_start = time.perf_counter()
+        # Laufende Animationen und Timer weiterschalten, sie markieren ihre Objekte selbst
+        scheduler.update()
         # Handle events
-        for event in pygame.event.get():
+        if idle and not container.has_dirty_rects():
+            wakeup = scheduler.next_wakeup()
+            timeout = idle_timeout / 1000 if wakeup is None else min(idle_timeout / 1000, wakeup)
+            if overlay is not None:
+                timeout = min(timeout, OVERLAY_INTERVAL)
+            events = input_pump.drain(timeout)
+        else:
+            events = input_pump.drain()
+        if recorder is not None:
+            recorder.record(events)
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
-            container.handle_key_press(event)
+            elif event.type == pygame.VIDEORESIZE:
+                container.window_size = event.size
+                container.invalidate_all()
+        input_pump.dispatch(container, events)
+        if broadcaster is not None and container.has_dirty_rects():
+            try:
+                broadcaster.publish()
+            except ValueError as error:
+                # Die Show läuft weiter, nur die anderen Bildschirme bleiben stehen
+                logging.error(f"Stopped sharing the scene: {error}")
+                broadcaster = None
+
+        if overlay is not None and time.perf_counter() - overlay_checked >= OVERLAY_INTERVAL:
+            overlay_checked = time.perf_counter()
+            lines = instrumentation.overlay_lines()
+            if lines != overlay_lines:
+                overlay_lines = lines
+                container.invalidate_rect(overlay_area)
+
+        if dirty_rects:
+            overlay_area = draw_dirty_rects(screen, container, overlay) or overlay_area
+        elif container.has_dirty_rects() or not idle:
+            container.collect_dirty_rects()  # Wird im Vollbild-Modus nicht benötigt
+
+            # Clear the screen
+            screen.fill(container.background_color)
+
+            # Draw the container
+            container.draw(screen)
+            if overlay is not None:
+                overlay_area = overlay(screen)
+
+            # Update the display
+            pygame.display.flip()
+        if instrument:
+            instrumentation.frame_presented()
+        # Den Rest des Bildes Eingaben abfragen statt zu schlafen, damit jeder
+        # Druck seinen eigenen Zeitstempel bekommt
+        input_pump.poll_for(1 / 60 - (time.perf_counter() - frame_start))
+        # Limit to 60 frames per second. Nach einer Ruhephase wartet tick nicht,
+        # ein Buzzer-Druck wird also sofort gezeichnet.
+        clock.tick(60)
 
-        # Clear the screen
-        screen.fill(container.background_color)
+    # Quit Pygame
+    input_pump.stop()
+    if recorder is not None:
+        recorder.close()
+    if instrument_dump is not None:
+        instrumentation.dump(instrument_dump)
+    instrumentation.enabled = False
+    pygame.quit()
 
-        # Draw the container
-        container.draw(screen)
 
-        # Update the display
-        pygame.display.flip()
-        clock.tick(60)  # Limit to 60 frames per second
+def draw_dirty_rects(screen, container, overlay=None):
+    """
+    Repaints only the screen areas the container reported as changed.
 
-    # Quit Pygame
-    pygame.quit()
+    Args:
+        screen (pygame.Surface): The display surface.
+        container (Container): The root container.
+        overlay: Optional function drawing on top of the scene and
+            returning the area it covered.
 
+    Returns:
+        pygame.Rect: The area covered by the overlay, or None.
+    """
+    rects = container.collect_dirty_rects()
+    if not rects:
+        return None
+    for rect in rects:
+        screen.set_clip(rect)  # Zeichnen wird auf den Bereich beschränkt
+        screen.fill(container.background_color, rect)
+        container.draw(screen)
+    screen.set_clip(None)
+    overlay_area = None
+    if overlay is not None:
+        overlay_area = overlay(screen)
+        rects.append(overlay_area)
+    pygame.display.update(rects)
+    return overlay_area
 
-if __name__ == "__main__":
-    import pygame
 
+def build_demo_container() -> Container:
+    """Builds the demo scene with nested containers, circles, texts and a buzzer."""
     # Create objects for the root container
     circle1 = Circle(position=pygame.Vector2(150, 150), radius=50, color=pygame.Color("red"))
     circle2 = Circle(position=pygame.Vector2(200, 200), radius=60, color=pygame.Color("green"))
@@ -83,6 +201,12 @@ if __name__ == "__main__":
     root_container.add_object(circle2)
     root_container.add_object(text1)
     root_container.add_object(nested_container1)
+    return root_container
+
 
-    # Display the container
-    display_container_dyn(root_container)
+if __name__ == "__main__":
+    # Display the container, optionally loaded from a scene file: python drawing.py show.json
+    if len(sys.argv) > 1:
+        display_container_dyn(load_scene(sys.argv[1]))
+    else:
+        display_container_dyn(build_demo_container())
@@ -0,0 +1,52 @@
+"""
+Measures the memory used per object of the shape classes.
+Run with: python measure_memory.py
+"""
+import os
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from Circle import Circle
+from Rectangle import Rectangle
+from Text import Text
+from Buzzer import Buzzer
+from ShapeGroup import ShapeGroup
+
+
+def bytes_per_object(factory, count: int = 10000) -> float:
+    """Returns the average number of bytes allocated per created object."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def packed_bytes_per_shape(kind: str, count: int = 10000) -> float:
+    """Returns the average number of bytes per shape stored in a ShapeGroup."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    group = ShapeGroup(kind=kind)
+    color = pygame.Color("red")
+    for i in range(count):
+        if kind == ShapeGroup.CIRCLE:
+            group.add_circle(pygame.Vector2(i, i), radius=5, color=color)
+        else:
+            group.add_rectangle(pygame.Vector2(i, i), size=(5, 5), color=color)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+if __name__ == "__main__":
+    print(f"Circle:             {bytes_per_object(lambda i: Circle(pygame.Vector2(i, i), radius=5)):7.1f} bytes")
+    print(f"Rectangle:          {bytes_per_object(lambda i: Rectangle(pygame.Vector2(i, i))):7.1f} bytes")
+    print(f"Text:               {bytes_per_object(lambda i: Text(pygame.Vector2(i, i))):7.1f} bytes")
+    print(f"Buzzer:             {bytes_per_object(lambda i: Buzzer(pygame.Vector2(i, i), sound='')):7.1f} bytes")
+    print(f"ShapeGroup circle:  {packed_bytes_per_shape(ShapeGroup.CIRCLE):7.1f} bytes")
+    print(f"ShapeGroup rect:    {packed_bytes_per_shape(ShapeGroup.RECTANGLE):7.1f} bytes")
@@ -1,10 +1,38 @@
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
 import unittest
+from unittest import mock
+
+# Tests laufen ohne Fenster und ohne Soundkarte
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
 import pygame
 
 from Object import Object
 from Circle import Circle
 from Text import Text
 from Container import Container
+from Buzzer import Buzzer
+from SoundBank import SoundBank, sound_bank
+from FontCache import FontCache
+from Rectangle import Rectangle
+from ShapeGroup import ShapeGroup
+from ShapeBatch import ShapeBatch
+from SpatialGrid import SpatialGrid
+from Scene import Scene, SceneError
+from SharedScene import SceneBroadcaster, SceneView
+from Scheduler import Scheduler, Task
+from Layout import AnchorLayout, GridLayout, Layout
+from drawing import draw_dirty_rects
+import benchmark
+
+BUZZER_WAV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "buzzer.wav")
 
 class TestObject(unittest.TestCase):
     def test_object_initialization(self):
@@ -83,6 +111,47 @@ class TestText(unittest.TestCase):
         with self.assertRaises(TypeError):
             text.color = "yellow"  # Invalid color type
 
+    def test_fontsize_setter(self):
+        text = Text(pygame.Vector2(10, 10))
+        text.fontsize = 20
+        self.assertEqual(text.fontsize, 20)
+        self.assertEqual(text.text, "no text")
+
+    def test_render_is_cached(self):
+        text = Text(pygame.Vector2(10, 10), text="Score")
+        surface = text.render()
+        self.assertIs(text.render(), surface)
+
+        text.color = pygame.Color("red")
+        red_surface = text.render()
+        self.assertIsNot(red_surface, surface)
+        text.fontsize = 50
+        self.assertGreater(text.render().get_height(), red_surface.get_height())
+
+
+class TestFontCache(unittest.TestCase):
+    def test_font_is_shared(self):
+        cache = FontCache()
+        self.assertIs(cache.get_font(36), cache.get_font(36))
+
+    def test_surfaces_are_bounded(self):
+        cache = FontCache(max_surfaces=2)
+        first = cache.render("a", pygame.Color("white"), 36)
+        cache.render("b", pygame.Color("white"), 36)
+        self.assertIs(cache.render("a", pygame.Color("white"), 36), first)
+        cache.render("c", pygame.Color("white"), 36)  # verdrängt "b"
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.render("a", pygame.Color("white"), 36), first)
+
+    def test_fonts_are_bounded(self):
+        cache = FontCache(max_fonts=2)
+        first = cache.get_font(10)
+        cache.get_font(11)
+        self.assertIs(cache.get_font(10), first)
+        cache.get_font(12)  # verdrängt 11
+        self.assertEqual(len(cache._fonts), 2)
+        self.assertIs(cache.get_font(10), first)
+
 
 class TestContainer(unittest.TestCase):
     def test_add_object(self):
@@ -122,6 +191,941 @@ class TestContainer(unittest.TestCase):
         with self.assertRaises(TypeError):
             container.add_object("Not an Object")  # Adding a non-Object raises an error
 
+    def test_key_dispatch_nested(self):
+        root = Container()
+        nested = Container()
+        buzzer = Buzzer((0, 0), trigger_key='a', sound=BUZZER_WAV)
+        nested.add_object(buzzer)
+        root.add_object(nested)
+
+        root.handle_key_press(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a))
+        self.assertEqual(buzzer.in_color, buzzer.in_color_active)
+        root.handle_key_press(pygame.event.Event(pygame.KEYUP, key=pygame.K_a))
+        self.assertEqual(buzzer.in_color, buzzer.in_color_inactive)
+
+        root.handle_key_press(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_b))
+        self.assertEqual(buzzer.in_color, buzzer.in_color_inactive)
+
+    def test_key_dispatch_follows_trigger_key(self):
+        root = Container()
+        buzzer = Buzzer((0, 0), trigger_key='a', sound=BUZZER_WAV)
+        root.add_object(buzzer)
+        buzzer.trigger_key = 'b'
+
+        root.handle_key_press(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a))
+        self.assertEqual(buzzer.in_color, buzzer.in_color_inactive)
+        root.handle_key_press(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_b))
+        self.assertEqual(buzzer.in_color, buzzer.in_color_active)
+
+    def test_key_dispatch_after_remove(self):
+        root = Container()
+        nested = Container()
+        buzzer = Buzzer((0, 0), trigger_key='a', sound=BUZZER_WAV)
+        root.add_object(nested)
+        nested.add_object(buzzer)  # Hinzufügen nach dem Verschachteln
+        self.assertIn((pygame.KEYDOWN, pygame.K_a), root._bindings)
+
+        nested.remove_object(buzzer)
+        self.assertEqual(root._bindings, {})
+        self.assertIsNone(buzzer.parent)
+
+
+class TestDirtyRects(unittest.TestCase):
+    def test_setter_marks_old_and_new_area(self):
+        root = Container()
+        nested = Container()
+        root.add_object(nested)
+        circle = Circle(pygame.Vector2(50, 50), radius=10)
+        nested.add_object(circle)
+        root.collect_dirty_rects()
+
+        circle.position = pygame.Vector2(300, 300)
+        rects = root.collect_dirty_rects()
+        self.assertEqual(len(rects), 2)
+        self.assertTrue(any(rect.collidepoint(50, 50) for rect in rects))
+        self.assertTrue(any(rect.collidepoint(300, 300) for rect in rects))
+        self.assertEqual(root.collect_dirty_rects(), [])
+
+    def test_overlapping_rects_are_merged(self):
+        root = Container()
+        rectangle = Rectangle(pygame.Vector2(10, 10), size=(20, 20))
+        root.add_object(rectangle)
+        root.collect_dirty_rects()
+
+        rectangle.color = pygame.Color("red")
+        rectangle.size = (40, 40)
+        self.assertEqual(root.collect_dirty_rects(), [pygame.Rect(10, 10, 40, 40)])
+
+    def test_background_color_repaints_container(self):
+        root = Container(window_size=(200, 200))
+        nested = Container(position=pygame.Vector2(20, 30), window_size=(50, 40))
+        root.add_object(nested)
+        root.collect_dirty_rects()
+
+        nested.background_color = pygame.Color("red")
+        self.assertFalse(root.has_dirty_rects())  # Verschachtelte Hintergründe werden nicht gezeichnet
+        root.background_color = pygame.Color("blue")
+        self.assertEqual(root.collect_dirty_rects(), [pygame.Rect(0, 0, 200, 200)])
+
+    def test_buzzer_press_repaints_only_buzzer(self):
+        root = Container(window_size=(200, 200))
+        buzzer = Buzzer((100, 100), trigger_key='a', sound=BUZZER_WAV)
+        root.add_object(buzzer)
+        screen = pygame.display.set_mode(root.window_size)
+        draw_dirty_rects(screen, root)
+
+        root.handle_key_press(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a))
+        self.assertEqual(root.collect_dirty_rects(), [pygame.Rect(100, 100, 50, 50)])
+        buzzer.in_color = pygame.Color("blue")
+        draw_dirty_rects(screen, root)
+        self.assertEqual(screen.get_at((125, 125)), pygame.Color("blue"))
+        self.assertFalse(root.has_dirty_rects())
+
+
+class TestBuzzerSprite(unittest.TestCase):
+    def test_states_share_cached_sprites(self):
+        buzzer = Buzzer((0, 0), trigger_key='a', sound=BUZZER_WAV)
+        screen = pygame.Surface((100, 100))
+        buzzer.draw(screen)
+        inactive = buzzer._sprite
+
+        buzzer.handle_key_press(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a))
+        buzzer.draw(screen)
+        self.assertIsNot(buzzer._sprite, inactive)
+        self.assertEqual(screen.get_at((25, 25)), buzzer.in_color_active)
+
+        buzzer.handle_key_press(pygame.event.Event(pygame.KEYUP, key=pygame.K_a))
+        buzzer.draw(screen)
+        self.assertIs(buzzer._sprite, inactive)
+
+    def test_size_change_rebuilds_sprite(self):
+        buzzer = Buzzer((0, 0), sound=BUZZER_WAV)
+        screen = pygame.Surface((100, 100))
+        buzzer.draw(screen)
+        buzzer.size = (80, 80)
+        self.assertIsNone(buzzer._sprite)
+        buzzer.draw(screen)
+        self.assertEqual(buzzer._sprite.get_size(), (80, 80))
+
+
+class TestShapeGroup(unittest.TestCase):
+    def test_objects_have_no_dict(self):
+        for obj in (Object(pygame.Vector2(0, 0)), Circle(pygame.Vector2(0, 0)),
+                    Text(pygame.Vector2(0, 0)), Buzzer((0, 0), sound=BUZZER_WAV), Container()):
+            self.assertFalse(hasattr(obj, "__dict__"), type(obj).__name__)
+
+    def test_view_properties_and_validation(self):
+        group = ShapeGroup(kind=ShapeGroup.CIRCLE)
+        view = group.add_circle(pygame.Vector2(5, 6), radius=3, color=pygame.Color("red"))
+        self.assertEqual(len(group), 1)
+        self.assertEqual(view.position, pygame.Vector2(5, 6))
+        self.assertEqual(view.color, pygame.Color("red"))
+
+        group[0].radius = 7
+        self.assertEqual(view.radius, 7)
+        with self.assertRaises(ValueError):
+            view.radius = -1
+        with self.assertRaises(TypeError):
+            view.color = "red"
+        with self.assertRaises(TypeError):
+            group.add_circle((1, 2))
+        self.assertEqual(len(group), 1)  # Ungültiges Element wurde nicht angelegt
+        with self.assertRaises(TypeError):
+            group.add_rectangle(pygame.Vector2(0, 0))
+
+    def test_draw_and_dirty_rects(self):
+        root = Container()
+        group = ShapeGroup(kind=ShapeGroup.RECTANGLE, border_width=0)
+        root.add_object(group)
+        view = group.add_rectangle(pygame.Vector2(10, 10), size=(5, 5), color=pygame.Color("blue"))
+        root.collect_dirty_rects()
+
+        view.position = pygame.Vector2(20, 20)
+        self.assertEqual(root.collect_dirty_rects(),
+                         [pygame.Rect(10, 10, 5, 5), pygame.Rect(20, 20, 5, 5)])
+        screen = pygame.Surface((50, 50))
+        group.draw(screen)
+        self.assertEqual(screen.get_at((22, 22)), pygame.Color("blue"))
+
+    def test_bounding_rect_is_cached(self):
+        root = Container()
+        group = ShapeGroup(kind=ShapeGroup.RECTANGLE)
+        root.add_object(group)
+        group.add_rectangle(pygame.Vector2(0, 0), size=(5, 5))
+        view = group.add_rectangle(pygame.Vector2(10, 10), size=(5, 5))
+        bounds = group.bounding_rect()
+        self.assertEqual(bounds, pygame.Rect(0, 0, 15, 15))
+        self.assertIs(group.bounding_rect(), bounds)  # Nicht neu berechnet
+
+        view.size = (10, 5)
+        self.assertEqual(group.bounding_rect(), pygame.Rect(0, 0, 20, 15))
+        group.position = pygame.Vector2(5, 5)
+        self.assertEqual(group.bounding_rect(), pygame.Rect(5, 5, 20, 15))
+        group.add_rectangle(pygame.Vector2(30, 0), size=(1, 1))
+        self.assertEqual(group.bounding_rect(), pygame.Rect(5, 5, 31, 15))
+        group.clear()
+        self.assertEqual(group.bounding_rect(), pygame.Rect(5, 5, 0, 0))
+
+
+class TestShapeBatch(unittest.TestCase):
+    def test_add_update_and_stamps(self):
+        batch = ShapeBatch(kind=ShapeBatch.CIRCLE)
+        batch.add([[10, 10], [20, 20], [30, 30]], [2, 2, 3],
+                  [[255, 0, 0], [255, 0, 0], [0, 0, 255]],
+                  velocities=[[60, 0], [0, 60], [0, 0]])
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(len(batch._stamps), 2)  # Gleiche Größe und Farbe teilen sich ein Bild
+
+        batch.update(0.5)
+        self.assertEqual(batch.positions.tolist(), [[40, 10], [20, 50], [30, 30]])
+
+        batch.keep(batch.positions[:, 0] < 35)
+        self.assertEqual(len(batch), 2)
+
+    def test_unused_stamps_are_pruned(self):
+        batch = ShapeBatch(kind=ShapeBatch.RECTANGLE)
+        colors = [[index, 0, 255 - index] for index in range(50)]
+        batch.add([[index, 0] for index in range(50)], [[2, 2]] * 50, colors)
+        self.assertEqual(len(batch._stamps), 50)
+
+        batch.keep(batch.positions[:, 0] >= 45)
+        self.assertEqual(len(batch._stamps), 5)  # Nur noch die Bilder der verbliebenen Formen
+        self.assertEqual(len(batch._stamp_keys), 5)
+        screen = pygame.Surface((60, 10))
+        batch.draw(screen)
+        self.assertEqual(screen.get_at((47, 1)), pygame.Color(47, 0, 208))
+
+        batch.add([[0, 5]], [[2, 2]], [[47, 0, 208]])
+        self.assertEqual(len(batch._stamps), 5)  # Vorhandenes Bild wiederverwendet
+        batch.clear()
+        self.assertEqual(batch._stamps, [])
+        self.assertEqual(batch._stamp_keys, {})
+
+    def test_draw_and_bounds(self):
+        root = Container()
+        batch = ShapeBatch(kind=ShapeBatch.RECTANGLE)
+        root.add_object(batch)
+        batch.add([[5, 5], [40, 20]], [[4, 4], [6, 2]], [[0, 255, 0], [0, 255, 0]])
+        self.assertEqual(batch.bounding_rect(), pygame.Rect(5, 5, 41, 17))
+        self.assertTrue(root.has_dirty_rects())
+
+        screen = pygame.Surface((60, 60))
+        batch.draw(screen)
+        self.assertEqual(screen.get_at((6, 6)), pygame.Color("green"))
+        self.assertEqual(screen.get_at((41, 21)), pygame.Color("green"))
+
+    def test_invalid_input(self):
+        batch = ShapeBatch()
+        with self.assertRaises(ValueError):
+            batch.add([[0, 0]], [-1], [[0, 0, 0]])
+        with self.assertRaises(ValueError):
+            batch.add([[0, 0], [1, 1]], [1], [[0, 0, 0]])
+
+
+class TestHitTesting(unittest.TestCase):
+    def test_grid_query(self):
+        grid = SpatialGrid(cell_size=10)
+        grid.insert("a", pygame.Rect(0, 0, 25, 5))
+        grid.insert("b", pygame.Rect(20, 0, 5, 5))
+        self.assertEqual(grid.query_point(22, 2), ["a", "b"])
+        grid.insert("a", pygame.Rect(100, 100, 5, 5))  # Verschieben
+        self.assertEqual(grid.query_point(22, 2), ["b"])
+        grid.remove("b")
+        self.assertEqual(grid.query_point(22, 2), [])
+
+    def test_click_hits_top_most_buzzer(self):
+        root = Container()
+        nested = Container()
+        lower = Buzzer((0, 0), sound=BUZZER_WAV)
+        upper = Buzzer((25, 25), sound=BUZZER_WAV)
+        nested.add_object(upper)
+        root.add_object(lower)
+        root.add_object(nested)
+
+        root.handle_key_press(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(30, 30)))
+        self.assertEqual(upper.in_color, upper.in_color_active)
+        self.assertEqual(lower.in_color, lower.in_color_inactive)
+        root.handle_key_press(pygame.event.Event(pygame.MOUSEBUTTONUP, button=1, pos=(200, 200)))
+        self.assertEqual(upper.in_color, upper.in_color_inactive)
+
+    def test_index_follows_position_and_visibility(self):
+        root = Container()
+        buzzer = Buzzer((0, 0), sound=BUZZER_WAV)
+        root.add_object(buzzer)
+        buzzer.position = pygame.Vector2(300, 300)
+        self.assertIsNone(root.hit_test(10, 10))
+        self.assertIs(root.hit_test(310, 310), buzzer)
+        buzzer.visible = False
+        self.assertIsNone(root.hit_test(310, 310))
+
+    def test_finger_press(self):
+        root = Container(window_size=(100, 100))
+        buzzer = Buzzer((50, 50), sound=BUZZER_WAV)
+        root.add_object(buzzer)
+        root.handle_key_press(pygame.event.Event(pygame.FINGERDOWN, touch_id=1, finger_id=0, x=0.6, y=0.6))
+        self.assertEqual(buzzer.in_color, buzzer.in_color_active)
+        root.handle_key_press(pygame.event.Event(pygame.FINGERUP, touch_id=1, finger_id=0, x=0.6, y=0.6))
+        self.assertEqual(buzzer.in_color, buzzer.in_color_inactive)
+
+
+class CountingCircle(Circle):
+    __slots__ = ("draw_count",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.draw_count = 0
+
+    def draw(self, screen):
+        self.draw_count += 1
+        super().draw(screen)
+
+
+class TestCulling(unittest.TestCase):
+    def test_subtree_bounds_are_cached_and_updated(self):
+        root = Container()
+        nested = Container()
+        circle = Circle(pygame.Vector2(50, 50), radius=10)
+        nested.add_object(circle)
+        root.add_object(nested)
+        self.assertEqual(root.bounding_rect(), pygame.Rect(40, 40, 21, 21))
+        self.assertIs(root.bounding_rect(), root.bounding_rect())
+
+        circle.position = pygame.Vector2(100, 50)
+        self.assertEqual(root.bounding_rect(), pygame.Rect(90, 40, 21, 21))
+        nested.add_object(Rectangle(pygame.Vector2(0, 0), size=(5, 5)))
+        self.assertEqual(root.bounding_rect(), pygame.Rect(0, 0, 111, 61))
+
+    def test_off_screen_and_invisible_objects_are_skipped(self):
+        root = Container()
+        nested = Container()
+        inside = CountingCircle(pygame.Vector2(50, 50), radius=10)
+        outside = CountingCircle(pygame.Vector2(50, 900), radius=10)
+        hidden = CountingCircle(pygame.Vector2(60, 60), radius=10, visible=False)
+        nested.add_object(outside)
+        root.add_object(inside)
+        root.add_object(hidden)
+        root.add_object(nested)
+
+        root.draw(pygame.Surface((800, 800)))
+        self.assertEqual((inside.draw_count, outside.draw_count, hidden.draw_count), (1, 0, 0))
+
+        screen = pygame.Surface((800, 800))
+        screen.set_clip(pygame.Rect(0, 0, 20, 20))
+        root.draw(screen)
+        self.assertEqual(inside.draw_count, 1)
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_small_run(self):
+        results = benchmark.run({"buzzers": lambda: benchmark.build_buzzers(10),
+                                 "nested": lambda: benchmark.build_nested(3)}, frames=5)
+        self.assertGreater(results["buzzers"]["fps"], 0)
+        self.assertIn("event_us", results["nested"])
+        events = results["buzzers"]
+        self.assertLessEqual(events["event_p50_us"], events["event_p99_us"])
+        self.assertGreaterEqual(events["event_alloc_bytes"], 0)
+
+    def test_regression_detection(self):
+        baseline = {"scene": {"p50_ms": 1.0, "event_us": 10.0}}
+        self.assertEqual(benchmark.compare({"scene": {"p50_ms": 1.2, "event_us": 10.0}}, baseline, 0.25), [])
+        self.assertEqual(len(benchmark.compare({"scene": {"p50_ms": 1.3, "event_us": 20.0}}, baseline, 0.25)), 2)
+
+    def test_scene_missing_from_baseline_fails(self):
+        baseline = {"scene": {"p50_ms": 1.0}}
+        regressions = benchmark.compare({"scene": {"p50_ms": 1.0, "event_us": 10.0},
+                                         "renamed": {"p50_ms": 1.0, "event_us": 10.0}}, baseline, 0.25)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(any(message.startswith("renamed:") for message in regressions))
+
+    def test_missing_baseline_fails(self):
+        missing = os.path.join(tempfile.mkdtemp(), "baseline.json")
+        with mock.patch.object(sys, "argv", ["benchmark.py", "--baseline", missing]):
+            self.assertEqual(benchmark.main(), 2)
+
+
+class TestSoundBank(unittest.TestCase):
+    def test_sound_is_decoded_once(self):
+        bank = SoundBank(buffer=256)
+        first = bank.load(BUZZER_WAV)
+        second = bank.load(BUZZER_WAV)
+        self.assertIsNotNone(first)
+        self.assertIs(first, second)
+        self.assertEqual(len(bank), 1)
+
+    def test_missing_file_is_cached(self):
+        bank = SoundBank()
+        with self.assertLogs(level="WARNING"):
+            self.assertIsNone(bank.load("does_not_exist.wav"))
+        self.assertIn("does_not_exist.wav", bank)
+
+    def test_buzzers_share_sound(self):
+        buzzer1 = Buzzer((0, 0), sound=BUZZER_WAV)
+        buzzer2 = Buzzer((60, 0), sound=BUZZER_WAV)
+        self.assertIs(buzzer1._loaded_sound, buzzer2._loaded_sound)
+        self.assertIs(buzzer1._loaded_sound, sound_bank.load(BUZZER_WAV))
+
+
+class TestScene(unittest.TestCase):
+    DEMO_SCENE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "demo_scene.json")
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as file:
+            file.write(content if isinstance(content, str) else json.dumps(content))
+        return path
+
+    def test_demo_scene(self):
+        scene = Scene.load(self.DEMO_SCENE, use_cache=False)
+        self.assertEqual(scene.count_objects(), 11)
+        self.assertIsNone(scene._root)  # Baum wird erst bei Bedarf gebaut
+        root = scene.root
+        self.assertEqual(len(root), 4)
+        buzzer = root.get_objects()[3].get_objects()[2]
+        self.assertIsInstance(buzzer, Buzzer)
+        self.assertEqual(os.path.normpath(buzzer.sound), os.path.normpath(os.path.abspath(BUZZER_WAV)))
+        self.assertEqual(root.get_objects()[0].color, pygame.Color("red"))
+        self.assertEqual(len(root._bindings[(pygame.KEYDOWN, pygame.K_1)]), 9)
+
+    def test_default_sound_is_next_to_scene(self):
+        shutil.copy(BUZZER_WAV, os.path.join(self.directory, Scene.DEFAULT_SOUND))
+        scene = Scene.load(self.write("show.json", {"objects": [{"type": "buzzer", "trigger_key": "a"}]}))
+        expected = os.path.join(self.directory, Scene.DEFAULT_SOUND)
+        self.assertEqual(scene.assets()[0], {expected})
+        self.assertEqual(scene.root.get_objects()[0].sound, expected)
+
+    def test_cache_skips_parsing(self):
+        path = self.write("show.json", {"objects": [
+            {"type": "buzzer", "position": [10, 10], "trigger_key": "a", "sound": os.path.abspath(BUZZER_WAV),
+             "in_color": [0, 0, 255]}]})
+        Scene.load(path)
+        self.assertTrue(os.path.exists(path + Scene.CACHE_SUFFIX))
+
+        original = Scene._parse
+        Scene._parse = staticmethod(lambda path: self.fail("cache was not used"))
+        try:
+            scene = Scene.load(path)
+        finally:
+            Scene._parse = original
+        buzzer = scene.root.get_objects()[0]
+        self.assertEqual(buzzer.trigger_key, "a")
+        self.assertEqual(buzzer.in_color, pygame.Color(0, 0, 255))
+        self.assertIsNotNone(buzzer._loaded_sound)
+
+        # Geänderte Datei macht den Cache ungültig
+        self.write("show.json", {"objects": []})
+        os.utime(path, ns=(0, 0))
+        self.assertEqual(Scene.load(path).count_objects(), 0)
+
+    def test_moved_show_does_not_use_old_paths(self):
+        show = os.path.join(self.directory, "show")
+        os.mkdir(show)
+        shutil.copy(BUZZER_WAV, os.path.join(show, "buzz.wav"))
+        path = os.path.join(show, "show.json")
+        with open(path, "w") as file:
+            json.dump({"objects": [{"type": "buzzer", "trigger_key": "a", "sound": "buzz.wav"}]}, file)
+        Scene.load(path)
+        self.assertTrue(os.path.exists(path + Scene.CACHE_SUFFIX))
+
+        # Verschieben behält Änderungszeit und Größe, der Cache zeigt aber auf das alte Verzeichnis
+        moved = os.path.join(self.directory, "moved")
+        os.rename(show, moved)
+        scene = Scene.load(os.path.join(moved, "show.json"))
+        self.assertEqual(scene.root.get_objects()[0].sound, os.path.join(moved, "buzz.wav"))
+        self.assertEqual(scene.assets()[0], {os.path.join(moved, "buzz.wav")})
+
+    def test_toml_scene(self):
+        path = self.write("show.toml", 'window_size = [640, 480]\n'
+                                       '[[objects]]\ntype = "circle"\nposition = [5, 5]\nradius = 3\n')
+        scene = Scene.load(path, use_cache=False)
+        self.assertEqual(scene.window_size, (640, 480))
+        self.assertEqual(scene.root.get_objects()[0].radius, 3)
+
+    def test_validation_errors(self):
+        invalid = [
+            {"objects": [{"type": "triangle"}]},
+            {"objects": [{"type": "circle", "radius": -1}]},
+            {"objects": [{"type": "circle", "colour": "red"}]},
+            {"objects": [{"type": "container", "objects": [{"type": "buzzer", "trigger_key": "nope"}]}]},
+            {"objects": [{"type": "text", "color": "no such color"}]},
+            {"window_size": [0, 10]},
+        ]
+        for description in invalid:
+            with self.assertRaises(SceneError):
+                Scene.compile(description)
+        with self.assertRaisesRegex(SceneError, r"objects\[0\]\.objects\[0\]\.trigger_key"):
+            Scene.compile(invalid[3])
+        with self.assertRaises(SceneError):
+            Scene.load(self.write("broken.json", "{"))
+
+    def test_large_show_opens_fast(self):
+        objects = [{"type": "container", "objects": [
+            {"type": "circle", "position": [i, i], "radius": 10, "color": "red"},
+            {"type": "text", "position": [i, i], "text": f"Player {i}"},
+            {"type": "rectangle", "position": [i, i], "size": [20, 10]},
+            {"type": "buzzer", "position": [i, i], "trigger_key": "a", "sound": os.path.abspath(BUZZER_WAV)},
+        ]} for i in range(100)]
+        path = self.write("large.json", {"objects": objects})
+        Scene.load(path)
+        start = time.perf_counter()
+        scene = Scene.load(path)
+        root = scene.root
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(scene.count_objects(), 500)
+        self.assertEqual(len(root._bindings[(pygame.KEYDOWN, pygame.K_a)]), 100)
+
+
+class TestTransforms(unittest.TestCase):
+    def build_panel(self, count=200):
+        root = Container(window_size=(800, 600))
+        panel = Container(position=pygame.Vector2(100, 50))
+        inner = Container(position=pygame.Vector2(10, 10))
+        buzzers = [Buzzer(pygame.Vector2(60 * (i % 10), 60 * (i // 10)), trigger_key='a', sound=BUZZER_WAV)
+                   for i in range(count)]
+        for buzzer in buzzers:
+            inner.add_object(buzzer)
+        panel.add_object(inner)
+        root.add_object(panel)
+        return root, panel, inner, buzzers
+
+    def test_children_are_offset_by_containers(self):
+        root, panel, inner, buzzers = self.build_panel(2)
+        self.assertEqual(buzzers[1].position, pygame.Vector2(60, 0))
+        self.assertEqual(buzzers[1].world_position, pygame.Vector2(170, 60))
+        self.assertEqual(buzzers[1].bounding_rect(), pygame.Rect(170, 60, 50, 50))
+        self.assertEqual(panel.bounding_rect(), pygame.Rect(110, 60, 110, 50))
+
+        screen = pygame.Surface((800, 600))
+        screen.fill(pygame.Color("white"))
+        root.draw(screen)
+        self.assertEqual(screen.get_at((195, 85)), buzzers[1].in_color)
+        self.assertEqual(screen.get_at((85, 25)), pygame.Color("white"))
+
+    def test_moving_a_panel(self):
+        root, panel, inner, buzzers = self.build_panel()
+        root.collect_dirty_rects()
+        old_area = panel.bounding_rect()
+        self.assertIs(root.hit_test(115, 65), buzzers[0])
+
+        panel.position = pygame.Vector2(300, 50)  # Eine Zuweisung statt 200
+        self.assertEqual(buzzers[0].world_position, pygame.Vector2(310, 60))
+        self.assertEqual(buzzers[-1].world_position, pygame.Vector2(310 + 540, 60 + 19 * 60))
+        self.assertEqual(buzzers[-1].position, pygame.Vector2(540, 1140))
+
+        new_area = panel.bounding_rect()
+        self.assertEqual(new_area, old_area.move(200, 0))
+        dirty = root.collect_dirty_rects()
+        self.assertTrue(any(rect.contains(old_area) for rect in dirty))
+        self.assertTrue(any(rect.contains(new_area) for rect in dirty))
+        self.assertIsNone(root.hit_test(115, 65))
+        self.assertIs(root.hit_test(315, 65), buzzers[0])
+        self.assertIs(inner.hit_test(315, 65), buzzers[0])
+
+        # Verschieben eines Kindes ändert nur dessen Cache
+        buzzers[0].world_position
+        buzzers[1].world_position
+        buzzers[1].position = pygame.Vector2(0, 600)
+        self.assertIsNotNone(buzzers[0]._world)
+        self.assertEqual(buzzers[1].world_position, pygame.Vector2(310, 660))
+
+    def test_reparenting_and_groups(self):
+        root, panel, inner, buzzers = self.build_panel(1)
+        root.add_object(buzzers[0])  # Jetzt direkt im obersten Container
+        self.assertEqual(buzzers[0].world_position, pygame.Vector2(0, 0))
+        self.assertNotIn(buzzers[0], inner.get_objects())
+        root.remove_object(buzzers[0])
+        self.assertEqual(buzzers[0].world_position, pygame.Vector2(0, 0))
+
+        group = ShapeGroup(kind=ShapeGroup.RECTANGLE)
+        group.add_rectangle(pygame.Vector2(5, 5), size=(10, 10))
+        panel.add_object(group)
+        self.assertEqual(group.shape_rect(0), pygame.Rect(105, 55, 10, 10))
+        panel.position = pygame.Vector2(0, 0)
+        self.assertEqual(group.bounding_rect(), pygame.Rect(5, 5, 10, 10))
+
+
+def render_shared_scene(name, size, frames, results):
+    """Renderer process of TestSharedScene: reports the color at the buzzer center per frame."""
+    view = SceneView(name)
+    screen = pygame.Surface(size)
+    overlays = []
+    seen = 0
+    deadline = time.perf_counter() + 10.0
+    while seen < frames and time.perf_counter() < deadline:
+        snapshot = view.read()
+        if snapshot is None:
+            time.sleep(0.001)
+            continue
+        view.draw(screen, overlay=lambda screen, snapshot: overlays.append(snapshot.frame))
+        seen += 1
+        results.put((snapshot.frame, len(snapshot.objects), tuple(screen.get_at((size[0] // 2, size[1] // 2))),
+                     overlays[-1]))
+    view.close()
+
+
+class TestSharedScene(unittest.TestCase):
+    def build(self):
+        root = Container(window_size=(100, 100), background_color=pygame.Color("white"))
+        buzzer = Buzzer(pygame.Vector2(25, 25), trigger_key='a', sound=BUZZER_WAV)
+        root.add_object(buzzer)
+        nested = Container()
+        nested.add_object(Text(pygame.Vector2(0, 0), text="Host", color=pygame.Color("black"), fontsize=12))
+        nested.add_object(Circle(pygame.Vector2(90, 90), radius=5, visible=False))
+        root.add_object(nested)
+        return root, buzzer
+
+    def test_view_draws_at_own_resolution(self):
+        root, buzzer = self.build()
+        broadcaster = SceneBroadcaster(root, max_objects=8, text_bytes=64)
+        try:
+            view = SceneView(broadcaster.name)
+            self.assertIsNone(view.read())  # Noch nichts veröffentlicht
+            broadcaster.publish()
+            snapshot = view.read()
+            self.assertEqual(snapshot.frame, 1)
+            self.assertEqual(snapshot.window_size, (100, 100))
+            self.assertEqual([obj[-1] for obj in snapshot.objects], ["", "Host"])  # Unsichtbares fehlt
+            self.assertIsNone(view.read())  # Unverändert
+
+            screen = pygame.Surface((400, 200))
+            view.draw(screen)
+            # Seitenverhältnis bleibt erhalten: Maßstab 2, links und rechts 100 Pixel Rand
+            self.assertEqual(screen.get_at((200, 100)), buzzer.in_color)
+            self.assertEqual(screen.get_at((152, 52)), buzzer.out_color)
+            self.assertEqual(screen.get_at((98, 100)), pygame.Color("white"))
+            view.close()
+
+            for i in range(10):
+                root.add_object(Text(pygame.Vector2(0, 0), text=f"Player {i}"))
+            with self.assertRaises(ValueError):
+                broadcaster.publish()
+        finally:
+            broadcaster.close()
+
+    def test_only_changed_records_are_published(self):
+        root, buzzer = self.build()
+        circles = [Circle(pygame.Vector2(i, 50), radius=2) for i in range(50)]
+        for circle in circles:
+            root.add_object(circle)
+        root.add_object(ShapeGroup())  # Nicht Teil der geteilten Szene
+        broadcaster = SceneBroadcaster(root)
+        try:
+            view = SceneView(broadcaster.name)
+            self.assertEqual(broadcaster.publish(), 52)
+            self.assertEqual(broadcaster.publish(), 0)
+            circles[7].color = pygame.Color("blue")
+            root.get_objects()[1].get_objects()[0].text = "Quizmaster"
+            self.assertEqual(broadcaster.publish(), 2)
+            snapshot = view.read()
+            self.assertEqual(len(snapshot.objects), 52)
+            self.assertEqual(snapshot.objects[1][-1], "Quizmaster")
+            self.assertEqual(snapshot.objects[2 + 7][5], pygame.Color("blue"))
+
+            circles[0].visible = False  # Neue Reihenfolge: alles neu
+            self.assertEqual(broadcaster.publish(), 51)
+            self.assertEqual(len(view.read().objects), 51)
+            view.close()
+        finally:
+            broadcaster.close()
+
+    def test_renderer_processes(self):
+        root, buzzer = self.build()
+        broadcaster = SceneBroadcaster(root)
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        renderers = [context.Process(target=render_shared_scene, args=(broadcaster.name, size, 2, results))
+                     for size in ((200, 200), (64, 64))]
+        try:
+            broadcaster.publish()
+            for renderer in renderers:
+                renderer.start()
+            first = [results.get(timeout=10) for _ in renderers]
+            buzzer.handle_key_press(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, timestamp=0))
+            broadcaster.publish()
+            second = [results.get(timeout=10) for _ in renderers]
+            for renderer in renderers:
+                renderer.join(timeout=10)
+                self.assertEqual(renderer.exitcode, 0)
+        finally:
+            broadcaster.close()
+        self.assertEqual({result[:3] for result in first}, {(1, 2, tuple(buzzer.in_color_inactive))})
+        self.assertEqual({result[:3] for result in second}, {(2, 2, tuple(buzzer.in_color_active))})
+        self.assertEqual([result[3] for result in second], [2, 2])
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.scheduler = Scheduler(clock=lambda: self.now)
+
+    def advance(self, seconds):
+        self.now += seconds
+        return self.scheduler.update()
+
+    def test_shared_by_the_tree(self):
+        root = Container()
+        nested = Container()
+        root.add_object(nested)
+        self.assertIs(nested.scheduler, root.scheduler)
+        self.assertIsNone(root.scheduler.next_wakeup())
+
+    def test_tween_marks_only_the_animated_object(self):
+        root = Container(window_size=(400, 400))
+        moving = Circle(pygame.Vector2(50, 50), radius=10)
+        still = Circle(pygame.Vector2(300, 300), radius=10)
+        root.add_object(moving)
+        root.add_object(still)
+        root.collect_dirty_rects()
+
+        done = []
+        self.scheduler.tween(moving, "position", pygame.Vector2(150, 50), 1.0, on_done=lambda: done.append(1))
+        self.assertEqual(self.scheduler.next_wakeup(), 0.0)
+        self.assertEqual(self.advance(0.0), 1)
+        self.advance(0.5)
+        self.assertEqual(moving.position, pygame.Vector2(100, 50))
+        dirty = root.collect_dirty_rects()
+        self.assertTrue(dirty)
+        self.assertFalse(any(rect.colliderect(still.bounding_rect()) for rect in dirty))
+        self.assertAlmostEqual(self.scheduler.next_wakeup(), 1 / 60)
+
+        self.advance(0.6)
+        self.assertEqual(moving.position, pygame.Vector2(150, 50))
+        self.assertEqual(done, [1])
+        self.assertIsNone(self.scheduler.next_wakeup())
+        self.assertEqual(self.advance(1.0), 0)
+
+    def test_pulse_and_cancel(self):
+        circle = Circle(pygame.Vector2(0, 0), radius=5, color=pygame.Color(0, 0, 0))
+        self.scheduler.pulse(circle, "color", pygame.Color(200, 0, 0), period=1.0)
+        self.advance(0.0)
+        self.advance(0.5)
+        self.assertEqual(circle.color, pygame.Color(200, 0, 0))
+        self.advance(0.5)
+        self.assertEqual(circle.color, pygame.Color(0, 0, 0))
+        self.scheduler.cancel(circle)
+        self.assertIsNone(self.scheduler.next_wakeup())
+
+    def test_timers_flash_and_countdown(self):
+        buzzer = Buzzer(pygame.Vector2(0, 0), trigger_key='a', sound=BUZZER_WAV)
+        original = buzzer.in_color
+        text = Text(pygame.Vector2(0, 0), text="")
+        finished = []
+        self.scheduler.flash(buzzer, "in_color", pygame.Color("gold"), times=1, interval=0.25)
+        self.scheduler.countdown(text, 3, on_done=lambda: finished.append(self.now))
+        self.assertEqual(text.text, "3")
+        self.assertAlmostEqual(self.scheduler.next_wakeup(), 0.25)
+
+        self.advance(0.25)
+        self.assertEqual(buzzer.in_color, pygame.Color("gold"))
+        self.advance(0.25)
+        self.assertEqual(buzzer.in_color, original)
+        self.assertAlmostEqual(self.scheduler.next_wakeup(), 0.5)
+        for _ in range(3):
+            self.advance(0.5)
+            self.advance(0.5)
+        self.assertEqual(text.text, "0")
+        self.assertEqual(finished, [3.0])
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_zero_countdown_and_timer(self):
+        text = Text(pygame.Vector2(0, 0), text="")
+        finished = []
+        self.scheduler.countdown(text, 0, on_done=lambda: finished.append(self.now))
+        self.assertEqual((text.text, finished), ("0", [0.0]))  # Sofort fertig
+        self.assertEqual(len(self.scheduler), 0)
+
+        calls = []
+        self.scheduler.every(0.5, lambda: calls.append(self.now), count=0)
+        self.advance(1.0)
+        self.assertEqual(calls, [])
+        self.assertIsNone(self.scheduler.next_wakeup())
+        with self.assertRaises(TypeError):
+            Task()  # Abstrakt
+
+    def test_failing_task_is_dropped(self):
+        calls = []
+        self.scheduler.after(0.1, lambda: 1 / 0)
+        self.scheduler.every(0.1, lambda: calls.append(self.now), count=2)
+        with self.assertLogs(level="ERROR"):
+            self.advance(0.1)
+        self.advance(0.1)
+        self.assertEqual(len(calls), 2)
+        with self.assertRaises(TypeError):
+            self.scheduler.schedule(lambda: None)
+
+
+class CountingGrid(GridLayout):
+    """GridLayout that counts how often it is computed."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.computed = 0
+
+    def arrange(self, objects, size):
+        self.computed += 1
+        return super().arrange(objects, size)
+
+
+class TestLayout(unittest.TestCase):
+    def test_base_class_is_abstract(self):
+        with self.assertRaises(TypeError):
+            Layout()
+
+    def test_grid_follows_the_window_size(self):
+        root = Container(window_size=(400, 400))
+        buzzers = [Buzzer(pygame.Vector2(0, 0), trigger_key=key, sound=BUZZER_WAV) for key in "abcd"]
+        for buzzer in buzzers:
+            root.add_object(buzzer)
+        root.layout = layout = CountingGrid(columns=2, margin=0, spacing=0)
+        root.apply_layout()
+        self.assertEqual(buzzers[3].size, (200, 200))
+        self.assertEqual(buzzers[3].position, pygame.Vector2(200, 200))
+
+        root.window_size = (800, 400)  # Wie bei VIDEORESIZE
+        self.assertEqual(buzzers[1].size, (200, 200))
+        self.assertEqual(buzzers[1].position, pygame.Vector2(500, 0))
+        self.assertIs(root.hit_test(600, 100), buzzers[1])
+        self.assertEqual(layout.computed, 2)
+
+        # Gleiche Größe: weder neu berechnet noch neu gerendert
+        screen = pygame.Surface((800, 400))
+        root.draw(screen)
+        sprite = buzzers[0]._sprite
+        root.window_size = (800, 400)
+        root.draw(screen)
+        self.assertIs(buzzers[0]._sprite, sprite)
+        root.window_size = (400, 400)
+        root.window_size = (800, 400)
+        self.assertEqual(layout.computed, 2)  # Aus dem Cache
+
+        root.add_object(Buzzer(pygame.Vector2(0, 0), trigger_key='e', sound=BUZZER_WAV))
+        self.assertEqual(buzzers[0].size, (133, 133))  # Drei Zeilen
+        self.assertEqual(layout.computed, 3)
+
+    def test_resizing_reuses_font_sizes(self):
+        root = Container(window_size=(400, 400))
+        text = Text(pygame.Vector2(0, 0), text="Round 1")
+        root.add_object(text)
+        root.layout = GridLayout(columns=1, margin=0, spacing=0)
+        sizes = set()
+        for height in range(200, 600, 2):  # Fenster wird langsam größer gezogen
+            root.window_size = (400 + height, height)
+            sizes.add(text.fontsize)
+        self.assertTrue(sizes <= set(Text.FIT_SIZES))
+        self.assertLess(len(sizes), 15)
+
+    def test_anchors_and_nested_cells(self):
+        root = Container(window_size=(400, 400))
+        title = Text(pygame.Vector2(0, 0), text="Round 1")
+        score = Rectangle(pygame.Vector2(0, 0))
+        panel = Container()
+        circle = Circle(pygame.Vector2(0, 0), radius=5)
+        panel.add_object(circle)
+        panel.layout = GridLayout(columns=1, margin=0, spacing=0)
+        for obj in (title, score, panel):
+            root.add_object(obj)
+        layout = AnchorLayout()
+        layout.place(title, "top", size=(1.0, 0.1))
+        layout.place(score, "bottomright", size=(0.25, 0.25))
+        layout.place(panel, "center", size=(0.5, 0.5))
+        root.layout = layout
+        root.apply_layout()
+
+        self.assertEqual(score.position, pygame.Vector2(300, 300))
+        self.assertEqual(score.size, (100, 100))
+        self.assertTrue(pygame.Rect(0, 0, 400, 40).contains(title.bounding_rect()))
+        self.assertGreater(title.fontsize, 20)
+        self.assertEqual(panel.position, pygame.Vector2(100, 100))
+        self.assertEqual(circle.world_position, pygame.Vector2(200, 200))
+        self.assertEqual(circle.radius, 99)
+
+        root.window_size = (800, 800)
+        self.assertEqual(circle.world_position, pygame.Vector2(400, 400))
+        self.assertEqual(circle.radius, 199)
+        with self.assertRaises(ValueError):
+            layout.place(title, "middle")
+        with self.assertRaises(TypeError):
+            root.layout = "grid"
+
+
+class TestBatchUpdates(unittest.TestCase):
+    def build(self):
+        root = Container(window_size=(400, 400))
+        panel = Container(position=pygame.Vector2(100, 0))
+        buzzer = Buzzer(pygame.Vector2(0, 0), trigger_key='a', sound=BUZZER_WAV)
+        circle = Circle(pygame.Vector2(50, 300), radius=10, color=pygame.Color("red"))
+        text = Text(pygame.Vector2(300, 300), text="10")
+        panel.add_object(buzzer)
+        for obj in (panel, circle, text):
+            root.add_object(obj)
+        root.collect_dirty_rects()
+        return root, panel, buzzer, circle, text
+
+    def test_one_invalidation_for_many_changes(self):
+        root, panel, buzzer, circle, text = self.build()
+        count = root.update_objects({
+            buzzer: {"in_color": pygame.Color("gold"), "position": pygame.Vector2(0, 100)},
+            circle: {"color": pygame.Color("blue")},
+            text: {"text": "0"},
+        })
+        self.assertEqual(count, 4)
+        self.assertEqual(circle.color, pygame.Color("blue"))
+        self.assertEqual(len(root._dirty_rects), 1)
+        dirty = root._dirty_rects[0]
+        for area in (pygame.Rect(100, 0, 50, 50), buzzer.bounding_rect(), circle.bounding_rect(),
+                     text.bounding_rect()):
+            self.assertTrue(dirty.contains(area))
+        self.assertIs(root.hit_test(120, 120), buzzer)  # Index einmal am Ende nachgeführt
+        self.assertIsNone(root.hit_test(120, 20))
+
+    def test_rollback_on_invalid_value(self):
+        root, panel, buzzer, circle, text = self.build()
+        with self.assertRaises(ValueError):
+            root.update_objects([(circle, {"color": pygame.Color("blue"), "radius": -1}),
+                                 (text, {"text": "0"})])
+        self.assertEqual(circle.color, pygame.Color("red"))
+        self.assertEqual(circle.radius, 10)
+        self.assertEqual(text.text, "10")
+
+        with self.assertRaises(AttributeError):
+            root.update_objects({circle: {"world_position": pygame.Vector2(0, 0)}})
+        with self.assertRaises(ValueError):
+            panel.update_objects({circle: {"radius": 5}})  # Nicht im Panel
+        self.assertEqual(circle.radius, 10)
+
+    def test_nested_batch_and_overflow(self):
+        root = Container(window_size=(400, 400))
+        circles = [Circle(pygame.Vector2(5 * i, 5), radius=2) for i in range(Container.MAX_DIRTY_RECTS + 1)]
+        for circle in circles:
+            root.add_object(circle)
+        root.collect_dirty_rects()
+        with root.batch():
+            circles[0].radius = 3
+            with root.batch():
+                circles[1].radius = 3
+            self.assertFalse(root.has_dirty_rects())
+        self.assertEqual(len(root.collect_dirty_rects()), 1)
+
+        root.update_objects({circle: {"radius": 1} for circle in circles})
+        self.assertEqual(root.collect_dirty_rects(), [pygame.Rect(0, 0, 400, 400)])
+
+    def test_shape_group_changes_are_batched(self):
+        root = Container(window_size=(400, 400))
+        group = ShapeGroup(kind=ShapeGroup.RECTANGLE)
+        root.add_object(group)
+        views = [group.add_rectangle(pygame.Vector2(10 * i, 0), size=(5, 5)) for i in range(3)]
+        root.collect_dirty_rects()
+        with root.batch():
+            for view in views:
+                view.color = pygame.Color("red")
+            views[2].position = pygame.Vector2(50, 50)
+            self.assertFalse(root.has_dirty_rects())
+        self.assertEqual(root.collect_dirty_rects(), [pygame.Rect(0, 0, 55, 55)])
+
 
 if __name__ == "__main__":
     unittest.main()